@@ -0,0 +1,75 @@
+import argparse
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
+
+from src.features.agent_chat.data.datasources.prompt_chain_cache import PromptChainCache
+
+_TEMPLATE_PARAGRAPH = (
+    "Aplica rigurosamente los principios SOLID y sigue las mejores prácticas de programación "
+    "para asegurar que el código sea limpio, eficiente y fácil de mantener. "
+)
+
+
+def build_template(template_chars: int) -> str:
+    repetitions = max(template_chars // len(_TEMPLATE_PARAGRAPH), 1)
+    return (
+        _TEMPLATE_PARAGRAPH * repetitions
+        + "\n\nLISTA:\n{file_list}\n\nMAPA DEL PROYECTO:\n{project_map}\n\nCONVERSACIÓN:\n{conversation}"
+        + '\n\nFormato:\n```json\n[ {{ "path": "a.ext", "content": "<código>" }} ]\n```'
+    )
+
+
+def measure(call: Callable[[], object], iterations: int) -> float:
+    call()
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        call()
+    return (time.perf_counter() - started_at) / iterations
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Mide el coste por llamada de compilar la plantilla y la cadena de LangChain."
+    )
+    parser.add_argument("-n", "--iterations", type=int, default=500)
+    parser.add_argument("--template-chars", type=int, default=4096)
+    args = parser.parse_args(argv)
+
+    template = build_template(args.template_chars)
+    context: Dict[str, str] = {
+        "file_list": "- src/app.py",
+        "project_map": "## `src/app.py`",
+        "conversation": "user: hola",
+    }
+    chain_tail: Runnable = FakeListChatModel(responses=["[]"]) | StrOutputParser()
+    chain_cache = PromptChainCache()
+
+    def compile_uncached() -> Runnable:
+        return ChatPromptTemplate.from_template(template) | chain_tail
+
+    def compile_cached() -> Runnable:
+        return chain_cache.get_chain(template, chain_tail)
+
+    rows = [
+        ("compilar (antes)", measure(compile_uncached, args.iterations)),
+        ("compilar (después)", measure(compile_cached, args.iterations)),
+        ("invocar (antes)", measure(lambda: compile_uncached().invoke(context), args.iterations)),
+        ("invocar (después)", measure(lambda: compile_cached().invoke(context), args.iterations)),
+    ]
+
+    sys.stdout.write(
+        f"Plantilla de {len(template)} caracteres, {args.iterations} iteraciones por caso\n"
+    )
+    for label, seconds in rows:
+        sys.stdout.write(f"  {label:<20} {seconds * 1_000_000:10.1f} µs/llamada\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
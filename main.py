@@ -1,9 +1,25 @@
 # -*- coding: utf-8 -*- # Added encoding declaration just in case
 import flet as ft
-import json
 from pathlib import Path # Using pathlib for more modern path handling
 import threading # Explicitly import for type hinting if needed
-import os # Needed for os.walk in _map_project_thread
+
+from src.core.exceptions import FileMaterializationError
+from src.core.file_entry_reader import SUPPORTED_ENTRY_FILE_EXTENSIONS, FileEntryReader
+from src.core.file_materializer import materialize_files
+from src.core.progress_publisher import ThrottledProgressPublisher
+from src.features.agent_chat.data.repositories.project_mapper_repository import ProjectMapperRepository
+
+# Number of threads used to read file contents while mapping a project.
+# Output order is unaffected; 1 falls back to a plain serial walk.
+MAPPER_READ_WORKERS = 8
+
+# Maximum rate of per-file status refreshes. Every page.update() is a websocket
+# round-trip, so intermediate states are coalesced and only the latest is shown.
+STATUS_UPDATES_PER_SECOND = 10.0
+
+# Number of threads used to write files when creating them from a JSON file.
+# Files whose content on disk is already identical are skipped, not rewritten.
+MATERIALIZER_WRITE_WORKERS = 8
 
 # --- Core Logic (separated for clarity) ---
 
@@ -40,72 +56,45 @@ def create_files_from_json_logic(base_dir, json_path, page: ft.Page, progress_ri
 def _create_files_thread(base_dir, json_path, page: ft.Page, progress_ring: ft.ProgressRing, status_text: ft.Text, create_button: ft.ElevatedButton):
     """Actual thread function for creating files. Manages button state."""
     try:
-        base_dir_path = Path(base_dir)
-        json_file_path = Path(json_path)
+        progress = _create_status_publisher(page, status_text)
 
-        if not base_dir_path.is_dir():
-            show_dialog(page, "Error", "La ruta base seleccionada no es un directorio válido.")
-            status_text.value = "Error: Ruta base inválida."
-            return # Exit thread
-
-        if not json_file_path.is_file():
-            show_dialog(page, "Error", "El archivo JSON seleccionado no es válido.")
-            status_text.value = "Error: Archivo JSON inválido."
-            return # Exit thread
+        def on_file_written(processed_items, total_items, relative_path_str):
+            # JSON Lines and compressed inputs are streamed, so the total is only known up front for plain lists.
+            counter = f"{processed_items}/{total_items}" if total_items is not None else f"{processed_items}"
+            progress.report(f"Procesando: {counter} - {relative_path_str}")
 
         try:
-            with open(json_file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except Exception as e:
-            show_dialog(page, "Error", f"No se pudo leer el archivo JSON: {e}")
-            status_text.value = "Error leyendo JSON."
-            return # Exit thread
-
-        if not isinstance(data, list):
-            show_dialog(page, "Error", "El contenido del JSON debe ser una lista de objetos.")
-            status_text.value = "Error: JSON no es una lista."
-            return # Exit thread
-
-        total_items = len(data)
-        processed_items = 0
-        errors = []
-
-        status_text.value = f"Procesando 0/{total_items}..." # Initial status
-        page.update()
-
-        for item in data:
-            if not isinstance(item, dict) or "path" not in item or "content" not in item:
-                errors.append("Un objeto en el JSON no tiene 'path' o 'content'. Se omitirá.")
-                continue # Skip this item
-
-            relative_path_str = item["path"]
-            content = item["content"]
-
-            try:
-                full_path = base_dir_path.joinpath(relative_path_str).resolve()
-                if base_dir_path.resolve() not in full_path.parents and full_path != base_dir_path.resolve():
-                     errors.append(f"Intento de escritura fuera del directorio base: '{relative_path_str}'. Se omitirá.")
-                     continue
-
-                full_path.parent.mkdir(parents=True, exist_ok=True)
-
-                with open(full_path, "w", encoding="utf-8") as archivo:
-                    archivo.write(content)
-
-                processed_items += 1
-                status_text.value = f"Procesando: {processed_items}/{total_items} - {relative_path_str}"
+            # Entries are parsed incrementally and written as soon as each object is complete.
+            with FileEntryReader(Path(json_path)) as entries:
+                status_text.value = "Procesando..." # Initial status
                 page.update()
+                result = materialize_files(
+                    Path(base_dir),
+                    entries,
+                    on_file_written=on_file_written,
+                    max_workers=MATERIALIZER_WRITE_WORKERS,
+                )
+        except FileMaterializationError as e:
+            show_dialog(page, "Error", str(e))
+            status_text.value = f"Error: {e}"
+            return # Exit thread
 
-            except OSError as e:
-                 errors.append(f"Error de OS al procesar '{relative_path_str}': {e}")
-            except Exception as e:
-                errors.append(f"Error inesperado al procesar '{relative_path_str}': {e}")
+        processed_items = result.processed_items
+        errors = result.errors
 
+        progress.flush()
         if not errors:
-            status_text.value = f"¡Éxito! {processed_items} archivos creados correctamente."
+            status_text.value = (
+                f"¡Éxito! {processed_items} archivos procesados correctamente "
+                f"({result.describe_counts()}). "
+                f"{_describe_status_throttling(progress)}"
+            )
             show_snackbar(page, "¡Archivos creados correctamente!")
         else:
-            error_summary = f"Completado con {len(errors)} errores. {processed_items} archivos creados."
+            error_summary = (
+                f"Completado con {len(errors)} errores. {processed_items} archivos procesados "
+                f"({result.describe_counts()})."
+            )
             status_text.value = error_summary
             error_details = "\n".join(errors[:10]) # Show first 10 errors
             if len(errors) > 10:
@@ -164,8 +153,6 @@ def _map_project_thread(project_dir, extensions_to_include, extensions_to_exclud
         output_path = Path(output_file)
         # Prepare sets for efficient lookup, case-insensitive
         include_extensions_set = set(ext.lower() for ext in extensions_to_include if ext.startswith('.'))
-        # Exclusions are treated as simple strings to match the end of the filename
-        exclude_patterns_set = set(excl.lower() for excl in extensions_to_exclude)
 
         if not project_path.is_dir():
             show_dialog(page, "Error", "La ruta del proyecto seleccionada no es un directorio válido.")
@@ -181,61 +168,38 @@ def _map_project_thread(project_dir, extensions_to_include, extensions_to_exclud
 
 
         found_files = 0
+        progress = _create_status_publisher(page, status_text)
+
+        def on_file_mapped(relative_path):
+            nonlocal found_files
+            found_files += 1
+            progress.report(f"Mapeando ({found_files}): {relative_path}")
+
         try:
+            # Stream the map chunk by chunk straight to disk. Without a cache or a
+            # token budget the mapper keeps only content hashes for deduplication,
+            # so a file's content is released once its segment has been written.
+            mapper = ProjectMapperRepository(enable_cache=False, max_workers=MAPPER_READ_WORKERS)
             with open(output_path, "w", encoding="utf-8") as out_f:
-                out_f.write(f"# Mapeo del Proyecto: {project_path.name}\n\n")
-                out_f.write(f"Directorio base: `{project_dir}`\n")
-                out_f.write(f"Extensiones incluidas: `{', '.join(extensions_to_include) if extensions_to_include else 'Todas (excepto excluidas)'}`\n")
-                out_f.write(f"Extensiones/Patrones excluidos: `{', '.join(extensions_to_exclude) if extensions_to_exclude else 'Ninguno'}`\n\n")
-                out_f.write("---\n\n")
-
                 status_text.value = "Recorriendo directorios..."
                 page.update()
 
-                for root, _, files in os.walk(project_dir):
-                    current_dir_path = Path(root)
-                    for filename in files:
-                        # Check frequently if we should stop (Flet might handle page close)
-                        # if not page.running: return
-
-                        item_path = current_dir_path / filename
-                        file_ext_lower = item_path.suffix.lower()
-                        file_name_lower = item_path.name.lower()
-
-                        # 1. Check inclusion criteria
-                        # If include_extensions_set is empty, we potentially include everything.
-                        # If it's not empty, the file extension MUST be in the set.
-                        included_by_extension = not include_extensions_set or file_ext_lower in include_extensions_set
-
-                        # 2. Check exclusion criteria
-                        # If the file is potentially included, check if it matches any exclusion pattern.
-                        is_excluded = False
-                        if included_by_extension and exclude_patterns_set:
-                            for excluded_pattern in exclude_patterns_set:
-                                if file_name_lower.endswith(excluded_pattern):
-                                    is_excluded = True
-                                    break # Found an exclusion match
-
-                        # 3. Final decision: Include if it met inclusion rules AND was NOT excluded
-                        if included_by_extension and not is_excluded:
-                            found_files += 1
-                            relative_path = item_path.relative_to(project_path)
-                            status_text.value = f"Mapeando ({found_files}): {relative_path}"
-                            page.update()
-
-                            out_f.write(f"## `{relative_path}`\n\n")
-                            lang_hint = file_ext_lower.lstrip('.')
-                            out_f.write(f"```{lang_hint}\n")
-                            try:
-                                with open(item_path, "r", encoding="utf-8", errors='ignore') as in_f:
-                                    content = in_f.read()
-                            except Exception as e:
-                                content = f"Error al leer el archivo: {e}"
-                            out_f.write(content)
-                            out_f.write("\n```\n\n")
-
-
-            status_text.value = f"¡Éxito! Mapeo completado. {found_files} archivos incluidos en '{output_file}'."
+                for chunk in mapper.iter_project_map(
+                    project_dir,
+                    extensions_to_include,
+                    extensions_to_exclude,
+                    on_file_mapped=on_file_mapped,
+                ):
+                    out_f.write(chunk)
+
+            progress.flush()
+            stats = mapper.last_map_stats
+            status_text.value = (
+                f"¡Éxito! Mapeo completado. {found_files} archivos incluidos en '{output_file}'. "
+                f"Lectura con {stats.workers} hilos en {stats.elapsed_seconds:.2f}s "
+                f"(~{stats.speedup:.1f}x más rápido que una lectura secuencial estimada). "
+                f"{_describe_status_throttling(progress)}"
+            )
             show_snackbar(page, f"Archivo Markdown generado: {output_file}")
 
         except Exception as e:
@@ -257,6 +221,23 @@ def _map_project_thread(project_dir, extensions_to_include, extensions_to_exclud
 
 # --- UI Helper Functions ---
 
+def _create_status_publisher(page: ft.Page, status_text: ft.Text) -> ThrottledProgressPublisher[str]:
+    """Builds a publisher that shows the latest status message at a bounded rate."""
+    def publish(message: str):
+        status_text.value = message
+        page.update()
+
+    return ThrottledProgressPublisher(publish, max_updates_per_second=STATUS_UPDATES_PER_SECOND)
+
+def _describe_status_throttling(progress: ThrottledProgressPublisher) -> str:
+    """Summarizes how many UI refreshes were coalesced and the time that saved."""
+    if progress.published_count == 0:
+        return ""
+    return (
+        f"Interfaz: {progress.published_count}/{progress.reported_count} actualizaciones "
+        f"(~{progress.estimated_seconds_saved:.2f}s ahorrados)."
+    )
+
 def show_dialog(page: ft.Page, title: str, message: str):
     """Displays a modal dialog."""
     try:
@@ -366,7 +347,7 @@ def main(page: ft.Page):
     def pick_json_file(e):
         # Store initial text in control's data attribute for reset on cancel
         if json_file_path.current: json_file_path.current.data = json_file_path.current.value
-        json_file_picker.pick_files(dialog_title="Seleccionar archivo JSON", allow_multiple=False, allowed_extensions=["json"])
+        json_file_picker.pick_files(dialog_title="Seleccionar archivo JSON", allow_multiple=False, allowed_extensions=list(SUPPORTED_ENTRY_FILE_EXTENSIONS))
 
 
     def start_creation_process(e):
@@ -0,0 +1,183 @@
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+DEFAULT_MAP_OUTPUT = "salida_mapeo.md"
+DEFAULT_MAP_WORKERS = 8
+DEFAULT_CREATE_WORKERS = 8
+STDOUT_OUTPUT = "-"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        return 0
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="cortex",
+        description="Mapeo de proyectos y creación de archivos desde JSON sin interfaz gráfica.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    map_parser = subparsers.add_parser(
+        "map", help="Genera el mapa Markdown de un proyecto."
+    )
+    map_parser.add_argument("project_dir", help="Directorio del proyecto a mapear.")
+    map_parser.add_argument(
+        "-i",
+        "--include",
+        action="append",
+        default=[],
+        metavar="EXT",
+        help="Extensión a incluir, p. ej. .py (repetible). Sin inclusiones se mapea todo.",
+    )
+    map_parser.add_argument(
+        "-e",
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="SUFIJO",
+        help="Sufijo de archivo a excluir, p. ej. .g.dart (repetible).",
+    )
+    map_parser.add_argument(
+        "-o",
+        "--output",
+        default=DEFAULT_MAP_OUTPUT,
+        help=f"Archivo de salida, o '{STDOUT_OUTPUT}' para escribir en stdout (por defecto: {DEFAULT_MAP_OUTPUT}).",
+    )
+    map_parser.add_argument(
+        "--stdout",
+        dest="output",
+        action="store_const",
+        const=STDOUT_OUTPUT,
+        help="Escribe el mapa en stdout a medida que se genera.",
+    )
+    map_parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=DEFAULT_MAP_WORKERS,
+        help=f"Hilos de lectura de archivos (por defecto: {DEFAULT_MAP_WORKERS}).",
+    )
+    map_parser.add_argument(
+        "--max-file-bytes",
+        type=_non_negative_int,
+        default=None,
+        help=(
+            "Tamaño máximo en bytes del contenido incluido por archivo "
+            "(por defecto: 256 KiB; 0 desactiva el límite)."
+        ),
+    )
+    map_parser.add_argument(
+        "--no-ignore",
+        action="store_true",
+        help="No respeta .gitignore ni las exclusiones por defecto.",
+    )
+    map_parser.set_defaults(handler=_run_map)
+
+    create_parser = subparsers.add_parser(
+        "create", help="Crea archivos a partir de una lista JSON o JSON Lines de objetos {path, content}, opcionalmente comprimida con gzip o zstd."
+    )
+    create_parser.add_argument("base_dir", help="Directorio base donde se crearán los archivos.")
+    create_parser.add_argument(
+        "json_file", help="Archivo .json, .jsonl o .ndjson, opcionalmente .gz o .zst."
+    )
+    create_parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=DEFAULT_CREATE_WORKERS,
+        help=f"Hilos de escritura de archivos (por defecto: {DEFAULT_CREATE_WORKERS}).",
+    )
+    create_parser.add_argument(
+        "-q", "--quiet", action="store_true", help="Solo informa de errores."
+    )
+    create_parser.set_defaults(handler=_run_create)
+    return parser
+
+
+def _run_map(args: argparse.Namespace) -> int:
+    from .features.agent_chat.data.repositories.project_mapper_repository import (
+        DEFAULT_MAX_FILE_BYTES,
+        ProjectMapperRepository,
+    )
+
+    if not Path(args.project_dir).is_dir():
+        _report(f"Error: '{args.project_dir}' no es un directorio válido.")
+        return 2
+
+    max_file_bytes = (
+        args.max_file_bytes if args.max_file_bytes is not None else DEFAULT_MAX_FILE_BYTES
+    )
+    mapper = ProjectMapperRepository(
+        enable_cache=False,
+        max_workers=max(args.workers, 1),
+        respect_ignore_rules=not args.no_ignore,
+        max_file_bytes=max_file_bytes or None,
+    )
+    chunks = mapper.iter_project_map(args.project_dir, args.include, args.exclude)
+    if args.output == STDOUT_OUTPUT:
+        for chunk in chunks:
+            sys.stdout.write(chunk)
+        sys.stdout.flush()
+        return 0
+
+    with open(args.output, "w", encoding="utf-8") as out_f:
+        for chunk in chunks:
+            out_f.write(chunk)
+    stats = mapper.last_map_stats
+    _report(
+        f"Mapa generado en '{args.output}' con {stats.workers} hilos "
+        f"en {stats.elapsed_seconds:.2f}s."
+    )
+    return 0
+
+
+def _run_create(args: argparse.Namespace) -> int:
+    from .core.exceptions import FileMaterializationError
+    from .core.file_entry_reader import FileEntryReader
+    from .core.file_materializer import materialize_files
+
+    try:
+        with FileEntryReader(Path(args.json_file)) as entries:
+            result = materialize_files(
+                Path(args.base_dir), entries, max_workers=max(args.workers, 1)
+            )
+    except FileMaterializationError as e:
+        _report(f"Error: {e}")
+        return 2
+
+    for error in result.errors:
+        _report(error)
+    if not args.quiet or result.errors:
+        _report(
+            f"{result.processed_items}/{result.total_items} archivos procesados "
+            f"({result.describe_counts()})"
+            + (f", {len(result.errors)} errores." if result.errors else ".")
+        )
+    return 1 if result.errors else 0
+
+
+def _non_negative_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{value}' no es un número entero.")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"{number} debe ser mayor o igual que 0.")
+    return number
+
+
+def _report(message: str) -> None:
+    print(message, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,2 +1,16 @@
+from typing import Sequence
+
+
 class TaskInterruptedException(Exception):
     pass
+
+
+class FileMaterializationError(Exception):
+    pass
+
+
+class TruncatedOutputException(Exception):
+    def __init__(self, output_chars: int, completed_paths: Sequence[str] = ()):
+        super().__init__(f"Model output was truncated after {output_chars} characters.")
+        self.output_chars = output_chars
+        self.completed_paths = list(completed_paths)
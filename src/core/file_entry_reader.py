@@ -0,0 +1,158 @@
+import gzip
+import io
+import json
+import re
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator
+
+from .exceptions import FileMaterializationError
+
+SUPPORTED_ENTRY_FILE_EXTENSIONS = ("json", "jsonl", "ndjson", "gz", "zst")
+_JSON_LINES_SUFFIXES = (".jsonl", ".ndjson")
+_COMPRESSED_SUFFIXES = (".gz", ".zst")
+_READ_CHUNK_CHARS = 64 * 1024
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_NON_WHITESPACE = re.compile(r"[^ \t\n\r]")
+_NUMBER_LOOKAHEAD_CHARS = 2
+
+
+class FileEntryReader:
+    def __init__(self, json_path: Path, chunk_chars: int = _READ_CHUNK_CHARS):
+        if not json_path.is_file():
+            raise FileMaterializationError("El archivo JSON seleccionado no es válido.")
+        self._chunk_chars = chunk_chars
+        self._resources = ExitStack()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        self._consumed_chars = 0
+        self._eof = False
+        try:
+            self._text = self._resources.enter_context(_open_text(json_path, self._resources))
+            first_char = self._peek_non_whitespace()
+        except FileMaterializationError:
+            self._resources.close()
+            raise
+        except Exception as e:
+            self._resources.close()
+            raise FileMaterializationError(f"No se pudo leer el archivo JSON: {e}") from e
+        if first_char not in ("[", "{") and not (first_char == "" and _is_json_lines_path(json_path)):
+            self._resources.close()
+            raise FileMaterializationError("El contenido del JSON debe ser una lista de objetos.")
+        self._is_array = first_char == "["
+
+    def __enter__(self) -> "FileEntryReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._resources.close()
+
+    def __iter__(self) -> Iterator[Any]:
+        try:
+            if self._is_array:
+                yield from self._iter_array()
+            else:
+                yield from self._iter_json_lines()
+        except FileMaterializationError:
+            raise
+        except Exception as e:
+            raise FileMaterializationError(f"No se pudo leer el archivo JSON: {e}") from e
+
+    def _iter_array(self) -> Iterator[Any]:
+        self._position += 1
+        if self._peek_non_whitespace() == "]":
+            self._position += 1
+        else:
+            while True:
+                yield self._decode_value()
+                separator = self._peek_non_whitespace()
+                self._position += 1
+                if separator == "]":
+                    break
+                if separator != ",":
+                    raise self._syntax_error("se esperaba ',' o ']'")
+        if self._peek_non_whitespace():
+            raise self._syntax_error("datos adicionales tras la lista")
+
+    def _iter_json_lines(self) -> Iterator[Any]:
+        while self._peek_non_whitespace():
+            yield self._decode_value()
+
+    def _decode_value(self) -> Any:
+        self._peek_non_whitespace()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError as e:
+                if self._eof:
+                    raise self._syntax_error(e.msg, e.pos) from e
+                self._fill()
+                continue
+            if end + _NUMBER_LOOKAHEAD_CHARS >= len(self._buffer) and not self._eof:
+                self._fill()
+                continue
+            self._position = end
+            return value
+
+    def _peek_non_whitespace(self) -> str:
+        while True:
+            match = _NON_WHITESPACE.search(self._buffer, self._position)
+            if match is not None:
+                self._position = match.start()
+                return match.group()
+            self._position = len(self._buffer)
+            if self._eof:
+                return ""
+            self._fill()
+
+    def _fill(self) -> None:
+        if self._position:
+            self._consumed_chars += self._position
+            self._buffer = self._buffer[self._position :]
+            self._position = 0
+        chunk = self._text.read(max(self._chunk_chars, len(self._buffer)))
+        if chunk:
+            self._buffer += chunk
+        else:
+            self._eof = True
+
+    def _syntax_error(self, message: str, position: int = -1) -> FileMaterializationError:
+        offset = self._consumed_chars + (self._position if position < 0 else position)
+        return FileMaterializationError(
+            f"No se pudo leer el archivo JSON: {message} (carácter {offset})"
+        )
+
+
+def _is_json_lines_path(json_path: Path) -> bool:
+    suffixes = [suffix.lower() for suffix in json_path.suffixes]
+    if suffixes and suffixes[-1] in _COMPRESSED_SUFFIXES:
+        suffixes.pop()
+    return bool(suffixes) and suffixes[-1] in _JSON_LINES_SUFFIXES
+
+
+def _open_text(json_path: Path, resources: ExitStack) -> io.TextIOWrapper:
+    raw: BinaryIO = resources.enter_context(open(json_path, "rb"))
+    magic = raw.read(len(_ZSTD_MAGIC))
+    raw.seek(0)
+    if magic.startswith(_GZIP_MAGIC):
+        binary: BinaryIO = resources.enter_context(gzip.GzipFile(fileobj=raw, mode="rb"))
+    elif magic == _ZSTD_MAGIC:
+        binary = resources.enter_context(io.BufferedReader(_open_zstd(raw)))
+    else:
+        binary = raw
+    return io.TextIOWrapper(binary, encoding="utf-8-sig")
+
+
+def _open_zstd(raw: BinaryIO) -> BinaryIO:
+    try:
+        import zstandard
+    except ImportError:
+        raise FileMaterializationError(
+            "Para leer archivos comprimidos con zstd instala el paquete 'zstandard'."
+        ) from None
+    return zstandard.ZstdDecompressor().stream_reader(raw, closefd=False)
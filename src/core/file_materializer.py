@@ -0,0 +1,210 @@
+import os
+import stat
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .exceptions import FileMaterializationError
+
+DEFAULT_MAX_WORKERS = 8
+_MAX_PENDING_WRITES_PER_WORKER = 4
+_DEFAULT_FILE_MODE = 0o666
+_FALLBACK_UMASK = 0o022
+_END_OF_ENTRIES = object()
+
+
+class WriteOutcome(Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    UNCHANGED = "unchanged"
+
+
+@dataclass
+class MaterializationResult:
+    total_items: Optional[int] = None
+    created_items: int = 0
+    updated_items: int = 0
+    unchanged_items: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def processed_items(self) -> int:
+        return self.created_items + self.updated_items + self.unchanged_items
+
+    def describe_counts(self) -> str:
+        return (
+            f"{self.created_items} creados, {self.updated_items} actualizados, "
+            f"{self.unchanged_items} sin cambios"
+        )
+
+    def _record(self, outcome: WriteOutcome) -> None:
+        if outcome is WriteOutcome.CREATED:
+            self.created_items += 1
+        elif outcome is WriteOutcome.UPDATED:
+            self.updated_items += 1
+        else:
+            self.unchanged_items += 1
+
+
+def materialize_files(
+    base_dir: Path,
+    entries: Iterable[Any],
+    on_file_written: Optional[Callable[[int, Optional[int], str], None]] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    total_items: Optional[int] = None,
+) -> MaterializationResult:
+    if not base_dir.is_dir():
+        raise FileMaterializationError("La ruta base seleccionada no es un directorio válido.")
+
+    if total_items is None and hasattr(entries, "__len__"):
+        total_items = len(entries)
+    result = MaterializationResult(total_items=total_items)
+    seen_items = 0
+    directories = _DirectoryCache(base_dir.resolve())
+    file_mode = default_file_mode()
+    max_workers = max(max_workers, 1)
+    max_pending = max_workers * _MAX_PENDING_WRITES_PER_WORKER
+    pending: Dict[Path, Tuple[Future, str]] = {}
+
+    def collect(target: Path) -> None:
+        future, relative_path_str = pending.pop(target)
+        try:
+            result._record(future.result())
+        except OSError as e:
+            result.errors.append(f"Error de OS al procesar '{relative_path_str}': {e}")
+            return
+        except Exception as e:
+            result.errors.append(f"Error inesperado al procesar '{relative_path_str}': {e}")
+            return
+        if on_file_written is not None:
+            on_file_written(result.processed_items, result.total_items, relative_path_str)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="materializer") as executor:
+        items = iter(entries)
+        while True:
+            try:
+                item = next(items, _END_OF_ENTRIES)
+            except FileMaterializationError as e:
+                result.errors.append(str(e))
+                break
+            if item is _END_OF_ENTRIES:
+                break
+            seen_items += 1
+            if not isinstance(item, dict) or "path" not in item or "content" not in item:
+                result.errors.append("Un objeto en el JSON no tiene 'path' o 'content'. Se omitirá.")
+                continue
+
+            relative_path_str = item["path"]
+            try:
+                full_path = directories.resolve_target(relative_path_str)
+                if full_path is None:
+                    result.errors.append(
+                        f"Intento de escritura fuera del directorio base: '{relative_path_str}'. Se omitirá."
+                    )
+                    continue
+                directories.ensure(full_path.parent)
+            except OSError as e:
+                result.errors.append(f"Error de OS al procesar '{relative_path_str}': {e}")
+                continue
+            except Exception as e:
+                result.errors.append(f"Error inesperado al procesar '{relative_path_str}': {e}")
+                continue
+
+            if full_path in pending:
+                collect(full_path)
+            while len(pending) >= max_pending:
+                collect(next(iter(pending)))
+            pending[full_path] = (
+                executor.submit(write_text_if_changed, full_path, item["content"], file_mode),
+                relative_path_str,
+            )
+
+        while pending:
+            collect(next(iter(pending)))
+    if result.total_items is None:
+        result.total_items = seen_items
+    return result
+
+
+class _DirectoryCache:
+    def __init__(self, base_dir: Path):
+        self._base_dir = base_dir
+        self._resolved: Dict[str, Optional[Path]] = {}
+        self._created: Set[Path] = {base_dir}
+
+    def resolve_target(self, relative_path: str) -> Optional[Path]:
+        parent, name = os.path.split(relative_path)
+        if name in ("", ".", ".."):
+            full_path = self._base_dir.joinpath(relative_path).resolve()
+            return full_path if self._is_inside(full_path) else None
+        if parent not in self._resolved:
+            directory = self._base_dir.joinpath(parent).resolve()
+            self._resolved[parent] = directory if self._is_inside(directory) else None
+        directory = self._resolved[parent]
+        return directory / name if directory is not None else None
+
+    def ensure(self, directory: Path) -> None:
+        if directory not in self._created:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._created.add(directory)
+
+    def _is_inside(self, path: Path) -> bool:
+        return path == self._base_dir or self._base_dir in path.parents
+
+
+def write_text_if_changed(full_path: Path, content: str, file_mode: int) -> WriteOutcome:
+    data = _encode_text(content)
+    try:
+        stat_result = os.stat(full_path)
+    except FileNotFoundError:
+        stat_result = None
+
+    if stat_result is not None:
+        if stat.S_ISREG(stat_result.st_mode) and stat_result.st_size == len(data):
+            with open(full_path, "rb") as existing_file:
+                if existing_file.read() == data:
+                    return WriteOutcome.UNCHANGED
+        file_mode = stat.S_IMODE(stat_result.st_mode)
+
+    fd, temp_path = tempfile.mkstemp(
+        dir=full_path.parent, prefix=f".{full_path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as temp_file:
+            temp_file.write(data)
+        os.chmod(temp_path, file_mode)
+        os.replace(temp_path, full_path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    return WriteOutcome.CREATED if stat_result is None else WriteOutcome.UPDATED
+
+
+def _encode_text(content: str) -> bytes:
+    if os.linesep != "\n":
+        content = content.replace("\n", os.linesep)
+    return content.encode("utf-8")
+
+
+def default_file_mode() -> int:
+    return _DEFAULT_FILE_MODE & ~_PROCESS_UMASK
+
+
+def _read_process_umask() -> int:
+    try:
+        with open("/proc/self/status", "r", encoding="ascii") as status_file:
+            for line in status_file:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError, IndexError):
+        pass
+    return _FALLBACK_UMASK
+
+
+_PROCESS_UMASK = _read_process_umask()
@@ -0,0 +1,151 @@
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+PROFILE_IMPORTS_ENV_VAR = "CORTEX_PROFILE_IMPORTS"
+DEFAULT_REPORT_LIMIT = 25
+_STDERR_TARGETS = frozenset({"1", "true", "yes", "stderr"})
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    module_name: str
+    self_seconds: float
+    cumulative_seconds: float
+
+
+class ImportProfiler:
+    def __init__(
+        self,
+        output_path: Optional[str] = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        self._output_path = output_path
+        self._clock = clock
+        self._started_at = clock()
+        self._finder = _TimingFinder(self)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._timings: List[ImportTiming] = []
+        self._marks: List[Tuple[str, float]] = []
+
+    @classmethod
+    def from_environment(cls) -> Optional["ImportProfiler"]:
+        target = os.environ.get(PROFILE_IMPORTS_ENV_VAR, "").strip()
+        if not target or target == "0":
+            return None
+        profiler = cls(None if target.lower() in _STDERR_TARGETS else target)
+        profiler.install()
+        return profiler
+
+    @property
+    def timings(self) -> List[ImportTiming]:
+        with self._lock:
+            return list(self._timings)
+
+    def install(self) -> None:
+        if self._finder not in sys.meta_path:
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self) -> None:
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+    def mark(self, label: str) -> None:
+        with self._lock:
+            self._marks.append((label, self._clock() - self._started_at))
+
+    def report(self, limit: int = DEFAULT_REPORT_LIMIT) -> str:
+        timings = self.timings
+        with self._lock:
+            marks = list(self._marks)
+        total_seconds = sum(timing.self_seconds for timing in timings)
+
+        seconds_by_package: Dict[str, float] = {}
+        for timing in timings:
+            package = timing.module_name.partition(".")[0]
+            seconds_by_package[package] = seconds_by_package.get(package, 0.0) + timing.self_seconds
+
+        lines = [f"Import profile: {len(timings)} modules, {total_seconds * 1000:.1f} ms"]
+        lines.extend(f"  {label}: {seconds * 1000:.1f} ms since profiler start" for label, seconds in marks)
+        lines.append("")
+        lines.append("   total ms |  package")
+        for package, seconds in sorted(
+            seconds_by_package.items(), key=lambda item: item[1], reverse=True
+        )[:limit]:
+            lines.append(f"{seconds * 1000:11.1f} |  {package}")
+        lines.append("")
+        lines.append("    self ms | cumulative ms |  module")
+        for timing in sorted(timings, key=lambda timing: timing.self_seconds, reverse=True)[:limit]:
+            lines.append(
+                f"{timing.self_seconds * 1000:11.1f} | {timing.cumulative_seconds * 1000:13.1f} |  {timing.module_name}"
+            )
+        return "\n".join(lines)
+
+    def publish(self, limit: int = DEFAULT_REPORT_LIMIT) -> None:
+        report = self.report(limit)
+        if self._output_path is not None:
+            with open(self._output_path, "w", encoding="utf-8") as report_file:
+                report_file.write(report + "\n")
+        elif sys.stderr is not None:
+            print(report, file=sys.stderr)
+
+    def _execute(self, module_name: str, exec_module: Callable[[object], None], module: object) -> None:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        started_at = self._clock()
+        stack.append(0.0)
+        try:
+            exec_module(module)
+        finally:
+            children_seconds = stack.pop()
+            cumulative_seconds = self._clock() - started_at
+            if stack:
+                stack[-1] += cumulative_seconds
+            with self._lock:
+                self._timings.append(
+                    ImportTiming(module_name, cumulative_seconds - children_seconds, cumulative_seconds)
+                )
+
+
+class _TimingFinder:
+    def __init__(self, profiler: ImportProfiler):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in list(sys.meta_path):
+            find_spec = getattr(finder, "find_spec", None)
+            if finder is self or find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimingLoader(spec.loader, self._profiler, fullname)
+        return spec
+
+    def invalidate_caches(self) -> None:
+        pass
+
+
+class _TimingLoader:
+    def __init__(self, loader, profiler: ImportProfiler, module_name: str):
+        self._loader = loader
+        self._profiler = profiler
+        self._module_name = module_name
+
+    def create_module(self, spec):
+        create_module = getattr(self._loader, "create_module", None)
+        return create_module(spec) if create_module is not None else None
+
+    def exec_module(self, module) -> None:
+        self._profiler._execute(self._module_name, self._loader.exec_module, module)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
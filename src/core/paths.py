@@ -0,0 +1,21 @@
+import hashlib
+import os
+import sys
+from pathlib import Path
+
+APP_CACHE_DIR_NAME = "cortex"
+
+
+def get_user_cache_dir() -> Path:
+    if sys.platform == "win32":
+        base_dir = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    elif sys.platform == "darwin":
+        base_dir = Path.home() / "Library" / "Caches"
+    else:
+        base_dir = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base_dir) / APP_CACHE_DIR_NAME
+
+
+def get_project_cache_key(project_dir: str) -> str:
+    resolved = str(Path(project_dir).resolve())
+    return hashlib.sha1(resolved.encode("utf-8")).hexdigest()[:16]
@@ -0,0 +1,75 @@
+import threading
+import time
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_MAX_UPDATES_PER_SECOND = 10.0
+
+
+class ThrottledProgressPublisher(Generic[T]):
+    def __init__(
+        self,
+        publish: Callable[[T], None],
+        max_updates_per_second: float = DEFAULT_MAX_UPDATES_PER_SECOND,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._publish = publish
+        self._min_interval = (
+            1.0 / max_updates_per_second if max_updates_per_second > 0 else 0.0
+        )
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._pending: Optional[T] = None
+        self._has_pending = False
+        self._last_published_at: Optional[float] = None
+        self._reported_count = 0
+        self._published_count = 0
+        self._publish_seconds = 0.0
+
+    @property
+    def reported_count(self) -> int:
+        return self._reported_count
+
+    @property
+    def published_count(self) -> int:
+        return self._published_count
+
+    @property
+    def publish_seconds(self) -> float:
+        return self._publish_seconds
+
+    @property
+    def estimated_seconds_saved(self) -> float:
+        if not self._published_count:
+            return 0.0
+        average_publish_seconds = self._publish_seconds / self._published_count
+        return average_publish_seconds * (self._reported_count - self._published_count)
+
+    def report(self, state: T) -> None:
+        with self._lock:
+            self._reported_count += 1
+            self._pending, self._has_pending = state, True
+            now = self._clock()
+            if (
+                self._last_published_at is not None
+                and now - self._last_published_at < self._min_interval
+            ):
+                return
+            self._publish_pending(now)
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._has_pending:
+                self._publish_pending(self._clock())
+
+    def _publish_pending(self, now: float) -> None:
+        state = self._pending
+        self._pending, self._has_pending = None, False
+        self._last_published_at = now
+        started_at = time.perf_counter()
+        try:
+            self._publish(state)
+        finally:
+            self._published_count += 1
+            self._publish_seconds += time.perf_counter() - started_at
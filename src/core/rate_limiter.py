@@ -0,0 +1,200 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Callable, Deque, Optional
+
+_INITIAL_BACKOFF_SECONDS = 2.0
+_MAX_BACKOFF_SECONDS = 60.0
+_QUEUED_THRESHOLD_SECONDS = 0.001
+
+
+@dataclass(frozen=True)
+class RateLimiterStats:
+    acquired: int = 0
+    queued: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    rate_limited: int = 0
+
+    @property
+    def average_wait_seconds(self) -> float:
+        return self.total_wait_seconds / self.acquired if self.acquired else 0.0
+
+
+class _TokenBucket:
+    def __init__(self, per_minute: float, now: float):
+        self._capacity = float(per_minute)
+        self._rate_per_second = self._capacity / 60.0
+        self._level = self._capacity
+        self._updated_at = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        self._refill(now)
+        self._level -= min(amount, self._capacity)
+        return 0.0 if self._level >= 0 else -self._level / self._rate_per_second
+
+    def charge(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self._level = max(self._level - amount, -self._capacity)
+
+    def drain(self, now: float) -> None:
+        self._refill(now)
+        self._level = min(self._level, 0.0)
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(now - self._updated_at, 0.0)
+        self._level = min(self._level + elapsed * self._rate_per_second, self._capacity)
+        self._updated_at = now
+
+
+class _ConcurrencyGate:
+    def __init__(self, limit: Optional[int]):
+        self._limit = limit
+        self._active = 0
+        self._waiters: Deque[Callable[[], None]] = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            if self._try_enter():
+                return
+            slot_granted = threading.Event()
+            self._waiters.append(slot_granted.set)
+        slot_granted.wait()
+
+    async def aacquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        slot_granted = loop.create_future()
+
+        def deliver() -> None:
+            if slot_granted.cancelled():
+                self.release()
+            else:
+                slot_granted.set_result(None)
+
+        def wake() -> None:
+            loop.call_soon_threadsafe(deliver)
+
+        with self._lock:
+            if self._try_enter():
+                return
+            self._waiters.append(wake)
+        try:
+            await slot_granted
+        except asyncio.CancelledError:
+            if slot_granted.done() and not slot_granted.cancelled():
+                self.release()
+            else:
+                with self._lock:
+                    if wake in self._waiters:
+                        self._waiters.remove(wake)
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            if not self._waiters:
+                self._active -= 1
+                return
+            wake = self._waiters.popleft()
+        wake()
+
+    def _try_enter(self) -> bool:
+        if self._limit is not None and (self._active >= self._limit or self._waiters):
+            return False
+        self._active += 1
+        return True
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrent: Optional[int] = None,
+    ):
+        now = time.monotonic()
+        self._request_bucket = _TokenBucket(requests_per_minute, now) if requests_per_minute else None
+        self._token_bucket = _TokenBucket(tokens_per_minute, now) if tokens_per_minute else None
+        self._gate = _ConcurrencyGate(max_concurrent)
+        self._lock = threading.Lock()
+        self._blocked_until = 0.0
+        self._stats = RateLimiterStats()
+
+    @property
+    def stats(self) -> RateLimiterStats:
+        return self._stats
+
+    def acquire(self, tokens: int = 0) -> float:
+        started_at = time.monotonic()
+        self._gate.acquire()
+        try:
+            ready_at = self._reserve(tokens)
+            while True:
+                delay = self._delay_until(ready_at)
+                if delay <= 0:
+                    break
+                time.sleep(delay)
+        except BaseException:
+            self._gate.release()
+            raise
+        return self._record_wait(time.monotonic() - started_at)
+
+    async def aacquire(self, tokens: int = 0) -> float:
+        started_at = time.monotonic()
+        await self._gate.aacquire()
+        try:
+            ready_at = self._reserve(tokens)
+            while True:
+                delay = self._delay_until(ready_at)
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+        except BaseException:
+            self._gate.release()
+            raise
+        return self._record_wait(time.monotonic() - started_at)
+
+    def release(self, extra_tokens: int = 0) -> None:
+        if extra_tokens and self._token_bucket is not None:
+            with self._lock:
+                self._token_bucket.charge(extra_tokens, time.monotonic())
+        self._gate.release()
+
+    def penalize(self, retry_after_seconds: Optional[float] = None, attempt: int = 0) -> float:
+        if retry_after_seconds is None:
+            retry_after_seconds = min(_INITIAL_BACKOFF_SECONDS * 2 ** attempt, _MAX_BACKOFF_SECONDS)
+        now = time.monotonic()
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, now + retry_after_seconds)
+            for bucket in (self._request_bucket, self._token_bucket):
+                if bucket is not None:
+                    bucket.drain(now)
+            self._stats = replace(self._stats, rate_limited=self._stats.rate_limited + 1)
+        return retry_after_seconds
+
+    def _reserve(self, tokens: int) -> float:
+        now = time.monotonic()
+        with self._lock:
+            delay = 0.0
+            if self._request_bucket is not None:
+                delay = max(delay, self._request_bucket.reserve(1, now))
+            if self._token_bucket is not None and tokens:
+                delay = max(delay, self._token_bucket.reserve(tokens, now))
+        return now + delay
+
+    def _delay_until(self, ready_at: float) -> float:
+        with self._lock:
+            return max(ready_at, self._blocked_until) - time.monotonic()
+
+    def _record_wait(self, waited_seconds: float) -> float:
+        with self._lock:
+            self._stats = replace(
+                self._stats,
+                acquired=self._stats.acquired + 1,
+                queued=self._stats.queued + (1 if waited_seconds > _QUEUED_THRESHOLD_SECONDS else 0),
+                total_wait_seconds=self._stats.total_wait_seconds + waited_seconds,
+                max_wait_seconds=max(self._stats.max_wait_seconds, waited_seconds),
+            )
+        return waited_seconds
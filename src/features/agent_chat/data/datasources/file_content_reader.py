@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+SNIFF_BLOCK_SIZE = 8192
+MAX_CONTROL_CHAR_RATIO = 0.3
+
+LOCKFILE_NAMES = frozenset(
+    {
+        "package-lock.json",
+        "npm-shrinkwrap.json",
+        "yarn.lock",
+        "pnpm-lock.yaml",
+        "bun.lockb",
+        "poetry.lock",
+        "pipfile.lock",
+        "uv.lock",
+        "cargo.lock",
+        "composer.lock",
+        "gemfile.lock",
+        "podfile.lock",
+        "pubspec.lock",
+        "go.sum",
+    }
+)
+
+_NON_CONTROL_BYTES = bytes([8, 9, 10, 12, 13, 27, *range(32, 127), *range(128, 256)])
+
+
+@dataclass(frozen=True)
+class FileReadResult:
+    content: Optional[str]
+    size: int
+    skip_reason: Optional[str] = None
+    truncated: bool = False
+
+
+def is_probably_binary(block: bytes) -> bool:
+    if not block:
+        return False
+    if b"\x00" in block:
+        return True
+    control_count = len(block.translate(None, _NON_CONTROL_BYTES))
+    return control_count / len(block) > MAX_CONTROL_CHAR_RATIO
+
+
+def read_text_file(
+    file_path: Path, size: int, max_file_bytes: Optional[int]
+) -> FileReadResult:
+    if file_path.name.lower() in LOCKFILE_NAMES:
+        return FileReadResult(content=None, size=size, skip_reason="archivo de bloqueo")
+
+    with open(file_path, "rb") as f:
+        head = f.read(SNIFF_BLOCK_SIZE)
+        if is_probably_binary(head):
+            return FileReadResult(content=None, size=size, skip_reason="binario")
+
+        if max_file_bytes is None:
+            data = head + f.read()
+        else:
+            data = head[:max_file_bytes]
+            remaining = max_file_bytes - len(data)
+            if remaining > 0:
+                data += f.read(remaining)
+
+    truncated = max_file_bytes is not None and size > max_file_bytes
+    return FileReadResult(content=_decode_text(data), size=size, truncated=truncated)
+
+
+def read_text_bytes(
+    file_name: str, data: bytes, max_file_bytes: Optional[int]
+) -> FileReadResult:
+    size = len(data)
+    if file_name.lower() in LOCKFILE_NAMES:
+        return FileReadResult(content=None, size=size, skip_reason="archivo de bloqueo")
+    if is_probably_binary(data[:SNIFF_BLOCK_SIZE]):
+        return FileReadResult(content=None, size=size, skip_reason="binario")
+    truncated = max_file_bytes is not None and size > max_file_bytes
+    if truncated:
+        data = data[:max_file_bytes]
+    return FileReadResult(content=_decode_text(data), size=size, truncated=truncated)
+
+
+def _decode_text(data: bytes) -> str:
+    content = data.decode("utf-8", errors="ignore")
+    return content.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def format_size(size: int) -> str:
+    if size < 1024:
+        return f"{size} B"
+    value = size / 1024
+    for unit in ("KB", "MB"):
+        if value < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
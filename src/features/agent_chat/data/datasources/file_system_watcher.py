@@ -0,0 +1,246 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from .project_walker import (
+    IGNORE_FILE_NAMES,
+    walk_project_directories,
+    walk_project_files,
+)
+
+ChangeCallback = Callable[[Set[str], bool], None]
+
+DEFAULT_DEBOUNCE_SECONDS = 0.2
+DEFAULT_POLL_INTERVAL_SECONDS = 5.0
+
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+    | _IN_ONLYDIR
+)
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_CHUNK_BYTES = 64 * 1024
+_SELECT_TIMEOUT_SECONDS = 0.1
+
+
+class FileSystemWatcher(ABC):
+    def __init__(
+        self,
+        project_path: Path,
+        on_changes: ChangeCallback,
+        debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS,
+    ):
+        self._project_path = project_path
+        self._on_changes = on_changes
+        self._debounce_seconds = debounce_seconds
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pending_paths: Set[str] = set()
+        self._pending_structure_change = False
+        self._last_event_at = 0.0
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name=type(self).__name__, daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    @abstractmethod
+    def _run(self) -> None:
+        pass
+
+    def _record(self, relative_path: str, structure_changed: bool = False) -> None:
+        if os.path.basename(relative_path) in IGNORE_FILE_NAMES:
+            structure_changed = True
+        if relative_path:
+            self._pending_paths.add(relative_path)
+        self._pending_structure_change |= structure_changed
+        self._last_event_at = time.monotonic()
+
+    def _flush_if_quiet(self) -> None:
+        if not self._pending_paths and not self._pending_structure_change:
+            return
+        if time.monotonic() - self._last_event_at < self._debounce_seconds:
+            return
+        changed_paths, structure_changed = (
+            self._pending_paths,
+            self._pending_structure_change,
+        )
+        self._pending_paths, self._pending_structure_change = set(), False
+        self._on_changes(changed_paths, structure_changed)
+
+
+class InotifyFileSystemWatcher(FileSystemWatcher):
+    def __init__(
+        self,
+        project_path: Path,
+        on_changes: ChangeCallback,
+        debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS,
+    ):
+        super().__init__(project_path, on_changes, debounce_seconds)
+        self._libc = _load_libc()
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._directories_by_watch: Dict[int, str] = {}
+        try:
+            self._watch_tree("")
+        except OSError:
+            os.close(self._fd)
+            raise
+
+    def stop(self) -> None:
+        started = self._thread is not None
+        super().stop()
+        if not started:
+            os.close(self._fd)
+
+    def _run(self) -> None:
+        try:
+            while not self._stop_event.is_set():
+                readable, _, _ = select.select([self._fd], [], [], _SELECT_TIMEOUT_SECONDS)
+                if readable:
+                    self._read_events()
+                self._flush_if_quiet()
+        finally:
+            os.close(self._fd)
+
+    def _read_events(self) -> None:
+        try:
+            buffer = os.read(self._fd, _READ_CHUNK_BYTES)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(buffer):
+            watch, mask, _, name_length = _EVENT_HEADER.unpack_from(buffer, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(buffer[offset : offset + name_length].rstrip(b"\0"))
+            offset += name_length
+            self._handle_event(watch, mask, name)
+
+    def _handle_event(self, watch: int, mask: int, name: str) -> None:
+        if mask & _IN_Q_OVERFLOW:
+            self._record("", structure_changed=True)
+            return
+        if mask & _IN_IGNORED:
+            self._directories_by_watch.pop(watch, None)
+            return
+        relative_dir = self._directories_by_watch.get(watch)
+        if relative_dir is None:
+            return
+        if mask & (_IN_DELETE_SELF | _IN_MOVE_SELF):
+            self._record(relative_dir, structure_changed=True)
+            return
+
+        relative_path = os.path.join(relative_dir, name) if relative_dir else name
+        if mask & _IN_ISDIR:
+            if mask & (_IN_CREATE | _IN_MOVED_TO):
+                self._watch_new_directory(relative_path)
+            self._record(relative_path, structure_changed=True)
+        else:
+            self._record(relative_path)
+
+    def _watch_new_directory(self, relative_path: str) -> None:
+        try:
+            self._watch_tree(relative_path)
+        except OSError:
+            pass
+
+    def _watch_tree(self, relative_dir: str) -> None:
+        for path, relative_subdir in walk_project_directories(
+            self._project_path, start_relative_dir=relative_dir
+        ):
+            watch = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(path), _WATCH_MASK
+            )
+            if watch < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+            self._directories_by_watch[watch] = relative_subdir
+
+
+class PollingFileSystemWatcher(FileSystemWatcher):
+    def __init__(
+        self,
+        project_path: Path,
+        on_changes: ChangeCallback,
+        poll_interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS,
+    ):
+        super().__init__(project_path, on_changes, debounce_seconds=0.0)
+        self._poll_interval_seconds = poll_interval_seconds
+        self._signatures: Dict[str, Tuple[int, int]] = {}
+
+    def _run(self) -> None:
+        self._signatures = self._snapshot()
+        while not self._stop_event.wait(self._poll_interval_seconds):
+            signatures = self._snapshot()
+            for relative_path, signature in signatures.items():
+                if self._signatures.get(relative_path) != signature:
+                    self._record(relative_path)
+            for relative_path in self._signatures.keys() - signatures.keys():
+                self._record(relative_path)
+            self._signatures = signatures
+            self._flush_if_quiet()
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        signatures = {}
+        for file_path, relative_path in walk_project_files(self._project_path):
+            try:
+                stat_result = file_path.stat()
+            except OSError:
+                continue
+            signatures[relative_path] = (stat_result.st_mtime_ns, stat_result.st_size)
+        return signatures
+
+
+def create_file_system_watcher(
+    project_path: Path,
+    on_changes: ChangeCallback,
+    debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS,
+    poll_interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS,
+) -> FileSystemWatcher:
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyFileSystemWatcher(project_path, on_changes, debounce_seconds)
+        except (OSError, AttributeError):
+            pass
+    return PollingFileSystemWatcher(project_path, on_changes, poll_interval_seconds)
+
+
+def _load_libc() -> ctypes.CDLL:
+    libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    libc.inotify_init1.argtypes = [ctypes.c_int]
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
@@ -0,0 +1,91 @@
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .....core.paths import get_user_cache_dir
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+_DATABASE_FILE_NAME = "llm_responses.sqlite3"
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS responses (
+        cache_key TEXT PRIMARY KEY,
+        response TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        last_used_ns INTEGER NOT NULL
+    ) WITHOUT ROWID
+"""
+
+
+class SqliteLlmResponseStore:
+    def __init__(self, database_path: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self._database_path = database_path or get_user_cache_dir() / _DATABASE_FILE_NAME
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._schema_ready = False
+
+    def get(self, cache_key: str) -> Optional[str]:
+        with self._lock:
+            try:
+                with self._connect() as connection:
+                    row = connection.execute(
+                        "SELECT response FROM responses WHERE cache_key = ?", (cache_key,)
+                    ).fetchone()
+                    if row is None:
+                        return None
+                    connection.execute(
+                        "UPDATE responses SET last_used_ns = ? WHERE cache_key = ?",
+                        (time.time_ns(), cache_key),
+                    )
+                    return row[0]
+            except (sqlite3.Error, OSError):
+                return None
+
+    def put(self, cache_key: str, response: str) -> int:
+        size = len(response.encode("utf-8"))
+        if size > self._max_bytes:
+            return 0
+        with self._lock:
+            try:
+                with self._connect() as connection:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO responses (cache_key, response, size, last_used_ns) "
+                        "VALUES (?, ?, ?, ?)",
+                        (cache_key, response, size, time.time_ns()),
+                    )
+                    return self._evict(connection)
+            except (sqlite3.Error, OSError):
+                return 0
+
+    def _evict(self, connection: sqlite3.Connection) -> int:
+        total_bytes = connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total_bytes <= self._max_bytes:
+            return 0
+        evicted_keys = []
+        for cache_key, size in connection.execute(
+            "SELECT cache_key, size FROM responses ORDER BY last_used_ns"
+        ):
+            evicted_keys.append((cache_key,))
+            total_bytes -= size
+            if total_bytes <= self._max_bytes:
+                break
+        connection.executemany("DELETE FROM responses WHERE cache_key = ?", evicted_keys)
+        return len(evicted_keys)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        self._database_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self._database_path, timeout=30)
+        try:
+            if not self._schema_ready:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute(_SCHEMA)
+                connection.commit()
+                self._schema_ready = True
+            with connection:
+                yield connection
+        finally:
+            connection.close()
@@ -0,0 +1,218 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Collection, Dict, Iterator, Optional, Set, Tuple
+
+from .....core.paths import get_user_cache_dir
+from .outline_extractor import outline_kind
+
+_SCHEMA_VERSION = 3
+_DATABASE_FILE_NAME = "map_index.sqlite3"
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS files (
+        project_key TEXT NOT NULL,
+        relative_path TEXT NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        size INTEGER NOT NULL,
+        content_hash TEXT NOT NULL,
+        content TEXT,
+        content_bytes INTEGER NOT NULL,
+        note TEXT,
+        PRIMARY KEY (project_key, relative_path)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS files_by_content_hash ON files (content_hash)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS segments (
+        content_hash TEXT PRIMARY KEY,
+        token_count INTEGER NOT NULL
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS outlines (
+        content_hash TEXT NOT NULL,
+        outline_kind TEXT NOT NULL,
+        outline TEXT NOT NULL,
+        PRIMARY KEY (content_hash, outline_kind)
+    ) WITHOUT ROWID
+    """,
+)
+_SEGMENT_TABLES = ("segments", "outlines")
+
+
+@dataclass(frozen=True)
+class MapIndexEntry:
+    mtime_ns: int
+    size: int
+    content_hash: str
+    content: Optional[str]
+    content_bytes: int
+    note: Optional[str]
+    token_count: Optional[int] = None
+    outline: Optional[str] = None
+
+
+class SqliteMapIndexStore:
+    def __init__(self, database_path: Optional[Path] = None):
+        self._database_path = database_path or get_user_cache_dir() / _DATABASE_FILE_NAME
+        self._lock = threading.Lock()
+        self._schema_ready = False
+
+    def load_entries(self, project_key: str) -> Dict[str, MapIndexEntry]:
+        with self._lock:
+            try:
+                with self._connect() as connection:
+                    rows = connection.execute(
+                        "SELECT f.relative_path, f.mtime_ns, f.size, f.content_hash, "
+                        "f.content, f.content_bytes, f.note, s.token_count "
+                        "FROM files f LEFT JOIN segments s ON s.content_hash = f.content_hash "
+                        "WHERE f.project_key = ?",
+                        (project_key,),
+                    ).fetchall()
+                    outline_rows = connection.execute(
+                        "SELECT DISTINCT o.content_hash, o.outline_kind, o.outline "
+                        "FROM files f JOIN outlines o ON o.content_hash = f.content_hash "
+                        "WHERE f.project_key = ?",
+                        (project_key,),
+                    ).fetchall()
+            except (sqlite3.Error, OSError):
+                return {}
+        outlines: Dict[Tuple[str, str], str] = {
+            (content_hash, kind): outline for content_hash, kind, outline in outline_rows
+        }
+        content_by_hash: Dict[str, str] = {}
+        return {
+            row[0]: MapIndexEntry(
+                mtime_ns=row[1],
+                size=row[2],
+                content_hash=row[3],
+                content=(
+                    content_by_hash.setdefault(row[3], row[4])
+                    if row[4] is not None
+                    else None
+                ),
+                content_bytes=row[5],
+                note=row[6],
+                token_count=row[7],
+                outline=outlines.get((row[3], outline_kind(row[0]))),
+            )
+            for row in rows
+        }
+
+    def save_entries(
+        self,
+        project_key: str,
+        entries: Dict[str, MapIndexEntry],
+        previous_entries: Dict[str, MapIndexEntry],
+        removed_paths: Collection[str] = (),
+    ) -> None:
+        changed = [
+            (relative_path, entry)
+            for relative_path, entry in entries.items()
+            if previous_entries.get(relative_path) is not entry
+        ]
+        removed = [(project_key, relative_path) for relative_path in removed_paths]
+        if not changed and not removed:
+            return
+        released_hashes: Set[str] = {
+            previous.content_hash
+            for previous in (previous_entries.get(path) for path in removed_paths)
+            if previous is not None
+        }
+        for relative_path, entry in changed:
+            previous = previous_entries.get(relative_path)
+            if previous is not None and previous.content_hash != entry.content_hash:
+                released_hashes.add(previous.content_hash)
+
+        with self._lock:
+            try:
+                with self._connect() as connection:
+                    connection.executemany(
+                        "DELETE FROM files WHERE project_key = ? AND relative_path = ?",
+                        removed,
+                    )
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO files (project_key, relative_path, mtime_ns, "
+                        "size, content_hash, content, content_bytes, note) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        [
+                            (
+                                project_key,
+                                relative_path,
+                                entry.mtime_ns,
+                                entry.size,
+                                entry.content_hash,
+                                entry.content,
+                                entry.content_bytes,
+                                entry.note,
+                            )
+                            for relative_path, entry in changed
+                        ],
+                    )
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO segments (content_hash, token_count) "
+                        "VALUES (?, ?)",
+                        [
+                            (entry.content_hash, entry.token_count)
+                            for _, entry in changed
+                            if entry.token_count is not None
+                        ],
+                    )
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO outlines (content_hash, outline_kind, outline) "
+                        "VALUES (?, ?, ?)",
+                        [
+                            (entry.content_hash, outline_kind(relative_path), entry.outline)
+                            for relative_path, entry in changed
+                            if entry.outline is not None
+                        ],
+                    )
+                    self._delete_orphaned_segments(connection, released_hashes)
+            except (sqlite3.Error, OSError):
+                pass
+
+    def _delete_orphaned_segments(
+        self, connection: sqlite3.Connection, content_hashes: Collection[str]
+    ) -> None:
+        orphaned = [
+            (content_hash,)
+            for content_hash in content_hashes
+            if connection.execute(
+                "SELECT 1 FROM files WHERE content_hash = ? LIMIT 1", (content_hash,)
+            ).fetchone()
+            is None
+        ]
+        for table in _SEGMENT_TABLES:
+            connection.executemany(f"DELETE FROM {table} WHERE content_hash = ?", orphaned)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        self._database_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self._database_path, timeout=30)
+        try:
+            if not self._schema_ready:
+                self._ensure_schema(connection)
+                self._schema_ready = True
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def _ensure_schema(self, connection: sqlite3.Connection) -> None:
+        connection.execute("PRAGMA journal_mode=WAL")
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != _SCHEMA_VERSION:
+            connection.execute("DROP TABLE IF EXISTS files")
+            connection.execute("DROP TABLE IF EXISTS segments")
+            connection.execute("DROP TABLE IF EXISTS outlines")
+        for statement in _SCHEMA:
+            connection.execute(statement)
+        connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        connection.commit()
+
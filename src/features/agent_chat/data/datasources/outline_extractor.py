@@ -0,0 +1,237 @@
+import ast
+import os
+import re
+from typing import Callable, Dict, List, Optional, Pattern
+
+_MAX_INLINE_VALUE_CHARS = 80
+
+_CONTROL_KEYWORDS = frozenset(
+    {
+        "if", "else", "for", "foreach", "while", "switch", "case", "catch", "return",
+        "do", "try", "new", "throw", "await", "yield", "when", "match", "with",
+        "elif", "finally", "super", "this", "print", "assert", "sizeof", "delete",
+    }
+)
+_C_LIKE_IMPORT = re.compile(
+    r"^\s*(?:import|package|using|#include|#import|use|library|part|export\s+(?:\*|\{|default\s+from))\b"
+)
+_C_LIKE_DECLARATION = re.compile(
+    r"^\s*(?:[@\w<>\[\]?,.]+\s+)*"
+    r"(?:class|interface|enum|struct|trait|impl|record|object|mixin|extension|protocol|typedef|type|union)"
+    r"\s+[\w<]"
+)
+_NAMESPACE_DECLARATION = re.compile(r"^\s*(?:export\s+)?namespace\s+[\w.]+\s*\{?\s*$")
+_STRING_LITERAL = re.compile(r"\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*'|`[^`]*`")
+_C_LIKE_FUNCTION_KEYWORD = re.compile(r"^\s*(?:[\w<>\[\]?,.]+\s+)*(?:function|func|fn|fun|def|sub)\b")
+_C_LIKE_MEMBER = re.compile(
+    r"^\s*(?:[@\w<>\[\]?,.*&:]+\s+)*[*&]?~?[A-Za-z_]\w*\s*(?:<[^()]*>)?\s*\([^;]*\)\s*"
+    r"(?:[\w\s:<>\[\]?,.&*\-]*)?(?:\{\s*|=>.*|:\s*[\w\s<>\[\]?,.]*\{?\s*)$"
+)
+_C_LIKE_SIGNATURE = re.compile(
+    r"^\s*(?:[@\w<>\[\]?,.*&:]+\s+)+[*&]?~?[A-Za-z_]\w*\s*(?:<[^()]*>)?\s*\([^;{}]*\)\s*"
+    r"(?:[\w\s:<>\[\]?,.&*()\-]*)?$"
+)
+_ARROW_FUNCTION = re.compile(
+    r"^\s*(?:export\s+)?(?:default\s+)?(?:const|let|var)\s+\w+\s*(?::[^=]+)?=\s*(?:async\s*)?(?:\([^)]*\)|\w+)\s*(?::[^=]+)?=>"
+)
+_RUBY_DECLARATION = re.compile(r"^\s*(?:require(?:_relative)?|include|extend|class|module|def)\b")
+
+
+def outline_kind(relative_path: str) -> str:
+    return os.path.splitext(relative_path)[1].lower()
+
+
+def extract_outline(relative_path: str, content: str) -> Optional[str]:
+    extractor = _EXTRACTORS.get(outline_kind(relative_path))
+    if extractor is None:
+        return None
+    return extractor(content)
+
+
+def _python_outline(content: str) -> Optional[str]:
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        return None
+    lines: List[str] = []
+    docstring = ast.get_docstring(tree, clean=True)
+    if docstring:
+        lines.append(f'"""{_first_line(docstring)}"""')
+    for node in tree.body:
+        _emit_python_node(node, 0, lines)
+    return "\n".join(lines)
+
+
+def _emit_python_node(node: ast.AST, depth: int, lines: List[str]) -> None:
+    indent = "    " * depth
+    if isinstance(node, (ast.Import, ast.ImportFrom)):
+        lines.append(indent + ast.unparse(node))
+    elif isinstance(node, ast.ClassDef):
+        _emit_decorators(node, indent, lines)
+        bases = [ast.unparse(base) for base in node.bases]
+        bases.extend(
+            f"{keyword.arg}={ast.unparse(keyword.value)}"
+            if keyword.arg
+            else f"**{ast.unparse(keyword.value)}"
+            for keyword in node.keywords
+        )
+        lines.append(f"{indent}class {node.name}" + (f"({', '.join(bases)})" if bases else "") + ":")
+        body_start = len(lines)
+        _emit_docstring(node, depth + 1, lines)
+        for child in node.body:
+            _emit_python_node(child, depth + 1, lines)
+        if len(lines) == body_start:
+            lines.append(f"{indent}    ...")
+    elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        _emit_decorators(node, indent, lines)
+        prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+        signature = f"{indent}{prefix} {node.name}({ast.unparse(node.args)})"
+        if node.returns is not None:
+            signature += f" -> {ast.unparse(node.returns)}"
+        lines.append(signature + ":")
+        _emit_docstring(node, depth + 1, lines)
+        lines.append(f"{indent}    ...")
+    elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+        lines.append(indent + _shorten_assignment(node))
+    elif isinstance(node, ast.If) and depth == 0 and _is_main_guard(node):
+        lines.append(f"{indent}if __name__ == \"__main__\":")
+        lines.append(f"{indent}    ...")
+
+
+def _emit_decorators(node: ast.AST, indent: str, lines: List[str]) -> None:
+    for decorator in node.decorator_list:
+        lines.append(f"{indent}@{ast.unparse(decorator)}")
+
+
+def _emit_docstring(node: ast.AST, depth: int, lines: List[str]) -> None:
+    docstring = ast.get_docstring(node, clean=True)
+    if docstring:
+        lines.append(f'{"    " * depth}"""{_first_line(docstring)}"""')
+
+
+def _shorten_assignment(node: ast.AST) -> str:
+    text = ast.unparse(node)
+    if len(text) <= _MAX_INLINE_VALUE_CHARS and "\n" not in text:
+        return text
+    if isinstance(node, ast.AnnAssign):
+        return f"{ast.unparse(node.target)}: {ast.unparse(node.annotation)} = ..."
+    targets = " = ".join(ast.unparse(target) for target in node.targets)
+    return f"{targets} = ..."
+
+
+def _is_main_guard(node: ast.If) -> bool:
+    test = node.test
+    return (
+        isinstance(test, ast.Compare)
+        and isinstance(test.left, ast.Name)
+        and test.left.id == "__name__"
+    )
+
+
+def _first_line(text: str) -> str:
+    return text.strip().splitlines()[0].strip() if text.strip() else ""
+
+
+def _c_like_outline(content: str) -> str:
+    lines: List[str] = []
+    open_blocks: List[bool] = []
+    in_block_comment = False
+    awaiting_declaration_block = False
+    pending_signature: Optional[str] = None
+    for raw_line in content.splitlines():
+        code = _strip_literals(raw_line)
+        if in_block_comment:
+            if "*/" not in code:
+                continue
+            code = code.split("*/", 1)[1]
+            in_block_comment = False
+        if "/*" in code:
+            code, _, rest = code.partition("/*")
+            in_block_comment = "*/" not in rest
+        stripped = code.strip()
+        if not stripped or stripped.startswith(("*", "#!")):
+            continue
+
+        if pending_signature is not None:
+            if stripped.startswith("{"):
+                lines.append(pending_signature + " { ... }")
+            pending_signature = None
+
+        opens_declaration = False
+        if all(open_blocks):
+            if _C_LIKE_IMPORT.match(code):
+                if not open_blocks:
+                    lines.append(raw_line.rstrip())
+            elif _is_type_declaration(code):
+                lines.append(_strip_body_opening(raw_line))
+                opens_declaration = True
+            elif _is_function_declaration(code, stripped, _C_LIKE_MEMBER):
+                lines.append(_strip_body_opening(raw_line))
+            elif _is_function_declaration(code, stripped, _C_LIKE_SIGNATURE):
+                pending_signature = raw_line.rstrip()
+
+        for char in code:
+            if char == "{":
+                open_blocks.append(opens_declaration or awaiting_declaration_block)
+                opens_declaration = awaiting_declaration_block = False
+            elif char == "}" and open_blocks:
+                open_blocks.pop()
+            elif char == ";":
+                awaiting_declaration_block = False
+        if opens_declaration:
+            awaiting_declaration_block = True
+    return "\n".join(lines)
+
+
+def _is_type_declaration(code: str) -> bool:
+    return bool(_C_LIKE_DECLARATION.match(code) or _NAMESPACE_DECLARATION.match(code))
+
+
+def _is_function_declaration(code: str, stripped: str, member_pattern: Pattern[str]) -> bool:
+    first_word = re.split(r"[\s(<]", stripped, 1)[0]
+    if first_word in _CONTROL_KEYWORDS or first_word.startswith(("}", ")", ".", "?", "{")):
+        return False
+    if member_pattern is _C_LIKE_SIGNATURE:
+        return bool(member_pattern.match(code))
+    return bool(
+        _ARROW_FUNCTION.match(code)
+        or _C_LIKE_FUNCTION_KEYWORD.match(code)
+        or member_pattern.match(code)
+    )
+
+
+def _strip_literals(line: str) -> str:
+    code = _STRING_LITERAL.sub('""', line)
+    comment_index = code.find("//")
+    return code if comment_index == -1 else code[:comment_index]
+
+
+def _strip_body_opening(line: str) -> str:
+    line = line.rstrip()
+    if line.endswith("{"):
+        return line[:-1].rstrip() + " { ... }"
+    arrow_index = line.find("=>")
+    if arrow_index != -1 and not line.endswith("=>"):
+        return line[: arrow_index + 2] + " ..."
+    return line
+
+
+def _ruby_outline(content: str) -> str:
+    return "\n".join(
+        line.rstrip() for line in content.splitlines() if _RUBY_DECLARATION.match(line)
+    )
+
+
+_EXTRACTORS: Dict[str, Callable[[str], Optional[str]]] = {
+    ".py": _python_outline,
+    ".pyi": _python_outline,
+    ".rb": _ruby_outline,
+    **{
+        extension: _c_like_outline
+        for extension in (
+            ".js", ".jsx", ".mjs", ".cjs", ".ts", ".tsx", ".java", ".kt", ".kts",
+            ".cs", ".go", ".rs", ".swift", ".dart", ".php", ".c", ".h", ".cc",
+            ".cpp", ".cxx", ".hpp", ".hh", ".m", ".mm", ".scala",
+        )
+    },
+}
@@ -0,0 +1,272 @@
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Pattern, Sequence, Tuple
+
+IGNORE_FILE_NAMES = (".gitignore", ".ignore")
+
+DEFAULT_IGNORE_PATTERNS = (
+    ".git/",
+    ".hg/",
+    ".svn/",
+    "node_modules/",
+    ".venv/",
+    "venv/",
+    "__pycache__/",
+    "build/",
+    "dist/",
+    ".idea/",
+    ".mypy_cache/",
+    ".pytest_cache/",
+    ".ruff_cache/",
+    ".tox/",
+    ".nox/",
+    ".eggs/",
+    "*.egg-info/",
+    ".dart_tool/",
+    ".gradle/",
+    ".next/",
+)
+
+
+@dataclass(frozen=True)
+class _IgnoreRule:
+    base: str
+    regex: Pattern[str]
+    negate: bool
+    dir_only: bool
+
+    def matches(self, relative_path: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        if self.base:
+            if not relative_path.startswith(self.base + "/"):
+                return False
+            relative_path = relative_path[len(self.base) + 1 :]
+        return self.regex.match(relative_path) is not None
+
+
+class IgnoreRules:
+    def __init__(self, rules: Sequence[_IgnoreRule] = ()):
+        self._rules = tuple(rules)
+        self._file_rules = tuple(rule for rule in self._rules if not rule.dir_only)
+
+    @classmethod
+    def from_patterns(cls, patterns: Iterable[str], base: str = "") -> "IgnoreRules":
+        return cls(_parse_patterns(patterns, base))
+
+    def extended_with_ignore_files(self, directory: Path, base: str) -> "IgnoreRules":
+        new_rules: List[_IgnoreRule] = []
+        for file_name in IGNORE_FILE_NAMES:
+            try:
+                with open(directory / file_name, "r", encoding="utf-8", errors="ignore") as f:
+                    new_rules.extend(_parse_patterns(f.read().splitlines(), base))
+            except OSError:
+                continue
+        if not new_rules:
+            return self
+        return IgnoreRules(self._rules + tuple(new_rules))
+
+    def is_ignored(self, relative_path: str, is_dir: bool) -> bool:
+        rules = self._rules if is_dir else self._file_rules
+        for rule in reversed(rules):
+            if rule.matches(relative_path, is_dir):
+                return not rule.negate
+        return False
+
+
+def walk_project_files(
+    project_path: Path,
+    respect_ignore_rules: bool = True,
+    default_patterns: Sequence[str] = DEFAULT_IGNORE_PATTERNS,
+) -> Iterator[Tuple[Path, str]]:
+    for root, relative_dir, files in _walk_tree(
+        project_path, respect_ignore_rules, default_patterns
+    ):
+        current_dir_path = Path(root)
+        for file_name in files:
+            relative_path = (
+                os.path.join(relative_dir, file_name) if relative_dir else file_name
+            )
+            yield current_dir_path / file_name, relative_path
+
+
+def walk_project_directories(
+    project_path: Path,
+    respect_ignore_rules: bool = True,
+    default_patterns: Sequence[str] = DEFAULT_IGNORE_PATTERNS,
+    start_relative_dir: str = "",
+) -> Iterator[Tuple[Path, str]]:
+    for root, relative_dir, _ in _walk_tree(
+        project_path, respect_ignore_rules, default_patterns, start_relative_dir
+    ):
+        yield Path(root), relative_dir
+
+
+def is_ignored_path(
+    project_path: Path,
+    relative_path: str,
+    is_dir: bool = False,
+    default_patterns: Sequence[str] = DEFAULT_IGNORE_PATTERNS,
+) -> bool:
+    parts = [part for part in relative_path.replace(os.sep, "/").split("/") if part]
+    rules = IgnoreRules.from_patterns(default_patterns)
+    current_dir = project_path
+    posix_relative_dir = ""
+    for index, part in enumerate(parts):
+        rules = rules.extended_with_ignore_files(current_dir, posix_relative_dir)
+        is_last = index == len(parts) - 1
+        candidate = _join(posix_relative_dir, part)
+        if rules.is_ignored(candidate, is_dir=is_dir if is_last else True):
+            return True
+        current_dir = current_dir / part
+        posix_relative_dir = candidate
+    return False
+
+
+def walk_order_key(relative_path: str) -> Tuple[Tuple[int, str], ...]:
+    parts = relative_path.replace(os.sep, "/").split("/")
+    return tuple((1, part) for part in parts[:-1]) + ((0, parts[-1]),)
+
+
+def _walk_tree(
+    project_path: Path,
+    respect_ignore_rules: bool,
+    default_patterns: Sequence[str],
+    start_relative_dir: str = "",
+) -> Iterator[Tuple[str, str, List[str]]]:
+    root_rules: Optional[IgnoreRules] = IgnoreRules()
+    if respect_ignore_rules:
+        root_rules = _inherited_rules(project_path, start_relative_dir, default_patterns)
+    if root_rules is None:
+        return
+    root_dir = os.fspath(project_path)
+    start_dir = os.path.join(root_dir, start_relative_dir) if start_relative_dir else root_dir
+    rules_by_dir = {start_dir: root_rules}
+
+    for root, dirs, files in os.walk(start_dir):
+        relative_dir = os.path.relpath(root, root_dir) if root != root_dir else ""
+        posix_relative_dir = relative_dir.replace(os.sep, "/")
+        rules = rules_by_dir.pop(root)
+        if respect_ignore_rules:
+            rules = rules.extended_with_ignore_files(Path(root), posix_relative_dir)
+
+        kept_dirs = []
+        for dir_name in sorted(dirs):
+            if respect_ignore_rules and rules.is_ignored(
+                _join(posix_relative_dir, dir_name), is_dir=True
+            ):
+                continue
+            kept_dirs.append(dir_name)
+            rules_by_dir[os.path.join(root, dir_name)] = rules
+        dirs[:] = kept_dirs
+
+        kept_files = [
+            file_name
+            for file_name in sorted(files)
+            if not respect_ignore_rules
+            or not rules.is_ignored(_join(posix_relative_dir, file_name), is_dir=False)
+        ]
+        yield root, relative_dir, kept_files
+
+
+def _inherited_rules(
+    project_path: Path, relative_dir: str, default_patterns: Sequence[str]
+) -> Optional[IgnoreRules]:
+    rules = IgnoreRules.from_patterns(default_patterns)
+    current_dir = project_path
+    posix_relative_dir = ""
+    for part in [part for part in relative_dir.replace(os.sep, "/").split("/") if part]:
+        rules = rules.extended_with_ignore_files(current_dir, posix_relative_dir)
+        candidate = _join(posix_relative_dir, part)
+        if rules.is_ignored(candidate, is_dir=True):
+            return None
+        current_dir = current_dir / part
+        posix_relative_dir = candidate
+    return rules
+
+
+def _parse_patterns(patterns: Iterable[str], base: str) -> List[_IgnoreRule]:
+    rules = []
+    for line in patterns:
+        rule = _parse_pattern(line, base)
+        if rule is not None:
+            rules.append(rule)
+    return rules
+
+
+def _parse_pattern(line: str, base: str) -> Optional[_IgnoreRule]:
+    pattern = line.rstrip("\n\r")
+    if not pattern.endswith("\\ "):
+        pattern = pattern.rstrip(" ")
+    if not pattern or pattern.startswith("#"):
+        return None
+
+    negate = pattern.startswith("!")
+    if negate:
+        pattern = pattern[1:]
+    elif pattern.startswith("\\!") or pattern.startswith("\\#"):
+        pattern = pattern[1:]
+
+    dir_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    if not pattern:
+        return None
+
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+    body = _translate_glob(pattern)
+    regex = f"^{body}$" if anchored else f"^(?:.*/)?{body}$"
+
+    return _IgnoreRule(
+        base=base,
+        regex=re.compile(regex, re.DOTALL),
+        negate=negate,
+        dir_only=dir_only,
+    )
+
+
+def _translate_glob(pattern: str) -> str:
+    parts = []
+    i = 0
+    length = len(pattern)
+    while i < length:
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == length:
+            parts.append("/.*")
+            i += 3
+        elif pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif char == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif char == "?":
+            parts.append("[^/]")
+            i += 1
+        elif char == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                parts.append(re.escape(char))
+                i += 1
+                continue
+            char_class = pattern[i + 1 : end].replace("\\", "\\\\")
+            if char_class.startswith("!"):
+                char_class = "^" + char_class[1:]
+            parts.append(f"[{char_class}]")
+            i = end + 1
+        elif char == "\\" and i + 1 < length:
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(char))
+            i += 1
+    return "".join(parts)
+
+
+def _join(relative_dir: str, name: str) -> str:
+    return f"{relative_dir}/{name}" if relative_dir else name
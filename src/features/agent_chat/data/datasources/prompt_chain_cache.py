@@ -0,0 +1,47 @@
+import threading
+from collections import OrderedDict
+from typing import Tuple
+
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
+
+DEFAULT_MAX_ENTRIES = 64
+
+
+class PromptChainCache:
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self._max_entries = max(max_entries, 1)
+        self._chains: "OrderedDict[Tuple[int, str], Tuple[Runnable, Runnable]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def get_chain(self, prompt_template: str, chain_tail: Runnable) -> Runnable:
+        key = (id(chain_tail), prompt_template)
+        with self._lock:
+            cached = self._chains.get(key)
+            if cached is not None:
+                self._chains.move_to_end(key)
+                self._hits += 1
+                return cached[1]
+            self._misses += 1
+
+        chain = ChatPromptTemplate.from_template(prompt_template) | chain_tail
+
+        with self._lock:
+            self._chains[key] = (chain_tail, chain)
+            self._chains.move_to_end(key)
+            while len(self._chains) > self._max_entries:
+                self._chains.popitem(last=False)
+        return chain
+
+
+shared_prompt_chain_cache = PromptChainCache()
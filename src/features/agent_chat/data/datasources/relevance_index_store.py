@@ -0,0 +1,117 @@
+import json
+import sqlite3
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from .....core.paths import get_user_cache_dir
+
+_SCHEMA_VERSION = 1
+_DATABASE_FILE_NAME = "relevance_index.sqlite3"
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS documents (
+        project_key TEXT NOT NULL,
+        relative_path TEXT NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        size INTEGER NOT NULL,
+        term_counts TEXT NOT NULL,
+        PRIMARY KEY (project_key, relative_path)
+    ) WITHOUT ROWID
+    """,
+)
+
+
+@dataclass(frozen=True)
+class RelevanceDocument:
+    mtime_ns: int
+    size: int
+    term_counts: Counter
+
+
+class SqliteRelevanceIndexStore:
+    def __init__(self, database_path: Optional[Path] = None):
+        self._database_path = database_path or get_user_cache_dir() / _DATABASE_FILE_NAME
+        self._lock = threading.Lock()
+        self._schema_ready = False
+
+    def load_documents(self, project_key: str) -> Dict[str, RelevanceDocument]:
+        with self._lock:
+            try:
+                with self._connect() as connection:
+                    rows = connection.execute(
+                        "SELECT relative_path, mtime_ns, size, term_counts "
+                        "FROM documents WHERE project_key = ?",
+                        (project_key,),
+                    ).fetchall()
+            except (sqlite3.Error, OSError):
+                return {}
+        documents = {}
+        for relative_path, mtime_ns, size, term_counts in rows:
+            try:
+                counts = Counter(json.loads(term_counts))
+            except ValueError:
+                continue
+            documents[relative_path] = RelevanceDocument(mtime_ns, size, counts)
+        return documents
+
+    def save_documents(
+        self, project_key: str, changes: Dict[str, Optional[RelevanceDocument]]
+    ) -> None:
+        if not changes:
+            return
+        with self._lock:
+            try:
+                with self._connect() as connection:
+                    connection.executemany(
+                        "DELETE FROM documents WHERE project_key = ? AND relative_path = ?",
+                        [
+                            (project_key, relative_path)
+                            for relative_path, document in changes.items()
+                            if document is None
+                        ],
+                    )
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO documents (project_key, relative_path, "
+                        "mtime_ns, size, term_counts) VALUES (?, ?, ?, ?, ?)",
+                        [
+                            (
+                                project_key,
+                                relative_path,
+                                document.mtime_ns,
+                                document.size,
+                                json.dumps(document.term_counts, separators=(",", ":")),
+                            )
+                            for relative_path, document in changes.items()
+                            if document is not None
+                        ],
+                    )
+            except (sqlite3.Error, OSError):
+                pass
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        self._database_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self._database_path, timeout=30)
+        try:
+            if not self._schema_ready:
+                self._ensure_schema(connection)
+                self._schema_ready = True
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def _ensure_schema(self, connection: sqlite3.Connection) -> None:
+        connection.execute("PRAGMA journal_mode=WAL")
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != _SCHEMA_VERSION:
+            connection.execute("DROP TABLE IF EXISTS documents")
+        for statement in _SCHEMA:
+            connection.execute(statement)
+        connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        connection.commit()
@@ -0,0 +1,35 @@
+import re
+import threading
+from collections import OrderedDict
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+_CHARS_PER_WORD_TOKEN = 4
+
+
+class TokenEstimator:
+    def __init__(self, max_cached_entries: int = 50_000):
+        self._max_cached_entries = max_cached_entries
+        self._cache: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def estimate(self, text: str, content_hash: str) -> int:
+        with self._lock:
+            cached = self._cache.get(content_hash)
+            if cached is not None:
+                self._cache.move_to_end(content_hash)
+                return cached
+
+        tokens = estimate_tokens(text)
+
+        with self._lock:
+            self._cache[content_hash] = tokens
+            if len(self._cache) > self._max_cached_entries:
+                self._cache.popitem(last=False)
+        return tokens
+
+
+def estimate_tokens(text: str) -> int:
+    return sum(
+        1 + (len(piece) - 1) // _CHARS_PER_WORD_TOKEN
+        for piece in _TOKEN_PATTERN.findall(text)
+    )
@@ -0,0 +1,288 @@
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Collection, Dict, List, Optional, Set, Tuple
+
+from .....core.paths import get_project_cache_key
+from ...domain.repositories.i_relevance_index_repository import (
+    IRelevanceIndexRepository,
+)
+from ..datasources.file_content_reader import read_text_file
+from ..datasources.project_walker import is_ignored_path, walk_project_files
+from ..datasources.relevance_index_store import RelevanceDocument, SqliteRelevanceIndexStore
+
+_WORD_PATTERN = re.compile(r"\w+")
+_SUBWORD_PATTERN = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+")
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+_PATH_TERM_WEIGHT = 3
+_MAX_QUERY_TERMS = 64
+_MAX_DOCUMENT_FREQUENCY_RATIO = 0.5
+_MAX_INDEXED_BYTES = 256 * 1024
+_MAX_STALE_DOCUMENT_RATIO = 0.25
+
+
+def tokenize(text: str) -> List[str]:
+    terms: List[str] = []
+    for word in _WORD_PATTERN.findall(text):
+        terms.extend(_split_word(word))
+    return terms
+
+
+def count_terms(text: str, weight: int = 1) -> Counter:
+    term_counts: Counter = Counter()
+    for word, count in Counter(_WORD_PATTERN.findall(text)).items():
+        for term in _split_word(word):
+            term_counts[term] += count * weight
+    return term_counts
+
+
+@lru_cache(maxsize=200_000)
+def _split_word(word: str) -> Tuple[str, ...]:
+    terms = [word.lower()] if len(word) > 1 else []
+    parts = _SUBWORD_PATTERN.findall(word)
+    if len(parts) > 1:
+        terms.extend(part.lower() for part in parts if len(part) > 1)
+    return tuple(terms)
+
+
+@dataclass(frozen=True)
+class _IndexedDocument:
+    relative_path: str
+    mtime_ns: int
+    size: int
+    length: int
+
+
+class _ProjectIndex:
+    def __init__(self):
+        self.documents: Dict[int, _IndexedDocument] = {}
+        self.ids_by_path: Dict[str, int] = {}
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.total_length = 0
+        self.next_id = 0
+        self.stale_documents = 0
+        self.watched = False
+        self.synced = False
+        self.dirty_paths: Set[str] = set()
+
+    def is_current(self, relative_path: str, mtime_ns: int, size: int) -> bool:
+        doc_id = self.ids_by_path.get(relative_path)
+        if doc_id is None:
+            return False
+        document = self.documents[doc_id]
+        return document.mtime_ns == mtime_ns and document.size == size
+
+    def add(
+        self, relative_path: str, mtime_ns: int, size: int, term_counts: Counter
+    ) -> None:
+        self.remove(relative_path)
+        doc_id = self.next_id
+        self.next_id += 1
+        length = sum(term_counts.values())
+        self.documents[doc_id] = _IndexedDocument(
+            relative_path=relative_path, mtime_ns=mtime_ns, size=size, length=length
+        )
+        self.ids_by_path[relative_path] = doc_id
+        self.total_length += length
+        postings = self.postings
+        for term, count in term_counts.items():
+            posting = postings.get(term)
+            if posting is None:
+                postings[term] = {doc_id: count}
+            else:
+                posting[doc_id] = count
+
+    def remove(self, relative_path: str) -> None:
+        doc_id = self.ids_by_path.pop(relative_path, None)
+        if doc_id is None:
+            return
+        self.total_length -= self.documents.pop(doc_id).length
+        self.stale_documents += 1
+
+    def compact_if_needed(self) -> bool:
+        if self.stale_documents <= _MAX_STALE_DOCUMENT_RATIO * len(self.documents):
+            return False
+        documents = self.documents
+        compacted = {}
+        for term, posting in self.postings.items():
+            live_posting = {
+                doc_id: count for doc_id, count in posting.items() if doc_id in documents
+            }
+            if live_posting:
+                compacted[term] = live_posting
+        self.postings = compacted
+        self.stale_documents = 0
+        return True
+
+    def rank(self, query: str, limit: int) -> List[str]:
+        document_count = len(self.documents)
+        if not document_count or limit <= 0:
+            return []
+
+        max_document_frequency = max(
+            1, int(document_count * _MAX_DOCUMENT_FREQUENCY_RATIO)
+        )
+        weighted_terms = []
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            document_frequency = len(posting)
+            if document_count > 20 and document_frequency > max_document_frequency:
+                continue
+            idf = math.log(
+                1 + (document_count - document_frequency + 0.5) / (document_frequency + 0.5)
+            )
+            weighted_terms.append((idf, term))
+
+        average_length = self.total_length / document_count or 1.0
+        scores: Dict[int, float] = {}
+        documents = self.documents
+        for idf, term in heapq.nlargest(_MAX_QUERY_TERMS, weighted_terms):
+            for doc_id, term_frequency in self.postings[term].items():
+                document = documents.get(doc_id)
+                if document is None:
+                    continue
+                length_norm = _BM25_K1 * (
+                    1 - _BM25_B + _BM25_B * document.length / average_length
+                )
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * (
+                    term_frequency * (_BM25_K1 + 1) / (term_frequency + length_norm)
+                )
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [documents[doc_id].relative_path for doc_id, _ in best]
+
+
+class Bm25RelevanceIndexRepository(IRelevanceIndexRepository):
+    def __init__(self, index_store: Optional[SqliteRelevanceIndexStore] = None):
+        self._index_store = index_store or SqliteRelevanceIndexStore()
+        self._indexes: Dict[str, _ProjectIndex] = {}
+        self._lock = threading.Lock()
+
+    def rank_files(self, project_dir: str, query: str, limit: int) -> List[str]:
+        project_path = Path(project_dir).resolve()
+        with self._lock:
+            index = self._index_for(project_path)
+            changes = self._refresh(index, project_path)
+            ranked = index.rank(query, limit)
+        self._index_store.save_documents(get_project_cache_key(str(project_path)), changes)
+        return ranked
+
+    def watch_project(self, project_dir: str) -> None:
+        with self._lock:
+            index = self._index_for(Path(project_dir).resolve())
+            index.watched = True
+            index.synced = False
+
+    def release_project(self, project_dir: str) -> None:
+        with self._lock:
+            index = self._indexes.get(str(Path(project_dir).resolve()))
+            if index is not None:
+                index.watched = False
+
+    def apply_file_changes(
+        self,
+        project_dir: str,
+        relative_paths: Collection[str],
+        structure_changed: bool = False,
+    ) -> None:
+        with self._lock:
+            index = self._indexes.get(str(Path(project_dir).resolve()))
+            if index is None or not index.watched:
+                return
+            if structure_changed:
+                index.synced = False
+            index.dirty_paths.update(relative_paths)
+
+    def _index_for(self, project_path: Path) -> _ProjectIndex:
+        project_key = str(project_path)
+        index = self._indexes.get(project_key)
+        if index is None:
+            index = _ProjectIndex()
+            stored = self._index_store.load_documents(get_project_cache_key(project_key))
+            for relative_path, document in stored.items():
+                index.add(relative_path, document.mtime_ns, document.size, document.term_counts)
+            self._indexes[project_key] = index
+        return index
+
+    def _refresh(
+        self, index: _ProjectIndex, project_path: Path
+    ) -> Dict[str, Optional[RelevanceDocument]]:
+        changes: Dict[str, Optional[RelevanceDocument]] = {}
+        dirty_paths, index.dirty_paths = index.dirty_paths, set()
+        if index.watched and index.synced:
+            for relative_path in dirty_paths:
+                self._refresh_path(index, project_path, relative_path, changes)
+        else:
+            self._refresh_all(index, project_path, changes)
+            index.synced = True
+        index.compact_if_needed()
+        return changes
+
+    def _refresh_all(
+        self,
+        index: _ProjectIndex,
+        project_path: Path,
+        changes: Dict[str, Optional[RelevanceDocument]],
+    ) -> None:
+        seen_paths = set()
+        for file_path, relative_path in walk_project_files(project_path):
+            seen_paths.add(relative_path)
+            self._refresh_file(index, file_path, relative_path, changes)
+
+        for relative_path in list(index.ids_by_path):
+            if relative_path not in seen_paths:
+                index.remove(relative_path)
+                changes[relative_path] = None
+
+    def _refresh_path(
+        self,
+        index: _ProjectIndex,
+        project_path: Path,
+        relative_path: str,
+        changes: Dict[str, Optional[RelevanceDocument]],
+    ) -> None:
+        file_path = project_path / relative_path
+        if file_path.is_file() and not is_ignored_path(project_path, relative_path):
+            self._refresh_file(index, file_path, relative_path, changes)
+        elif relative_path in index.ids_by_path:
+            index.remove(relative_path)
+            changes[relative_path] = None
+
+    def _refresh_file(
+        self,
+        index: _ProjectIndex,
+        file_path: Path,
+        relative_path: str,
+        changes: Dict[str, Optional[RelevanceDocument]],
+    ) -> None:
+        try:
+            stat_result = file_path.stat()
+        except OSError:
+            return
+        if index.is_current(relative_path, stat_result.st_mtime_ns, stat_result.st_size):
+            return
+        document = RelevanceDocument(
+            stat_result.st_mtime_ns,
+            stat_result.st_size,
+            self._count_terms(file_path, relative_path, stat_result.st_size),
+        )
+        index.add(relative_path, document.mtime_ns, document.size, document.term_counts)
+        changes[relative_path] = document
+
+    def _count_terms(self, file_path: Path, relative_path: str, size: int) -> Counter:
+        term_counts = count_terms(relative_path, weight=_PATH_TERM_WEIGHT)
+        try:
+            result = read_text_file(file_path, size, _MAX_INDEXED_BYTES)
+        except OSError:
+            return term_counts
+        if result.content:
+            term_counts.update(count_terms(result.content))
+        return term_counts
@@ -0,0 +1,141 @@
+import asyncio
+import hashlib
+import json
+import threading
+from dataclasses import dataclass, replace
+from typing import AsyncIterator, Dict, Iterator
+
+from ...domain.repositories.i_llm_repository import ILLMRepository
+from ..datasources.llm_response_store import SqliteLlmResponseStore
+
+
+@dataclass(frozen=True)
+class LlmCacheStats:
+    hits: int = 0
+    misses: int = 0
+    bypasses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CachingLLMRepository(ILLMRepository):
+    def __init__(self, repository: ILLMRepository, store: SqliteLlmResponseStore, namespace: str):
+        self._repository = repository
+        self._store = store
+        self._namespace = namespace
+        self._stats = LlmCacheStats()
+        self._stats_lock = threading.Lock()
+
+    @property
+    def stats(self) -> LlmCacheStats:
+        return self._stats
+
+    def execute_prompt(
+        self, prompt_template: str, context: Dict[str, str], use_cache: bool = True
+    ) -> str:
+        if not use_cache:
+            self._count(bypasses=1)
+            return self._repository.execute_prompt(prompt_template, context, use_cache)
+
+        cache_key = self._cache_key(prompt_template, context)
+        cached_response = self._store.get(cache_key)
+        if cached_response is not None:
+            self._count(hits=1)
+            return cached_response
+
+        self._count(misses=1)
+        response = self._repository.execute_prompt(prompt_template, context, use_cache)
+        if response:
+            self._count(evictions=self._store.put(cache_key, response))
+        return response
+
+    def stream_prompt(
+        self, prompt_template: str, context: Dict[str, str], use_cache: bool = True
+    ) -> Iterator[str]:
+        if not use_cache:
+            self._count(bypasses=1)
+            yield from self._repository.stream_prompt(prompt_template, context, use_cache)
+            return
+
+        cache_key = self._cache_key(prompt_template, context)
+        cached_response = self._store.get(cache_key)
+        if cached_response is not None:
+            self._count(hits=1)
+            yield cached_response
+            return
+
+        self._count(misses=1)
+        chunks = []
+        for chunk in self._repository.stream_prompt(prompt_template, context, use_cache):
+            chunks.append(chunk)
+            yield chunk
+        response = "".join(chunks)
+        if response:
+            self._count(evictions=self._store.put(cache_key, response))
+
+    async def aexecute_prompt(
+        self, prompt_template: str, context: Dict[str, str], use_cache: bool = True
+    ) -> str:
+        if not use_cache:
+            self._count(bypasses=1)
+            return await self._repository.aexecute_prompt(prompt_template, context, use_cache)
+
+        cache_key = self._cache_key(prompt_template, context)
+        cached_response = await asyncio.to_thread(self._store.get, cache_key)
+        if cached_response is not None:
+            self._count(hits=1)
+            return cached_response
+
+        self._count(misses=1)
+        response = await self._repository.aexecute_prompt(prompt_template, context, use_cache)
+        if response:
+            self._count(evictions=await asyncio.to_thread(self._store.put, cache_key, response))
+        return response
+
+    async def astream_prompt(
+        self, prompt_template: str, context: Dict[str, str], use_cache: bool = True
+    ) -> AsyncIterator[str]:
+        if not use_cache:
+            self._count(bypasses=1)
+            async for chunk in self._repository.astream_prompt(prompt_template, context, use_cache):
+                yield chunk
+            return
+
+        cache_key = self._cache_key(prompt_template, context)
+        cached_response = await asyncio.to_thread(self._store.get, cache_key)
+        if cached_response is not None:
+            self._count(hits=1)
+            yield cached_response
+            return
+
+        self._count(misses=1)
+        chunks = []
+        async for chunk in self._repository.astream_prompt(prompt_template, context, use_cache):
+            chunks.append(chunk)
+            yield chunk
+        response = "".join(chunks)
+        if response:
+            self._count(evictions=await asyncio.to_thread(self._store.put, cache_key, response))
+
+    def _cache_key(self, prompt_template: str, context: Dict[str, str]) -> str:
+        used_context = {
+            key: value for key, value in context.items() if f"{{{key}}}" in prompt_template
+        }
+        payload = json.dumps(
+            [self._namespace, prompt_template, used_context],
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _count(self, **increments: int) -> None:
+        with self._stats_lock:
+            self._stats = replace(
+                self._stats,
+                **{name: getattr(self._stats, name) + value for name, value in increments.items()},
+            )
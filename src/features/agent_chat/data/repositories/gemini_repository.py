@@ -1,28 +1,61 @@
-from typing import Dict
+from typing import AsyncIterator, Dict, Iterator, Optional
 
+from google.api_core.exceptions import InternalServerError, ServiceUnavailable
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import ChatPromptTemplate
 from langchain_google_genai import ChatGoogleGenerativeAI
 
 from .....core.config import Settings
 from ...domain.repositories.i_llm_repository import ILLMRepository
+from ..datasources.prompt_chain_cache import PromptChainCache, shared_prompt_chain_cache
 
 
 class GeminiRepository(ILLMRepository):
-    def __init__(self, settings: Settings, max_retries: int = 5):
+    def __init__(
+        self,
+        settings: Settings,
+        max_retries: int = 5,
+        chain_cache: Optional[PromptChainCache] = None,
+    ):
         if not settings.GOOGLE_API_KEY:
             raise ValueError("Google API key is not set.")
 
-        self._model = ChatGoogleGenerativeAI(
+        self._streaming_model = ChatGoogleGenerativeAI(
             model="gemini-2.5-flash-preview-05-20",
             temperature=0.0,
-            max_retries=max_retries,
+            max_retries=0,
             google_api_key=settings.GOOGLE_API_KEY
         )
+        self._model = self._streaming_model.with_retry(
+            retry_if_exception_type=(InternalServerError, ServiceUnavailable),
+            stop_after_attempt=max_retries,
+        )
         self._parser = StrOutputParser()
+        self._chain_tail = self._model | self._parser
+        self._streaming_chain_tail = self._streaming_model | self._parser
+        self._chain_cache = shared_prompt_chain_cache if chain_cache is None else chain_cache
 
-    def execute_prompt(self, prompt_template: str, context: Dict[str, str]) -> str:
-        prompt = ChatPromptTemplate.from_template(prompt_template)
-        chain = prompt | self._model | self._parser
+    def execute_prompt(
+        self, prompt_template: str, context: Dict[str, str], use_cache: bool = True
+    ) -> str:
+        chain = self._chain_cache.get_chain(prompt_template, self._chain_tail)
         response = chain.invoke(context)
         return response
+
+    def stream_prompt(
+        self, prompt_template: str, context: Dict[str, str], use_cache: bool = True
+    ) -> Iterator[str]:
+        chain = self._chain_cache.get_chain(prompt_template, self._streaming_chain_tail)
+        yield from chain.stream(context)
+
+    async def aexecute_prompt(
+        self, prompt_template: str, context: Dict[str, str], use_cache: bool = True
+    ) -> str:
+        chain = self._chain_cache.get_chain(prompt_template, self._chain_tail)
+        return await chain.ainvoke(context)
+
+    async def astream_prompt(
+        self, prompt_template: str, context: Dict[str, str], use_cache: bool = True
+    ) -> AsyncIterator[str]:
+        chain = self._chain_cache.get_chain(prompt_template, self._streaming_chain_tail)
+        async for chunk in chain.astream(context):
+            yield chunk
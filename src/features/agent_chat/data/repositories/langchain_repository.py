@@ -1,24 +1,58 @@
-from typing import Dict
+from typing import AsyncIterator, Dict, Iterator, Optional
 
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
+from openai import APIConnectionError, InternalServerError
 
 from .....core.config import Settings
 from ...domain.repositories.i_llm_repository import ILLMRepository
+from ..datasources.prompt_chain_cache import PromptChainCache, shared_prompt_chain_cache
 
 
 class LangchainRepository(ILLMRepository):
-    def __init__(self, settings: Settings, max_retries: int = 5):
-        self._model = ChatOpenAI(
+    def __init__(
+        self,
+        settings: Settings,
+        max_retries: int = 5,
+        chain_cache: Optional[PromptChainCache] = None,
+    ):
+        self._streaming_model = ChatOpenAI(
             model="gpt-4o",
             temperature=0.0,
             timeout=120,
-        ).with_retry(stop_after_attempt=max_retries)
+            max_retries=0,
+        )
+        self._model = self._streaming_model.with_retry(
+            retry_if_exception_type=(APIConnectionError, InternalServerError),
+            stop_after_attempt=max_retries,
+        )
         self._parser = StrOutputParser()
+        self._chain_tail = self._model | self._parser
+        self._streaming_chain_tail = self._streaming_model | self._parser
+        self._chain_cache = shared_prompt_chain_cache if chain_cache is None else chain_cache
 
-    def execute_prompt(self, prompt_template: str, context: Dict[str, str]) -> str:
-        prompt = ChatPromptTemplate.from_template(prompt_template)
-        chain = prompt | self._model | self._parser
+    def execute_prompt(
+        self, prompt_template: str, context: Dict[str, str], use_cache: bool = True
+    ) -> str:
+        chain = self._chain_cache.get_chain(prompt_template, self._chain_tail)
         response = chain.invoke(context)
         return response
+
+    def stream_prompt(
+        self, prompt_template: str, context: Dict[str, str], use_cache: bool = True
+    ) -> Iterator[str]:
+        chain = self._chain_cache.get_chain(prompt_template, self._streaming_chain_tail)
+        yield from chain.stream(context)
+
+    async def aexecute_prompt(
+        self, prompt_template: str, context: Dict[str, str], use_cache: bool = True
+    ) -> str:
+        chain = self._chain_cache.get_chain(prompt_template, self._chain_tail)
+        return await chain.ainvoke(context)
+
+    async def astream_prompt(
+        self, prompt_template: str, context: Dict[str, str], use_cache: bool = True
+    ) -> AsyncIterator[str]:
+        chain = self._chain_cache.get_chain(prompt_template, self._streaming_chain_tail)
+        async for chunk in chain.astream(context):
+            yield chunk
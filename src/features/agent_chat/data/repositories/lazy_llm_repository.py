@@ -0,0 +1,54 @@
+import asyncio
+import threading
+from typing import AsyncIterator, Callable, Dict, Iterator, Optional
+
+from ...domain.repositories.i_llm_repository import ILLMRepository
+
+
+class LazyLLMRepository(ILLMRepository):
+    def __init__(self, factory: Callable[[], ILLMRepository]):
+        self._factory = factory
+        self._repository: Optional[ILLMRepository] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._repository is not None
+
+    def execute_prompt(
+        self, prompt_template: str, context: Dict[str, str], use_cache: bool = True
+    ) -> str:
+        return self._get_repository().execute_prompt(prompt_template, context, use_cache)
+
+    def stream_prompt(
+        self, prompt_template: str, context: Dict[str, str], use_cache: bool = True
+    ) -> Iterator[str]:
+        return self._get_repository().stream_prompt(prompt_template, context, use_cache)
+
+    async def aexecute_prompt(
+        self, prompt_template: str, context: Dict[str, str], use_cache: bool = True
+    ) -> str:
+        repository = await self._aget_repository()
+        return await repository.aexecute_prompt(prompt_template, context, use_cache)
+
+    async def astream_prompt(
+        self, prompt_template: str, context: Dict[str, str], use_cache: bool = True
+    ) -> AsyncIterator[str]:
+        repository = await self._aget_repository()
+        async for chunk in repository.astream_prompt(prompt_template, context, use_cache):
+            yield chunk
+
+    async def _aget_repository(self) -> ILLMRepository:
+        repository = self._repository
+        if repository is None:
+            repository = await asyncio.to_thread(self._get_repository)
+        return repository
+
+    def _get_repository(self) -> ILLMRepository:
+        repository = self._repository
+        if repository is None:
+            with self._lock:
+                if self._repository is None:
+                    self._repository = self._factory()
+                repository = self._repository
+        return repository
@@ -1,18 +1,100 @@
+import os
+import queue
+import threading
 from pathlib import Path
+from typing import Callable, List, Optional, Tuple
 
+from .....core.file_materializer import WriteOutcome, default_file_mode, write_text_if_changed
 from ...domain.repositories.i_file_system_repository import IFileSystemRepository
 
 
 class LocalFsRepository(IFileSystemRepository):
 
+    def __init__(
+        self,
+        on_file_written: Optional[Callable[[str, str], None]] = None,
+        write_behind: bool = False,
+    ):
+        self._on_file_written = on_file_written
+        self._write_behind = write_behind
+        self._file_mode = default_file_mode()
+        self._queue: "queue.Queue[List[Tuple[str, str]]]" = queue.Queue()
+        self._errors: List[str] = []
+        self._errors_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+
     def write_file(self, file_path: str, content: str) -> None:
-        try:
-            full_path = Path(file_path).resolve()
-            full_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(full_path, "w", encoding="utf-8") as f:
-                f.write(content)
-        except OSError as e:
-            raise IOError(f"Failed to write file at {file_path}: {e}") from e
+        self.write_files([(file_path, content)])
+
+    def write_files(self, files: List[Tuple[str, str]]) -> None:
+        self._raise_pending_errors()
+        if not files:
+            return
+        if not self._write_behind:
+            errors = self._write_batch(files)
+            if errors:
+                raise IOError("\n".join(errors))
+            return
+        self._ensure_worker()
+        self._queue.put(list(files))
+
+    def flush(self) -> None:
+        if self._worker is not None:
+            self._queue.join()
+        self._raise_pending_errors()
 
     def is_directory(self, path: str) -> bool:
         return Path(path).is_dir()
+
+    def get_file_size(self, file_path: str) -> Optional[int]:
+        try:
+            return os.stat(file_path).st_size
+        except OSError:
+            return None
+
+    def read_file(self, file_path: str) -> Optional[str]:
+        try:
+            return Path(file_path).read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return None
+
+    def _ensure_worker(self) -> None:
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._drain_queue, name="LocalFsWriteBehind", daemon=True
+                )
+                self._worker.start()
+
+    def _drain_queue(self) -> None:
+        while True:
+            files = self._queue.get()
+            try:
+                errors = self._write_batch(files)
+            except Exception as e:
+                errors = [f"Failed to write {len(files)} files: {e}"]
+            if errors:
+                with self._errors_lock:
+                    self._errors.extend(errors)
+            self._queue.task_done()
+
+    def _write_batch(self, files: List[Tuple[str, str]]) -> List[str]:
+        errors = []
+        for file_path, content in files:
+            try:
+                full_path = Path(file_path).resolve()
+                full_path.parent.mkdir(parents=True, exist_ok=True)
+                outcome = write_text_if_changed(full_path, content, self._file_mode)
+            except OSError as e:
+                errors.append(f"Failed to write file at {file_path}: {e}")
+                continue
+            if outcome is not WriteOutcome.UNCHANGED and self._on_file_written:
+                self._on_file_written(str(full_path), content)
+        return errors
+
+    def _raise_pending_errors(self) -> None:
+        with self._errors_lock:
+            errors, self._errors = self._errors, []
+        if errors:
+            raise IOError("\n".join(errors))
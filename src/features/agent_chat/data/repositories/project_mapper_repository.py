@@ -1,91 +1,933 @@
+import bisect
+import hashlib
 import os
-from io import StringIO
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import List, Set
+from typing import Callable, Collection, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
+from .....core.paths import get_project_cache_key
 from ...domain.repositories.i_project_mapper_repository import (
     IProjectMapperRepository,
 )
+from ..datasources.file_content_reader import (
+    FileReadResult,
+    format_size,
+    read_text_bytes,
+    read_text_file,
+)
+from ..datasources.map_index_store import MapIndexEntry, SqliteMapIndexStore
+from ..datasources.outline_extractor import extract_outline, outline_kind
+from ..datasources.project_walker import (
+    is_ignored_path,
+    walk_order_key,
+    walk_project_files,
+)
+from ..datasources.token_estimator import TokenEstimator, estimate_tokens
+
+_READ_ERROR_CONTENT = "Error: No se pudo leer el contenido del archivo."
+DEFAULT_MAX_FILE_BYTES = 256 * 1024
+RECENT_WINDOW_NS = 24 * 60 * 60 * 1_000_000_000
+_SEGMENT_OVERHEAD_TOKENS = 8
+_MENTION_PATTERN = re.compile(r"[\w./\\-]+")
+_MAX_OUTLINE_RATIO = 0.8
+_OUTLINE_NOTE = "_[Esquema: solo importaciones, declaraciones y firmas]_"
+_DUPLICATE_REFERENCE_TOKENS = 12
+
+
+@dataclass(frozen=True)
+class _LoadedFile:
+    file_path: Path
+    relative_path: str
+    content: Optional[str]
+    content_bytes: int
+    note: Optional[str]
+    size: int
+    mtime_ns: int
+    content_hash: Optional[str]
+    entry: Optional[MapIndexEntry]
+    read_seconds: float
+    from_cache: bool = False
+
+
+@dataclass
+class _BudgetSelection:
+    token_budget: int
+    tokens_by_path: Dict[str, int]
+    content_tokens_by_hash: Dict[str, int] = field(default_factory=dict)
+    included_paths: Set[str] = field(default_factory=set)
+    included_tokens: int = 0
+    omitted_tokens: int = 0
+    omitted_files: int = 0
+
+
+@dataclass
+class _DuplicateTracker:
+    first_paths: Dict[Tuple[str, Optional[str]], str] = field(default_factory=dict)
+    files: int = 0
+    bytes_saved: int = 0
+
+    def key_of(self, loaded: _LoadedFile, outline: Optional[str]) -> Optional[Tuple[str, Optional[str]]]:
+        if loaded.content is None or loaded.content_hash is None or not loaded.content.strip():
+            return None
+        kind = outline_kind(loaded.relative_path) if outline is not None else None
+        return loaded.content_hash, kind
+
+    def original_of(self, key: Optional[Tuple[str, Optional[str]]], relative_path: str) -> Optional[str]:
+        if key is None:
+            return None
+        original = self.first_paths.get(key)
+        return original if original != relative_path else None
+
+    def register(self, key: Optional[Tuple[str, Optional[str]]], relative_path: str) -> None:
+        if key is not None:
+            self.first_paths.setdefault(key, relative_path)
+
+    def count(self, saved_bytes: int) -> None:
+        self.files += 1
+        self.bytes_saved += saved_bytes
+
+
+@dataclass
+class _LiveProject:
+    candidates: List[Tuple[Path, str]] = field(default_factory=list)
+    paths: Set[str] = field(default_factory=set)
+    stale_paths: Set[str] = field(default_factory=set)
+    rescan_generation: int = 1
+    scanned_generation: int = 0
+
+    @property
+    def needs_rescan(self) -> bool:
+        return self.scanned_generation != self.rescan_generation
+
+
+@dataclass
+class ProjectMapStats:
+    files_mapped: int = 0
+    files_read: int = 0
+    cache_hits: int = 0
+    files_skipped: int = 0
+    files_truncated: int = 0
+    files_path_only: int = 0
+    files_outlined: int = 0
+    files_deduplicated: int = 0
+    bytes_deduplicated: int = 0
+    bytes_mapped: int = 0
+    workers: int = 1
+    elapsed_seconds: float = 0.0
+    read_seconds: float = 0.0
+    overlapped_read_seconds: float = 0.0
+    read_wait_seconds: float = 0.0
+
+    @property
+    def estimated_serial_seconds(self) -> float:
+        return self.elapsed_seconds - self.read_wait_seconds + self.overlapped_read_seconds
+
+    @property
+    def speedup(self) -> float:
+        if self.workers <= 1 or self.elapsed_seconds <= 0:
+            return 1.0
+        return max(self.estimated_serial_seconds / self.elapsed_seconds, 1.0)
 
 
 class ProjectMapperRepository(IProjectMapperRepository):
+    def __init__(
+        self,
+        enable_cache: bool = True,
+        max_workers: int = 1,
+        respect_ignore_rules: bool = True,
+        max_file_bytes: Optional[int] = DEFAULT_MAX_FILE_BYTES,
+        max_total_bytes: Optional[int] = None,
+        index_store: Optional[SqliteMapIndexStore] = None,
+    ):
+        self._enable_cache = enable_cache
+        self._respect_ignore_rules = respect_ignore_rules
+        self._max_file_bytes = max_file_bytes
+        self._max_total_bytes = max_total_bytes
+        self._index_store = index_store
+        self._max_workers = max(1, max_workers)
+        self._read_ahead = self._max_workers * 4
+        self._cache: Dict[str, Dict[str, MapIndexEntry]] = {}
+        self._cache_lock = threading.Lock()
+        self._live_projects: Dict[str, _LiveProject] = {}
+        self._last_map_stats = ProjectMapStats(workers=self._max_workers)
+        self._token_estimator = TokenEstimator()
+
+    @property
+    def last_map_stats(self) -> ProjectMapStats:
+        return self._last_map_stats
+
+    def warm_project(self, project_dir: str) -> None:
+        project_key = str(Path(project_dir).resolve())
+        with self._cache_lock:
+            self._live_projects.setdefault(project_key, _LiveProject())
+        for _ in self.iter_project_map(project_dir, [], [], outline_mode=True):
+            pass
+
+    def release_project(self, project_dir: str) -> None:
+        with self._cache_lock:
+            self._live_projects.pop(str(Path(project_dir).resolve()), None)
+
+    def apply_file_changes(
+        self,
+        project_dir: str,
+        relative_paths: Collection[str],
+        structure_changed: bool = False,
+    ) -> bool:
+        project_path = Path(project_dir).resolve()
+        with self._cache_lock:
+            live = self._live_projects.get(str(project_path))
+            if live is None:
+                return False
+            if structure_changed:
+                live.rescan_generation += 1
+            for relative_path in relative_paths:
+                self._apply_file_change(live, project_path, relative_path)
+            return live.needs_rescan
+
+    def update_file_content(self, project_dir: str, file_path: str, content: str) -> None:
+        project_path = Path(project_dir).resolve()
+        path = Path(file_path).resolve()
+        try:
+            relative_path = str(path.relative_to(project_path))
+            stat_result = path.stat()
+        except (ValueError, OSError):
+            return
+
+        project_key = str(project_path)
+        if self._enable_cache:
+            result = read_text_bytes(
+                path.name, content.encode("utf-8"), self._max_file_bytes
+            )
+            entry = self._build_entry(result, stat_result.st_size, stat_result.st_mtime_ns)
+            with self._cache_lock:
+                entries = self._cache.get(project_key)
+                if entries is not None:
+                    self._cache[project_key] = {**entries, relative_path: entry}
+        self.apply_file_changes(project_dir, [relative_path])
+
+    def _apply_file_change(
+        self, live: _LiveProject, project_path: Path, relative_path: str
+    ) -> None:
+        file_path = project_path / relative_path
+        is_mappable = file_path.is_file() and not (
+            self._respect_ignore_rules and is_ignored_path(project_path, relative_path)
+        )
+        if is_mappable and relative_path not in live.paths:
+            bisect.insort(
+                live.candidates,
+                (file_path, relative_path),
+                key=lambda candidate: walk_order_key(candidate[1]),
+            )
+            live.paths.add(relative_path)
+        elif not is_mappable and relative_path in live.paths:
+            index = bisect.bisect_left(
+                live.candidates,
+                walk_order_key(relative_path),
+                key=lambda candidate: walk_order_key(candidate[1]),
+            )
+            del live.candidates[index]
+            live.paths.discard(relative_path)
+        live.stale_paths.add(relative_path)
+
     def map_project_to_string(
         self,
         project_dir: str,
         extensions_to_include: List[str],
         extensions_to_exclude: List[str],
+        token_budget: Optional[int] = None,
+        priority_text: Optional[str] = None,
+        focus_paths: Optional[Collection[str]] = None,
+        outline_mode: bool = False,
+        full_content_paths: Optional[Collection[str]] = None,
     ) -> str:
+        return "".join(
+            self.iter_project_map(
+                project_dir,
+                extensions_to_include,
+                extensions_to_exclude,
+                token_budget=token_budget,
+                priority_text=priority_text,
+                focus_paths=focus_paths,
+                outline_mode=outline_mode,
+                full_content_paths=full_content_paths,
+            )
+        )
+
+    def iter_project_map(
+        self,
+        project_dir: str,
+        extensions_to_include: List[str],
+        extensions_to_exclude: List[str],
+        on_file_mapped: Optional[Callable[[str], None]] = None,
+        token_budget: Optional[int] = None,
+        priority_text: Optional[str] = None,
+        focus_paths: Optional[Collection[str]] = None,
+        outline_mode: bool = False,
+        full_content_paths: Optional[Collection[str]] = None,
+    ) -> Iterator[str]:
         project_path = Path(project_dir)
         if not project_path.is_dir():
             raise FileNotFoundError(f"Project directory not found: {project_dir}")
 
-        output_buffer = StringIO()
-        self._write_header(
-            output_buffer,
+        include_set = self._prepare_extension_set(extensions_to_include)
+        exclude_patterns = self._prepare_exclude_patterns(extensions_to_exclude)
+
+        project_key = str(project_path.resolve())
+        previous_entries = self._load_previous_entries(project_key)
+        current_entries: Dict[str, MapIndexEntry] = {}
+        stats = ProjectMapStats(workers=self._max_workers)
+        started_at = time.perf_counter()
+
+        total_budget_exhausted = threading.Event()
+
+        live, live_candidates, stale_paths, generation = self._begin_live_map(project_key)
+        walked_files: Optional[List[Tuple[Path, str]]] = None
+        walked_paths: Set[str] = set()
+        source: Iterable[Tuple[Path, str]]
+        if live_candidates is not None:
+            source = live_candidates
+        else:
+            source = walk_project_files(project_path, self._respect_ignore_rules)
+            if live is not None:
+                walked_files = []
+        source = self._record_walk(source, walked_paths, walked_files)
+        candidates = self._filter_candidates(source, include_set, exclude_patterns)
+        loaded_files: Iterable[_LoadedFile] = self._iter_loaded_files(
+            candidates,
+            previous_entries,
+            total_budget_exhausted,
+            stats,
+            stale_paths if live_candidates is not None else None,
+        )
+        if self._enable_cache or token_budget is not None:
+            loaded_files = self._share_duplicate_content(loaded_files)
+
+        focus_set = self._prepare_focus_set(focus_paths)
+        full_content_set = self._prepare_focus_set(full_content_paths) or set()
+        outlines_by_key: Dict[Tuple[str, str], str] = {}
+
+        def outline_of(loaded: _LoadedFile) -> Optional[str]:
+            if not outline_mode or self._normalize_path(loaded.relative_path) in full_content_set:
+                return None
+            return self._outline_for(loaded, outlines_by_key)
+
+        def is_rendered(loaded: _LoadedFile) -> bool:
+            return self._is_in_focus(loaded.relative_path, focus_set) and (
+                selection is None or loaded.relative_path in selection.included_paths
+            )
+
+        selection: Optional[_BudgetSelection] = None
+        planned_duplicates: Optional[_DuplicateTracker] = None
+        if token_budget is not None:
+            loaded_files = list(loaded_files)
+            selection = self._select_within_budget(
+                [f for f in loaded_files if self._is_in_focus(f.relative_path, focus_set)],
+                token_budget,
+                priority_text,
+                outline_of,
+            )
+            planned_duplicates = self._plan_duplicates(
+                [f for f in loaded_files if is_rendered(f)], outline_of
+            )
+
+        yield self._build_header(
             project_path.name,
             project_dir,
             extensions_to_include,
             extensions_to_exclude,
+            selection,
+            planned_duplicates,
         )
 
-        include_set = self._prepare_extension_set(extensions_to_include)
-        exclude_set = self._prepare_extension_set(extensions_to_exclude)
+        duplicates = _DuplicateTracker()
+        loaded_paths: Set[str] = set()
 
-        for root, _, files in os.walk(project_dir):
-            current_dir_path = Path(root)
-            for filename in files:
-                file_path = current_dir_path / filename
-                if self._should_include_file(file_path, include_set, exclude_set):
-                    self._append_file_content(output_buffer, file_path, project_path)
+        for loaded in loaded_files:
+            loaded_paths.add(loaded.relative_path)
+            if loaded.entry is not None:
+                current_entries[loaded.relative_path] = self._with_derived_data(
+                    loaded.entry, loaded.relative_path, selection, outlines_by_key
+                )
+            stats.files_mapped += 1
 
-        return output_buffer.getvalue()
+            if not self._is_in_focus(loaded.relative_path, focus_set):
+                stats.files_path_only += 1
+                yield f"## `{loaded.relative_path}`\n\n"
+                yield "_[Solo ruta: no relevante para la consulta actual]_\n\n"
+            elif selection is not None and loaded.relative_path not in selection.included_paths:
+                stats.files_path_only += 1
+                yield f"## `{loaded.relative_path}`\n\n"
+                yield (
+                    f"_[Solo ruta: ~{selection.tokens_by_path[loaded.relative_path]} "
+                    "tokens fuera del presupuesto]_\n\n"
+                )
+            else:
+                yield from self._render_file(
+                    loaded, total_budget_exhausted, stats, outline_of(loaded), duplicates
+                )
+
+            if on_file_mapped:
+                on_file_mapped(loaded.relative_path)
+
+        stats.files_deduplicated = duplicates.files
+        stats.bytes_deduplicated = duplicates.bytes_saved
+        if planned_duplicates is None and duplicates.files:
+            yield "---\n\n" + self._build_duplicates_line(duplicates)
+
+        stats.elapsed_seconds = time.perf_counter() - started_at
+        self._last_map_stats = stats
+        if live is not None:
+            self._finish_live_map(
+                live, project_path.resolve(), walked_files, stale_paths, generation
+            )
+
+        if self._enable_cache:
+            removed_paths = self._merge_cached_entries(
+                project_key, walked_paths, loaded_paths, current_entries
+            )
+            if self._index_store is not None:
+                self._index_store.save_entries(
+                    get_project_cache_key(project_key),
+                    current_entries,
+                    previous_entries,
+                    removed_paths,
+                )
+
+    def _load_previous_entries(self, project_key: str) -> Dict[str, MapIndexEntry]:
+        if not self._enable_cache:
+            return {}
+        with self._cache_lock:
+            entries = self._cache.get(project_key)
+        if entries is not None or self._index_store is None:
+            return entries or {}
+        entries = self._index_store.load_entries(get_project_cache_key(project_key))
+        with self._cache_lock:
+            return self._cache.setdefault(project_key, entries)
+
+    def _merge_cached_entries(
+        self,
+        project_key: str,
+        walked_paths: Set[str],
+        loaded_paths: Set[str],
+        current_entries: Dict[str, MapIndexEntry],
+    ) -> Set[str]:
+        with self._cache_lock:
+            cached = self._cache.get(project_key, {})
+            merged = {
+                relative_path: entry
+                for relative_path, entry in cached.items()
+                if relative_path in walked_paths and relative_path not in loaded_paths
+            }
+            merged.update(current_entries)
+            self._cache[project_key] = merged
+        return {relative_path for relative_path in cached if relative_path not in merged}
 
-    def _write_header(
+    def _with_derived_data(
+        self,
+        entry: MapIndexEntry,
+        relative_path: str,
+        selection: Optional[_BudgetSelection],
+        outlines_by_key: Dict[Tuple[str, str], str],
+    ) -> MapIndexEntry:
+        token_count = entry.token_count
+        if token_count is None and selection is not None:
+            token_count = selection.content_tokens_by_hash.get(entry.content_hash)
+        outline = entry.outline
+        if outline is None:
+            outline = outlines_by_key.get((entry.content_hash, outline_kind(relative_path)))
+        if token_count == entry.token_count and outline == entry.outline:
+            return entry
+        return replace(entry, token_count=token_count, outline=outline)
+
+    def _share_duplicate_content(
+        self, loaded_files: Iterable[_LoadedFile]
+    ) -> Iterator[_LoadedFile]:
+        content_by_hash: Dict[str, str] = {}
+        for loaded in loaded_files:
+            if loaded.content is not None and loaded.content_hash is not None:
+                shared = content_by_hash.setdefault(loaded.content_hash, loaded.content)
+                if shared is not loaded.content:
+                    entry = loaded.entry
+                    if entry is not None and entry.content is not shared:
+                        entry = replace(entry, content=shared)
+                    loaded = replace(loaded, content=shared, entry=entry)
+            yield loaded
+
+    def _plan_duplicates(
+        self,
+        loaded_files: List[_LoadedFile],
+        outline_of: Callable[[_LoadedFile], Optional[str]],
+    ) -> _DuplicateTracker:
+        planned = _DuplicateTracker()
+        for loaded in loaded_files:
+            outline = outline_of(loaded)
+            key = planned.key_of(loaded, outline)
+            if planned.original_of(key, loaded.relative_path) is not None:
+                planned.count(
+                    len(outline.encode("utf-8")) if outline is not None else loaded.content_bytes
+                )
+            else:
+                planned.register(key, loaded.relative_path)
+        return planned
+
+    def _outline_for(
+        self, loaded: _LoadedFile, outlines_by_key: Dict[Tuple[str, str], str]
+    ) -> Optional[str]:
+        if loaded.content is None or loaded.content_hash is None:
+            return None
+        outline_key = (loaded.content_hash, outline_kind(loaded.relative_path))
+        outline = loaded.entry.outline if loaded.entry is not None else None
+        if outline is None:
+            outline = outlines_by_key.get(outline_key)
+        if outline is None:
+            outline = extract_outline(loaded.relative_path, loaded.content) or ""
+            if len(outline) > len(loaded.content) * _MAX_OUTLINE_RATIO:
+                outline = ""
+            outlines_by_key[outline_key] = outline
+        return outline or None
+
+    def _render_file(
+        self,
+        loaded: _LoadedFile,
+        total_budget_exhausted: threading.Event,
+        stats: ProjectMapStats,
+        outline: Optional[str] = None,
+        duplicates: Optional[_DuplicateTracker] = None,
+    ) -> Iterator[str]:
+        content, note, content_bytes = loaded.content, loaded.note, loaded.content_bytes
+        if outline is not None:
+            content, note = outline, _OUTLINE_NOTE
+            content_bytes = len(outline.encode("utf-8"))
+
+        duplicate_key = duplicates.key_of(loaded, outline) if duplicates else None
+        original_path = duplicates.original_of(duplicate_key, loaded.relative_path) if duplicates else None
+        if original_path is not None:
+            duplicates.count(content_bytes)
+            yield f"## `{loaded.relative_path}`\n\n"
+            yield f"_[Mismo contenido que `{original_path}`]_\n\n"
+            return
+
+        if content is not None and self._exceeds_total_budget(
+            stats.bytes_mapped + content_bytes
+        ):
+            total_budget_exhausted.set()
+            content = None
+            note = self._build_note(loaded.size, "límite total del mapa alcanzado")
+
+        yield f"## `{loaded.relative_path}`\n\n"
+        if content is None:
+            stats.files_skipped += 1
+            yield f"{note}\n\n"
+            return
+
+        stats.bytes_mapped += content_bytes
+        if outline is not None:
+            stats.files_outlined += 1
+        if duplicates is not None:
+            duplicates.register(duplicate_key, loaded.relative_path)
+        yield f"```{loaded.file_path.suffix.lstrip('.')}\n"
+        yield content
+        yield "\n```\n\n"
+        if note:
+            if outline is None:
+                stats.files_truncated += 1
+            yield f"{note}\n\n"
+
+    def _select_within_budget(
+        self,
+        loaded_files: List[_LoadedFile],
+        token_budget: int,
+        priority_text: Optional[str],
+        outline_of: Callable[[_LoadedFile], Optional[str]],
+    ) -> "_BudgetSelection":
+        mentioned_names = self._extract_mentioned_names(priority_text or "")
+        newest_mtime_ns = max((f.mtime_ns for f in loaded_files), default=0)
+        recent_threshold_ns = newest_mtime_ns - RECENT_WINDOW_NS
+
+        selection = _BudgetSelection(token_budget=token_budget, tokens_by_path={})
+        key_tracker = _DuplicateTracker()
+        duplicate_keys: Dict[str, Optional[Tuple[str, Optional[str]]]] = {}
+        ranked = []
+        for loaded in loaded_files:
+            outline = outline_of(loaded)
+            tokens = self._estimate_file_tokens(
+                loaded, selection.content_tokens_by_hash, outline
+            )
+            selection.tokens_by_path[loaded.relative_path] = tokens
+            duplicate_keys[loaded.relative_path] = key_tracker.key_of(loaded, outline)
+            if self._is_mentioned(loaded.relative_path, mentioned_names):
+                tier = 0
+            elif loaded.mtime_ns >= recent_threshold_ns:
+                tier = 1
+            else:
+                tier = 2
+            ranked.append((tier, tokens, loaded.relative_path))
+        ranked.sort()
+
+        included_keys: Set[Tuple[str, Optional[str]]] = set()
+        for _, tokens, relative_path in ranked:
+            duplicate_key = duplicate_keys[relative_path]
+            if duplicate_key is not None and duplicate_key in included_keys:
+                tokens = (
+                    estimate_tokens(relative_path)
+                    + _SEGMENT_OVERHEAD_TOKENS
+                    + _DUPLICATE_REFERENCE_TOKENS
+                )
+            if selection.included_tokens + tokens <= token_budget:
+                selection.included_paths.add(relative_path)
+                selection.included_tokens += tokens
+                if duplicate_key is not None:
+                    included_keys.add(duplicate_key)
+            else:
+                selection.omitted_tokens += tokens
+                selection.omitted_files += 1
+        return selection
+
+    def _estimate_file_tokens(
+        self,
+        loaded: _LoadedFile,
+        content_tokens_by_hash: Dict[str, int],
+        outline: Optional[str] = None,
+    ) -> int:
+        overhead = estimate_tokens(loaded.relative_path) + _SEGMENT_OVERHEAD_TOKENS
+        if loaded.content is None:
+            return overhead
+        if outline is not None:
+            return overhead + self._token_estimator.estimate(
+                outline, f"outline:{outline_kind(loaded.relative_path)}:{loaded.content_hash}"
+            )
+        if loaded.entry is not None and loaded.entry.token_count is not None:
+            return overhead + loaded.entry.token_count
+        content_hash = loaded.content_hash or self._hash_content(loaded.content)
+        content_tokens = self._token_estimator.estimate(loaded.content, content_hash)
+        content_tokens_by_hash[content_hash] = content_tokens
+        return overhead + content_tokens
+
+    def _extract_mentioned_names(self, text: str) -> Set[str]:
+        names: Set[str] = set()
+        for token in _MENTION_PATTERN.findall(text.lower()):
+            token = token.replace("\\", "/").rstrip(".").removeprefix("./")
+            if not token:
+                continue
+            names.add(token)
+            names.add(token.rsplit("/", 1)[-1])
+        return names
+
+    def _prepare_focus_set(
+        self, focus_paths: Optional[Collection[str]]
+    ) -> Optional[Set[str]]:
+        if focus_paths is None:
+            return None
+        return {self._normalize_path(path) for path in focus_paths}
+
+    def _is_in_focus(self, relative_path: str, focus_set: Optional[Set[str]]) -> bool:
+        return focus_set is None or self._normalize_path(relative_path) in focus_set
+
+    def _normalize_path(self, path: str) -> str:
+        return path.strip().replace("\\", "/").removeprefix("./")
+
+    def _is_mentioned(self, relative_path: str, mentioned_names: Set[str]) -> bool:
+        if not mentioned_names:
+            return False
+        posix_path = relative_path.replace("\\", "/").lower()
+        if posix_path in mentioned_names:
+            return True
+        file_name = posix_path.rsplit("/", 1)[-1]
+        return "." in file_name and file_name in mentioned_names
+
+    def _begin_live_map(
+        self, project_key: str
+    ) -> Tuple[Optional[_LiveProject], Optional[List[Tuple[Path, str]]], Set[str], int]:
+        with self._cache_lock:
+            live = self._live_projects.get(project_key)
+            if live is None:
+                return None, None, set(), 0
+            stale_paths = set(live.stale_paths)
+            if live.needs_rescan:
+                return live, None, stale_paths, live.rescan_generation
+            return live, list(live.candidates), stale_paths, live.scanned_generation
+
+    def _finish_live_map(
+        self,
+        live: _LiveProject,
+        project_path: Path,
+        walked_files: Optional[List[Tuple[Path, str]]],
+        stale_paths: Set[str],
+        generation: int,
+    ) -> None:
+        with self._cache_lock:
+            live.stale_paths -= stale_paths
+            if walked_files is None:
+                return
+            live.candidates = walked_files
+            live.paths = {relative_path for _, relative_path in walked_files}
+            live.scanned_generation = generation
+            for relative_path in list(live.stale_paths):
+                self._apply_file_change(live, project_path, relative_path)
+
+    def _record_walk(
+        self,
+        walked: Iterable[Tuple[Path, str]],
+        walked_paths: Set[str],
+        walked_files: Optional[List[Tuple[Path, str]]] = None,
+    ) -> Iterator[Tuple[Path, str]]:
+        for candidate in walked:
+            walked_paths.add(candidate[1])
+            if walked_files is not None:
+                walked_files.append(candidate)
+            yield candidate
+
+    def _filter_candidates(
+        self,
+        candidates: Iterable[Tuple[Path, str]],
+        include_set: Set[str],
+        exclude_patterns: Set[str],
+    ) -> Iterator[Tuple[Path, str]]:
+        for file_path, relative_path in candidates:
+            if self._should_include_file(file_path, include_set, exclude_patterns):
+                yield file_path, relative_path
+
+    def _iter_loaded_files(
+        self,
+        candidates: Iterator[Tuple[Path, str]],
+        previous_entries: Dict[str, MapIndexEntry],
+        total_budget_exhausted: threading.Event,
+        stats: ProjectMapStats,
+        stale_paths: Optional[Set[str]] = None,
+    ) -> Iterator[_LoadedFile]:
+        if self._max_workers == 1:
+            for file_path, relative_path in candidates:
+                loaded = self._load_trusted_file(
+                    file_path, relative_path, previous_entries, stale_paths
+                ) or self._load_file(
+                    file_path, relative_path, previous_entries, total_budget_exhausted
+                )
+                self._record_load(loaded, stats)
+                yield loaded
+            return
+
+        pending: Deque[Future] = deque()
+        executor = ThreadPoolExecutor(
+            max_workers=self._max_workers, thread_name_prefix="project-mapper"
+        )
+        try:
+            for file_path, relative_path in candidates:
+                trusted = self._load_trusted_file(
+                    file_path, relative_path, previous_entries, stale_paths
+                )
+                if trusted is not None:
+                    future: Future = Future()
+                    future.set_result(trusted)
+                else:
+                    future = executor.submit(
+                        self._load_file,
+                        file_path,
+                        relative_path,
+                        previous_entries,
+                        total_budget_exhausted,
+                    )
+                pending.append(future)
+                if len(pending) >= self._read_ahead:
+                    yield self._resolve_pending(pending.popleft(), stats)
+            while pending:
+                yield self._resolve_pending(pending.popleft(), stats)
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def _resolve_pending(self, future: Future, stats: ProjectMapStats) -> _LoadedFile:
+        wait_started_at = time.perf_counter()
+        loaded = future.result()
+        stats.read_wait_seconds += time.perf_counter() - wait_started_at
+        stats.overlapped_read_seconds += loaded.read_seconds
+        self._record_load(loaded, stats)
+        return loaded
+
+    def _record_load(self, loaded: _LoadedFile, stats: ProjectMapStats) -> None:
+        stats.read_seconds += loaded.read_seconds
+        if loaded.from_cache:
+            stats.cache_hits += 1
+        else:
+            stats.files_read += 1
+
+    def _build_header(
         self,
-        buffer: StringIO,
         project_name: str,
         project_dir: str,
         include_list: List[str],
         exclude_list: List[str],
-    ) -> None:
-        buffer.write(f"# Mapeo del Proyecto: {project_name}\n\n")
-        buffer.write(f"Directorio base: `{project_dir}`\n")
+        selection: Optional["_BudgetSelection"] = None,
+        duplicates: Optional[_DuplicateTracker] = None,
+    ) -> str:
         include_str = ", ".join(include_list) if include_list else "Todas"
         exclude_str = ", ".join(exclude_list) if exclude_list else "Ninguna"
-        buffer.write(f"Extensiones incluidas: `{include_str}`\n")
-        buffer.write(f"Extensiones excluidas: `{exclude_str}`\n\n")
-        buffer.write("---\n\n")
+        header = (
+            f"# Mapeo del Proyecto: {project_name}\n\n"
+            f"Directorio base: `{project_dir}`\n"
+            f"Extensiones incluidas: `{include_str}`\n"
+            f"Extensiones excluidas: `{exclude_str}`\n"
+        )
+        if selection is not None:
+            header += (
+                f"Presupuesto de tokens: `{selection.token_budget}` "
+                f"(incluidos: `~{selection.included_tokens}`, "
+                f"omitidos: `~{selection.omitted_tokens}` "
+                f"en {selection.omitted_files} archivos solo con ruta)\n"
+            )
+        if duplicates is not None and duplicates.files:
+            header += self._build_duplicates_line(duplicates)
+        return header + "\n---\n\n"
+
+    def _build_duplicates_line(self, duplicates: _DuplicateTracker) -> str:
+        return (
+            f"Archivos duplicados: `{duplicates.files}` "
+            f"(referenciados al primer archivo con el mismo contenido, "
+            f"{format_size(duplicates.bytes_saved)} omitidos)\n"
+        )
+
+    def _build_note(self, size: int, reason: str) -> str:
+        return f"_[Contenido omitido ({reason}): {format_size(size)}]_"
+
+    def _exceeds_total_budget(self, total_bytes: int) -> bool:
+        return self._max_total_bytes is not None and total_bytes > self._max_total_bytes
 
     def _prepare_extension_set(self, extensions: List[str]) -> Set[str]:
         return {ext.lower() for ext in extensions if ext.startswith(".")}
 
+    def _prepare_exclude_patterns(self, patterns: List[str]) -> Set[str]:
+        return {pattern.lower() for pattern in patterns if pattern}
+
     def _should_include_file(
-        self, file_path: Path, include_set: Set[str], exclude_set: Set[str]
+        self, file_path: Path, include_set: Set[str], exclude_patterns: Set[str]
     ) -> bool:
-        file_ext_lower = file_path.suffix.lower()
+        file_name_lower = file_path.name.lower()
 
-        if file_ext_lower in exclude_set:
+        if any(file_name_lower.endswith(pattern) for pattern in exclude_patterns):
             return False
 
         if not include_set:
             return True
 
-        return file_ext_lower in include_set
+        return file_path.suffix.lower() in include_set
 
-    def _append_file_content(
-        self, buffer: StringIO, file_path: Path, project_path: Path
-    ) -> None:
-        relative_path = file_path.relative_to(project_path)
-        lang_hint = file_path.suffix.lstrip(".")
+    def _load_trusted_file(
+        self,
+        file_path: Path,
+        relative_path: str,
+        previous_entries: Dict[str, MapIndexEntry],
+        stale_paths: Optional[Set[str]],
+    ) -> Optional[_LoadedFile]:
+        if stale_paths is None or relative_path in stale_paths:
+            return None
+        cached = previous_entries.get(relative_path)
+        if cached is None:
+            return None
+        return self._loaded_from_entry(file_path, relative_path, cached, 0.0)
+
+    def _loaded_from_entry(
+        self,
+        file_path: Path,
+        relative_path: str,
+        entry: MapIndexEntry,
+        read_seconds: float,
+    ) -> _LoadedFile:
+        return _LoadedFile(
+            file_path=file_path,
+            relative_path=relative_path,
+            content=entry.content,
+            content_bytes=entry.content_bytes,
+            note=entry.note,
+            size=entry.size,
+            mtime_ns=entry.mtime_ns,
+            content_hash=entry.content_hash,
+            entry=entry,
+            read_seconds=read_seconds,
+            from_cache=True,
+        )
 
-        buffer.write(f"## `{relative_path}`\n\n")
-        buffer.write(f"```{lang_hint}\n")
+    def _build_entry(
+        self, result: FileReadResult, size: int, mtime_ns: int
+    ) -> MapIndexEntry:
+        content_bytes = min(size, self._max_file_bytes or size)
+        note: Optional[str] = None
+        if result.skip_reason:
+            note = self._build_note(size, result.skip_reason)
+            content_bytes = 0
+        elif result.truncated:
+            note = (
+                f"_[Contenido truncado: primeros {format_size(content_bytes)} "
+                f"de {format_size(size)}]_"
+            )
+        return MapIndexEntry(
+            mtime_ns=mtime_ns,
+            size=size,
+            content_hash=self._hash_content(result.content or ""),
+            content=result.content,
+            content_bytes=content_bytes,
+            note=note,
+        )
+
+    def _load_file(
+        self,
+        file_path: Path,
+        relative_path: str,
+        previous_entries: Dict[str, MapIndexEntry],
+        total_budget_exhausted: threading.Event,
+    ) -> _LoadedFile:
+        started_at = time.perf_counter()
+        size = 0
+        mtime_ns = 0
+        content: Optional[str] = _READ_ERROR_CONTENT
+        note: Optional[str] = None
 
         try:
-            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                content = f.read()
+            stat_result = file_path.stat()
+            size = stat_result.st_size
+            mtime_ns = stat_result.st_mtime_ns
+            cached = previous_entries.get(relative_path)
+            if cached is not None and cached.mtime_ns == mtime_ns and cached.size == size:
+                return self._loaded_from_entry(
+                    file_path, relative_path, cached, time.perf_counter() - started_at
+                )
+            if total_budget_exhausted.is_set():
+                content = None
+                note = self._build_note(size, "límite total del mapa alcanzado")
+            else:
+                entry = self._build_entry(
+                    read_text_file(file_path, size, self._max_file_bytes), size, mtime_ns
+                )
+                loaded = self._loaded_from_entry(
+                    file_path, relative_path, entry, time.perf_counter() - started_at
+                )
+                return replace(
+                    loaded,
+                    entry=entry if self._enable_cache else None,
+                    from_cache=False,
+                )
         except Exception:
-            content = "Error: No se pudo leer el contenido del archivo."
+            content = _READ_ERROR_CONTENT
+            note = None
+
+        return _LoadedFile(
+            file_path=file_path,
+            relative_path=relative_path,
+            content=content,
+            content_bytes=0,
+            note=note,
+            size=size,
+            mtime_ns=mtime_ns,
+            content_hash=None,
+            entry=None,
+            read_seconds=time.perf_counter() - started_at,
+        )
 
-        buffer.write(content)
-        buffer.write("\n```\n\n")
+    def _hash_content(self, content: str) -> str:
+        return hashlib.blake2b(
+            content.encode("utf-8", errors="surrogatepass"), digest_size=16
+        ).hexdigest()
@@ -0,0 +1,150 @@
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Deque, List, Optional, Set
+
+from ...domain.repositories.i_project_mapper_repository import (
+    IProjectMapperRepository,
+)
+from ...domain.repositories.i_project_watcher_repository import (
+    IProjectWatcherRepository,
+)
+from ...domain.repositories.i_relevance_index_repository import (
+    IRelevanceIndexRepository,
+)
+from ..datasources.file_system_watcher import (
+    DEFAULT_DEBOUNCE_SECONDS,
+    DEFAULT_POLL_INTERVAL_SECONDS,
+    FileSystemWatcher,
+    create_file_system_watcher,
+)
+
+_WARM_WAIT_SECONDS = 0.5
+_MAX_PENDING_ERRORS = 20
+
+
+@dataclass
+class _WatchSession:
+    project_dir: str
+    stop_event: threading.Event = field(default_factory=threading.Event)
+    warm_requested: threading.Event = field(default_factory=threading.Event)
+    watcher: Optional[FileSystemWatcher] = None
+
+
+class ProjectWatcherRepository(IProjectWatcherRepository):
+    def __init__(
+        self,
+        project_mapper_repository: IProjectMapperRepository,
+        debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS,
+        poll_interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS,
+        relevance_index_repository: Optional[IRelevanceIndexRepository] = None,
+    ):
+        self._mapper_repo = project_mapper_repository
+        self._relevance_repo = relevance_index_repository
+        self._debounce_seconds = debounce_seconds
+        self._poll_interval_seconds = poll_interval_seconds
+        self._session: Optional[_WatchSession] = None
+        self._lock = threading.Lock()
+        self._errors: Deque[str] = deque(maxlen=_MAX_PENDING_ERRORS)
+        self._errors_lock = threading.Lock()
+
+    def watch(self, project_dir: str) -> None:
+        resolved_dir = str(Path(project_dir).resolve())
+        with self._lock:
+            if self._session is not None and self._session.project_dir == resolved_dir:
+                return
+            self._stop_session()
+            session = _WatchSession(project_dir=resolved_dir)
+            self._session = session
+        threading.Thread(
+            target=self._run_session,
+            args=(session,),
+            name="project-map-watcher",
+            daemon=True,
+        ).start()
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stop_session()
+
+    def notify_file_written(self, file_path: str, content: str) -> None:
+        session = self._session
+        if session is None or session.stop_event.is_set():
+            return
+        self._mapper_repo.update_file_content(session.project_dir, file_path, content)
+        if self._relevance_repo is not None:
+            try:
+                relative_path = str(Path(file_path).resolve().relative_to(session.project_dir))
+            except ValueError:
+                return
+            self._relevance_repo.apply_file_changes(session.project_dir, [relative_path])
+
+    def take_errors(self) -> List[str]:
+        with self._errors_lock:
+            errors = list(self._errors)
+            self._errors.clear()
+        return errors
+
+    def _run_session(self, session: _WatchSession) -> None:
+        try:
+            watcher = create_file_system_watcher(
+                Path(session.project_dir),
+                lambda paths, structure_changed: self._on_changes(
+                    session, paths, structure_changed
+                ),
+                debounce_seconds=self._debounce_seconds,
+                poll_interval_seconds=self._poll_interval_seconds,
+            )
+        except OSError:
+            watcher = None
+
+        with self._lock:
+            if session.stop_event.is_set():
+                if watcher is not None:
+                    watcher.stop()
+                return
+            session.watcher = watcher
+            if watcher is not None:
+                watcher.start()
+                if self._relevance_repo is not None:
+                    self._relevance_repo.watch_project(session.project_dir)
+
+        session.warm_requested.set()
+        while not session.stop_event.is_set():
+            if not session.warm_requested.wait(_WARM_WAIT_SECONDS):
+                continue
+            session.warm_requested.clear()
+            try:
+                self._mapper_repo.warm_project(session.project_dir)
+            except Exception as e:
+                with self._errors_lock:
+                    self._errors.append(
+                        f"Failed to warm project map for {session.project_dir}: {e}"
+                    )
+
+    def _on_changes(
+        self, session: _WatchSession, relative_paths: Set[str], structure_changed: bool
+    ) -> None:
+        if session.stop_event.is_set():
+            return
+        if self._relevance_repo is not None:
+            self._relevance_repo.apply_file_changes(
+                session.project_dir, relative_paths, structure_changed
+            )
+        if self._mapper_repo.apply_file_changes(
+            session.project_dir, relative_paths, structure_changed
+        ):
+            session.warm_requested.set()
+
+    def _stop_session(self) -> None:
+        session = self._session
+        if session is None:
+            return
+        self._session = None
+        session.stop_event.set()
+        if session.watcher is not None:
+            session.watcher.stop()
+        self._mapper_repo.release_project(session.project_dir)
+        if self._relevance_repo is not None:
+            self._relevance_repo.release_project(session.project_dir)
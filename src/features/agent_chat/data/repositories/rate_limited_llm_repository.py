@@ -0,0 +1,187 @@
+import asyncio
+import threading
+import time
+from typing import AsyncIterator, Dict, Iterator, Optional
+
+from .....core.rate_limiter import RateLimiter
+from ...domain.models.agent_models import ModelProvider
+from ...domain.repositories.i_llm_repository import ILLMRepository
+
+_CHARS_PER_TOKEN = 4
+_MAX_RATE_LIMIT_RETRIES = 5
+_RATE_LIMIT_STATUS = 429
+_RATE_LIMIT_ERROR_NAMES = {"RateLimitError", "ResourceExhausted", "TooManyRequests"}
+_RATE_LIMIT_MARKERS = ("resource_exhausted", "rate limit", "too many requests")
+_TRANSIENT_ERROR_NAMES = {
+    "APIConnectionError",
+    "APITimeoutError",
+    "InternalServerError",
+    "ServiceUnavailable",
+    "DeadlineExceeded",
+    "RemoteProtocolError",
+    "ReadError",
+    "ConnectError",
+}
+_TRANSIENT_BACKOFF_SECONDS = 1.0
+_MAX_TRANSIENT_BACKOFF_SECONDS = 30.0
+
+_provider_limiters: Dict[ModelProvider, RateLimiter] = {}
+_provider_limiters_lock = threading.Lock()
+
+
+def provider_rate_limiter(provider: ModelProvider) -> RateLimiter:
+    with _provider_limiters_lock:
+        limiter = _provider_limiters.get(provider)
+        if limiter is None:
+            limiter = RateLimiter(
+                requests_per_minute=provider.requests_per_minute,
+                tokens_per_minute=provider.tokens_per_minute,
+                max_concurrent=provider.max_concurrent_requests,
+            )
+            _provider_limiters[provider] = limiter
+        return limiter
+
+
+class RateLimitedLLMRepository(ILLMRepository):
+    def __init__(
+        self,
+        repository: ILLMRepository,
+        limiter: RateLimiter,
+        max_rate_limit_retries: int = _MAX_RATE_LIMIT_RETRIES,
+    ):
+        self._repository = repository
+        self._limiter = limiter
+        self._max_rate_limit_retries = max_rate_limit_retries
+
+    @property
+    def limiter(self) -> RateLimiter:
+        return self._limiter
+
+    def execute_prompt(
+        self, prompt_template: str, context: Dict[str, str], use_cache: bool = True
+    ) -> str:
+        prompt_tokens = self._prompt_tokens(prompt_template, context)
+        attempt = 0
+        while True:
+            self._limiter.acquire(prompt_tokens)
+            response = ""
+            try:
+                response = self._repository.execute_prompt(prompt_template, context, use_cache)
+                return response
+            except Exception as e:
+                if not self._should_retry(e, attempt):
+                    raise
+                delay = self._backoff_seconds(e, attempt)
+            finally:
+                self._limiter.release(len(response) // _CHARS_PER_TOKEN)
+            time.sleep(delay)
+            attempt += 1
+
+    def stream_prompt(
+        self, prompt_template: str, context: Dict[str, str], use_cache: bool = True
+    ) -> Iterator[str]:
+        prompt_tokens = self._prompt_tokens(prompt_template, context)
+        attempt = 0
+        while True:
+            self._limiter.acquire(prompt_tokens)
+            output_chars = 0
+            try:
+                for chunk in self._repository.stream_prompt(prompt_template, context, use_cache):
+                    output_chars += len(chunk)
+                    yield chunk
+                return
+            except Exception as e:
+                if output_chars or not self._should_retry(e, attempt):
+                    raise
+                delay = self._backoff_seconds(e, attempt)
+            finally:
+                self._limiter.release(output_chars // _CHARS_PER_TOKEN)
+            time.sleep(delay)
+            attempt += 1
+
+    async def aexecute_prompt(
+        self, prompt_template: str, context: Dict[str, str], use_cache: bool = True
+    ) -> str:
+        prompt_tokens = self._prompt_tokens(prompt_template, context)
+        attempt = 0
+        while True:
+            await self._limiter.aacquire(prompt_tokens)
+            response = ""
+            try:
+                response = await self._repository.aexecute_prompt(prompt_template, context, use_cache)
+                return response
+            except Exception as e:
+                if not self._should_retry(e, attempt):
+                    raise
+                delay = self._backoff_seconds(e, attempt)
+            finally:
+                self._limiter.release(len(response) // _CHARS_PER_TOKEN)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def astream_prompt(
+        self, prompt_template: str, context: Dict[str, str], use_cache: bool = True
+    ) -> AsyncIterator[str]:
+        prompt_tokens = self._prompt_tokens(prompt_template, context)
+        attempt = 0
+        while True:
+            await self._limiter.aacquire(prompt_tokens)
+            output_chars = 0
+            try:
+                async for chunk in self._repository.astream_prompt(prompt_template, context, use_cache):
+                    output_chars += len(chunk)
+                    yield chunk
+                return
+            except Exception as e:
+                if output_chars or not self._should_retry(e, attempt):
+                    raise
+                delay = self._backoff_seconds(e, attempt)
+            finally:
+                self._limiter.release(output_chars // _CHARS_PER_TOKEN)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _prompt_tokens(self, prompt_template: str, context: Dict[str, str]) -> int:
+        prompt_chars = len(prompt_template) + sum(
+            len(str(value)) for key, value in context.items() if f"{{{key}}}" in prompt_template
+        )
+        return prompt_chars // _CHARS_PER_TOKEN
+
+    def _should_retry(self, error: Exception, attempt: int) -> bool:
+        return attempt < self._max_rate_limit_retries and (
+            is_rate_limit_error(error) or is_transient_error(error)
+        )
+
+    def _backoff_seconds(self, error: Exception, attempt: int) -> float:
+        if is_rate_limit_error(error):
+            self._limiter.penalize(self._retry_after(error), attempt)
+            return 0.0
+        return min(_TRANSIENT_BACKOFF_SECONDS * 2 ** attempt, _MAX_TRANSIENT_BACKOFF_SECONDS)
+
+    def _retry_after(self, error: Exception) -> Optional[float]:
+        headers = getattr(getattr(error, "response", None), "headers", None)
+        retry_after = headers.get("retry-after") if headers is not None else None
+        try:
+            return float(retry_after) if retry_after is not None else None
+        except (TypeError, ValueError):
+            return None
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    if getattr(error, "status_code", None) == _RATE_LIMIT_STATUS:
+        return True
+    if getattr(error, "code", None) == _RATE_LIMIT_STATUS:
+        return True
+    if type(error).__name__ in _RATE_LIMIT_ERROR_NAMES:
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in _RATE_LIMIT_MARKERS)
+
+
+def is_transient_error(error: Exception) -> bool:
+    for status in (getattr(error, "status_code", None), getattr(error, "code", None)):
+        if isinstance(status, int) and 500 <= status < 600:
+            return True
+    if isinstance(error, ConnectionError):
+        return True
+    return type(error).__name__ in _TRANSIENT_ERROR_NAMES
@@ -11,6 +11,56 @@ class ModelProvider(Enum):
     OPENAI = "GPT-4o"
     GEMINI = "gemini-2.5-flash-preview-05-20"
 
+    @property
+    def context_window_tokens(self) -> int:
+        return _CONTEXT_WINDOW_TOKENS[self]
+
+    @property
+    def max_output_tokens(self) -> int:
+        return _MAX_OUTPUT_TOKENS[self]
+
+    @property
+    def max_concurrent_requests(self) -> int:
+        return _MAX_CONCURRENT_REQUESTS[self]
+
+    @property
+    def requests_per_minute(self) -> int:
+        return _REQUESTS_PER_MINUTE[self]
+
+    @property
+    def tokens_per_minute(self) -> int:
+        return _TOKENS_PER_MINUTE[self]
+
+_CONTEXT_WINDOW_TOKENS = {
+    ModelProvider.OPENAI: 128_000,
+    ModelProvider.GEMINI: 1_048_576,
+}
+
+_MAX_OUTPUT_TOKENS = {
+    ModelProvider.OPENAI: 16_384,
+    ModelProvider.GEMINI: 65_536,
+}
+
+_MAX_CONCURRENT_REQUESTS = {
+    ModelProvider.OPENAI: 4,
+    ModelProvider.GEMINI: 4,
+}
+
+_REQUESTS_PER_MINUTE = {
+    ModelProvider.OPENAI: 500,
+    ModelProvider.GEMINI: 1_000,
+}
+
+_TOKENS_PER_MINUTE = {
+    ModelProvider.OPENAI: 450_000,
+    ModelProvider.GEMINI: 1_000_000,
+}
+
+class ProjectContextMode(Enum):
+    FULL_MAP = "full_map"
+    BASELINE_WITH_CHANGES = "baseline_with_changes"
+    CHANGES_ONLY = "changes_only"
+
 class ChatMessage(BaseModel):
     author: Author
     content: str
@@ -21,12 +71,14 @@ class PromptStep(BaseModel):
     prompt_template: str
     is_active: bool = True
     order: int
+    context_mode: ProjectContextMode = ProjectContextMode.FULL_MAP
 
 class AgentTask(BaseModel):
     conversation: List[ChatMessage]
     prompt_steps: List[PromptStep]
     model_provider: ModelProvider = ModelProvider.OPENAI
     commit_header: Optional[str] = None
+    use_response_cache: bool = True
 
 class ExecutionProgress(BaseModel):
     current_step: int = 0
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
 
 class IFileSystemRepository(ABC):
 
@@ -6,6 +7,22 @@ class IFileSystemRepository(ABC):
     def write_file(self, file_path: str, content: str) -> None:
         pass
 
+    @abstractmethod
+    def write_files(self, files: List[Tuple[str, str]]) -> None:
+        pass
+
+    @abstractmethod
+    def flush(self) -> None:
+        pass
+
     @abstractmethod
     def is_directory(self, path: str) -> bool:
         pass
+
+    @abstractmethod
+    def get_file_size(self, file_path: str) -> Optional[int]:
+        pass
+
+    @abstractmethod
+    def read_file(self, file_path: str) -> Optional[str]:
+        pass
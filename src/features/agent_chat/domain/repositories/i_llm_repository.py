@@ -1,8 +1,28 @@
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import AsyncIterator, Dict, Iterator
 
 class ILLMRepository(ABC):
 
     @abstractmethod
-    def execute_prompt(self, prompt_template: str, context: Dict[str, str]) -> str:
+    def execute_prompt(
+        self, prompt_template: str, context: Dict[str, str], use_cache: bool = True
+    ) -> str:
+        pass
+
+    @abstractmethod
+    def stream_prompt(
+        self, prompt_template: str, context: Dict[str, str], use_cache: bool = True
+    ) -> Iterator[str]:
+        pass
+
+    @abstractmethod
+    async def aexecute_prompt(
+        self, prompt_template: str, context: Dict[str, str], use_cache: bool = True
+    ) -> str:
+        pass
+
+    @abstractmethod
+    def astream_prompt(
+        self, prompt_template: str, context: Dict[str, str], use_cache: bool = True
+    ) -> AsyncIterator[str]:
         pass
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Callable, Collection, Iterator, List, Optional
 
 class IProjectMapperRepository(ABC):
 
@@ -8,6 +8,47 @@ class IProjectMapperRepository(ABC):
         self,
         project_dir: str,
         extensions_to_include: List[str],
-        extensions_to_exclude: List[str]
+        extensions_to_exclude: List[str],
+        token_budget: Optional[int] = None,
+        priority_text: Optional[str] = None,
+        focus_paths: Optional[Collection[str]] = None,
+        outline_mode: bool = False,
+        full_content_paths: Optional[Collection[str]] = None
     ) -> str:
         pass
+
+    @abstractmethod
+    def iter_project_map(
+        self,
+        project_dir: str,
+        extensions_to_include: List[str],
+        extensions_to_exclude: List[str],
+        on_file_mapped: Optional[Callable[[str], None]] = None,
+        token_budget: Optional[int] = None,
+        priority_text: Optional[str] = None,
+        focus_paths: Optional[Collection[str]] = None,
+        outline_mode: bool = False,
+        full_content_paths: Optional[Collection[str]] = None
+    ) -> Iterator[str]:
+        pass
+
+    @abstractmethod
+    def warm_project(self, project_dir: str) -> None:
+        pass
+
+    @abstractmethod
+    def release_project(self, project_dir: str) -> None:
+        pass
+
+    @abstractmethod
+    def apply_file_changes(
+        self,
+        project_dir: str,
+        relative_paths: Collection[str],
+        structure_changed: bool = False
+    ) -> bool:
+        pass
+
+    @abstractmethod
+    def update_file_content(self, project_dir: str, file_path: str, content: str) -> None:
+        pass
@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+class IProjectWatcherRepository(ABC):
+
+    @abstractmethod
+    def watch(self, project_dir: str) -> None:
+        pass
+
+    @abstractmethod
+    def stop(self) -> None:
+        pass
+
+    @abstractmethod
+    def notify_file_written(self, file_path: str, content: str) -> None:
+        pass
+
+    @abstractmethod
+    def take_errors(self) -> List[str]:
+        pass
@@ -0,0 +1,25 @@
+from abc import ABC, abstractmethod
+from typing import Collection, List
+
+class IRelevanceIndexRepository(ABC):
+
+    @abstractmethod
+    def rank_files(self, project_dir: str, query: str, limit: int) -> List[str]:
+        pass
+
+    @abstractmethod
+    def watch_project(self, project_dir: str) -> None:
+        pass
+
+    @abstractmethod
+    def release_project(self, project_dir: str) -> None:
+        pass
+
+    @abstractmethod
+    def apply_file_changes(
+        self,
+        project_dir: str,
+        relative_paths: Collection[str],
+        structure_changed: bool = False
+    ) -> None:
+        pass
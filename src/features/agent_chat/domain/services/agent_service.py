@@ -1,20 +1,44 @@
+import asyncio
 import json
+import os
 import re
 import threading
-from typing import Callable, Dict, List, Optional
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from contextlib import aclosing, asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, TypeVar
 
-from .....core.exceptions import TaskInterruptedException
-from ...data.dto.code_generation_dto import FileContentList
+from pydantic import ValidationError
+
+from .....core.event_loop_thread import EventLoopThread
+from .....core.exceptions import TaskInterruptedException, TruncatedOutputException
+from ...data.dto.code_generation_dto import FileContent, FileContentList
 from ..models.agent_models import (
     AgentTask,
     Author,
     ChatMessage,
     ExecutionProgress,
     ModelProvider,
+    ProjectContextMode,
 )
 from ..repositories.i_file_system_repository import IFileSystemRepository
 from ..repositories.i_llm_repository import ILLMRepository
 from ..repositories.i_project_mapper_repository import IProjectMapperRepository
+from ..repositories.i_project_watcher_repository import IProjectWatcherRepository
+from ..repositories.i_relevance_index_repository import IRelevanceIndexRepository
+from .code_generation_batch_planner import CodeGenerationBatchPlanner, PlannedBatch
+from .file_content_stream_parser import FileContentStreamParser
+from .project_change_set import ProjectChangeSet
+
+_PROJECT_MAP_CONTEXT_SHARE = 0.5
+_CHARS_PER_TOKEN = 4
+_RELEVANT_FILES_LIMIT = 40
+_FILE_LIST_RESULT_KEY = "2_listar_archivos_accionables_json_result"
+_PROJECT_CHANGES_KEY = "project_changes"
+_CODE_GENERATION_STEP_MARKER = "Generar Código por Lote"
+_STOP_POLL_SECONDS = 0.2
+_DEFAULT_REQUEST_TIMEOUT_SECONDS = 600.0
+
+T = TypeVar("T")
 
 
 class AgentService:
@@ -23,10 +47,29 @@ class AgentService:
         llm_repositories: Dict[ModelProvider, ILLMRepository],
         file_system_repository: IFileSystemRepository,
         project_mapper_repository: IProjectMapperRepository,
+        relevance_index_repository: Optional[IRelevanceIndexRepository] = None,
+        project_watcher_repository: Optional[IProjectWatcherRepository] = None,
+        max_concurrent_batches: Optional[Dict[ModelProvider, int]] = None,
+        request_timeout_seconds: Optional[float] = _DEFAULT_REQUEST_TIMEOUT_SECONDS,
+        event_loop: Optional[EventLoopThread] = None,
+        callback_executor: Optional[Executor] = None,
     ):
         self._llm_repos = llm_repositories
         self._fs_repo = file_system_repository
         self._mapper_repo = project_mapper_repository
+        self._relevance_repo = relevance_index_repository
+        self._watcher_repo = project_watcher_repository
+        self._max_concurrent_batches = max_concurrent_batches or {}
+        self._batch_planners: Dict[ModelProvider, CodeGenerationBatchPlanner] = {}
+        self._request_timeout_seconds = request_timeout_seconds
+        self._event_loop = event_loop or EventLoopThread(name="agent-service")
+        self._callback_executor = callback_executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="agent-callbacks"
+        )
+
+    def watch_project(self, project_dir: str) -> None:
+        if self._watcher_repo is not None and self._fs_repo.is_directory(project_dir):
+            self._watcher_repo.watch(project_dir)
 
     def generate_interim_response(
         self,
@@ -34,8 +77,44 @@ class AgentService:
         model_provider: ModelProvider,
         project_dir: Optional[str],
         stop_event: threading.Event,
+        on_partial_response: Optional[Callable[[str], None]] = None,
     ) -> Optional[str]:
+        return self.submit_interim_response(
+            conversation, model_provider, project_dir, stop_event, on_partial_response
+        ).result()
+
+    def submit_interim_response(
+        self,
+        conversation: List[ChatMessage],
+        model_provider: ModelProvider,
+        project_dir: Optional[str],
+        stop_event: threading.Event,
+        on_partial_response: Optional[Callable[[str], None]] = None,
+    ) -> "Future[Optional[str]]":
+        async def respond() -> Optional[str]:
+            try:
+                return await self._run_until_stopped(
+                    self.agenerate_interim_response(
+                        conversation, model_provider, project_dir, on_partial_response
+                    ),
+                    stop_event,
+                )
+            except TaskInterruptedException:
+                return None
+            finally:
+                await self._drain_callbacks()
+
+        return self._event_loop.submit(respond())
+
+    async def agenerate_interim_response(
+        self,
+        conversation: List[ChatMessage],
+        model_provider: ModelProvider,
+        project_dir: Optional[str],
+        on_partial_response: Optional[Callable[[str], None]] = None,
+    ) -> str:
         llm_repo = self._get_llm_repository(model_provider)
+        report_partial = self._off_loop(on_partial_response) if on_partial_response else None
 
         prompt_template = """Eres Cortex, un asistente de desarrollo de IA de élite. La siguiente es una conversación con un usuario y el mapa del proyecto actual. Tu tarea es proporcionar una respuesta breve, útil y contextual. Confirma que entiendes la última solicitud del usuario y anímale a usar el botón 'Start Agent' para comenzar la ejecución de la tarea principal. No generes código. Sé conciso.
 
@@ -45,24 +124,28 @@ CONVERSACIÓN:
 MAPA DEL PROYECTO:
 {project_map}"""
 
-        if project_dir and self._fs_repo.is_directory(project_dir):
-            project_map = self._mapper_repo.map_project_to_string(project_dir, [], [])
-        else:
-            project_map = "El directorio del proyecto aún no ha sido seleccionado."
-
         conversation_history = "\n".join(
             [f"{msg.author.value}: {msg.content}" for msg in conversation]
         )
+
+        if project_dir and self._fs_repo.is_directory(project_dir):
+            project_map = await asyncio.to_thread(
+                self._map_project, project_dir, model_provider, conversation_history
+            )
+        else:
+            project_map = "El directorio del proyecto aún no ha sido seleccionado."
         context = {
             "conversation_history": conversation_history,
             "project_map": project_map,
         }
 
-        response = llm_repo.execute_prompt(prompt_template, context)
-
-        if stop_event.is_set():
-            return None
-
+        response = ""
+        async with self._request_deadline():
+            async with aclosing(llm_repo.astream_prompt(prompt_template, context)) as chunks:
+                async for chunk in chunks:
+                    response += chunk
+                    if report_partial is not None:
+                        report_partial(response)
         return response
 
     def execute_task(
@@ -71,21 +154,49 @@ MAPA DEL PROYECTO:
         project_dir: str,
         progress_callback: Callable[[ExecutionProgress], None],
         stop_event: threading.Event,
+    ):
+        self.submit_task(task, project_dir, progress_callback, stop_event).result()
+
+    def submit_task(
+        self,
+        task: AgentTask,
+        project_dir: str,
+        progress_callback: Callable[[ExecutionProgress], None],
+        stop_event: Optional[threading.Event] = None,
+    ) -> "Future[None]":
+        return self._event_loop.submit(
+            self.aexecute_task(task, project_dir, progress_callback, stop_event)
+        )
+
+    async def aexecute_task(
+        self,
+        task: AgentTask,
+        project_dir: str,
+        progress_callback: Callable[[ExecutionProgress], None],
+        stop_event: Optional[threading.Event] = None,
     ):
         progress = ExecutionProgress(is_running=True)
+        report_progress = self._off_loop(progress_callback)
         try:
             llm_repo = self._get_llm_repository(task.model_provider)
-            context = self._initialize_context(task, project_dir)
-            self._run_pipeline(
-                task, context, progress, progress_callback, project_dir, llm_repo, stop_event
+            context = await asyncio.to_thread(self._initialize_context, task, project_dir)
+            await self._run_until_stopped(
+                self._run_pipeline(
+                    task, context, progress, report_progress, project_dir, llm_repo
+                ),
+                stop_event,
             )
         except TaskInterruptedException:
             progress.message = "Tarea cancelada por el usuario."
+        except asyncio.CancelledError:
+            progress.message = "Tarea cancelada por el usuario."
+            raise
         except Exception as e:
             progress.message = f"An error occurred: {str(e)}"
         finally:
             progress.is_running = False
-            progress_callback(progress)
+            report_progress(progress)
+            await self._drain_callbacks()
 
     def _get_llm_repository(self, provider: ModelProvider) -> ILLMRepository:
         repo = self._llm_repos.get(provider)
@@ -93,7 +204,46 @@ MAPA DEL PROYECTO:
             raise ValueError(f"LLM provider {provider.value} is not configured.")
         return repo
 
-    def _run_pipeline(
+    def _off_loop(self, callback: Callable[[T], None]) -> Callable[[T], None]:
+        def dispatch(value: T) -> None:
+            if isinstance(value, ExecutionProgress):
+                value = value.model_copy()
+            self._callback_executor.submit(callback, value)
+
+        return dispatch
+
+    async def _drain_callbacks(self) -> None:
+        await asyncio.shield(asyncio.wrap_future(self._callback_executor.submit(lambda: None)))
+
+    async def _run_until_stopped(
+        self, coroutine: Awaitable[T], stop_event: Optional[threading.Event]
+    ) -> T:
+        if stop_event is None:
+            return await coroutine
+        inner = asyncio.ensure_future(coroutine)
+        try:
+            while not inner.done():
+                if stop_event.is_set():
+                    inner.cancel()
+                    await asyncio.gather(inner, return_exceptions=True)
+                    raise TaskInterruptedException()
+                await asyncio.wait({inner}, timeout=_STOP_POLL_SECONDS)
+            return inner.result()
+        finally:
+            if not inner.done():
+                inner.cancel()
+
+    @asynccontextmanager
+    async def _request_deadline(self) -> AsyncIterator[None]:
+        try:
+            async with asyncio.timeout(self._request_timeout_seconds):
+                yield
+        except TimeoutError as e:
+            raise TimeoutError(
+                f"LLM request timed out after {self._request_timeout_seconds:g} seconds."
+            ) from e
+
+    async def _run_pipeline(
         self,
         task: AgentTask,
         context: Dict[str, str],
@@ -101,7 +251,6 @@ MAPA DEL PROYECTO:
         progress_callback: Callable[[ExecutionProgress], None],
         project_dir: str,
         llm_repo: ILLMRepository,
-        stop_event: threading.Event,
     ):
         active_steps = sorted(
             [s for s in task.prompt_steps if s.is_active], key=lambda s: s.order
@@ -113,98 +262,353 @@ MAPA DEL PROYECTO:
         total_steps = len(active_steps)
         progress.total_steps = total_steps
         step_results = {}
+        baseline_map = context["project_map"]
+        changes = ProjectChangeSet(project_dir)
 
         for i, step in enumerate(active_steps):
-            if stop_event.is_set():
-                raise TaskInterruptedException()
-
             progress.current_step = i + 1
             progress.message = f"Executing step {i+1}/{total_steps}: {step.name}"
             progress_callback(progress)
 
             step_context = context.copy()
             step_context.update(step_results)
+            step_context[_PROJECT_CHANGES_KEY] = changes.render()
+            result_key = self._result_key(step.name)
+
+            is_code_generation = _CODE_GENERATION_STEP_MARKER in step.name
+            if step.context_mode is not ProjectContextMode.FULL_MAP:
+                step_context["project_map"] = await asyncio.to_thread(
+                    self._delta_project_map,
+                    step.context_mode,
+                    baseline_map,
+                    changes,
+                    project_dir,
+                    self._listed_paths(step_context) if is_code_generation else None,
+                )
+            elif (
+                (self._relevance_repo is not None or is_code_generation)
+                and result_key != _FILE_LIST_RESULT_KEY
+                and self._fs_repo.is_directory(project_dir)
+            ):
+                listed_paths = self._listed_paths(step_context)
+                step_context["project_map"] = await asyncio.to_thread(
+                    self._map_project,
+                    project_dir,
+                    task.model_provider,
+                    context["conversation"],
+                    relevant_to=listed_paths,
+                    full_content_paths=listed_paths if is_code_generation else None,
+                )
 
-            if "Generar Código por Lote" in step.name:
-                self._process_code_generation(
+            if is_code_generation:
+                await self._process_code_generation(
                     step.prompt_template,
                     step_context,
                     progress,
                     progress_callback,
                     project_dir,
+                    task.model_provider,
                     llm_repo,
-                    stop_event
+                    task.use_response_cache,
+                    step.context_mode,
+                    baseline_map,
+                    changes,
                 )
             else:
-                result = llm_repo.execute_prompt(step.prompt_template, step_context)
-                result_key = f"{step.name.lower().replace(' ', '_').replace('.', '').replace('(', '').replace(')', '')}_result"
+                async with self._request_deadline():
+                    result = await llm_repo.aexecute_prompt(
+                        step.prompt_template, step_context, task.use_response_cache
+                    )
                 step_results[result_key] = result
                 context[result_key] = result
 
-        if stop_event.is_set():
-            raise TaskInterruptedException()
+        await asyncio.to_thread(self._fs_repo.flush)
 
         progress.message = "Task completed successfully."
         progress.current_step = total_steps
 
-    def _process_code_generation(
+    async def _process_code_generation(
         self,
         template: str,
         context: Dict[str, str],
         progress: ExecutionProgress,
         progress_callback: Callable[[ExecutionProgress], None],
         project_dir: str,
+        model_provider: ModelProvider,
         llm_repo: ILLMRepository,
-        stop_event: threading.Event
+        use_cache: bool,
+        context_mode: ProjectContextMode,
+        baseline_map: str,
+        changes: ProjectChangeSet,
     ):
-        file_list_json_str = context.get(
-            "2_listar_archivos_accionables_json_result", "[]"
-        )
-        work_queue = self._parse_file_list(file_list_json_str)
+        work_queue = self._parse_file_list(context.get(_FILE_LIST_RESULT_KEY, "[]"))
         if not work_queue:
             return
 
-        batches = [work_queue[i : i + 2] for i in range(0, len(work_queue), 2)]
-
-        for i, batch in enumerate(batches):
-            if stop_event.is_set():
-                raise TaskInterruptedException()
+        planner = self._batch_planner(model_provider)
 
-            progress.message = f"Generating code for batch {i+1}/{len(batches)}"
-            progress_callback(progress)
-
-            batch_context = context.copy()
-            batch_context["file_list"] = "\n".join([f"- {item['path']}" for item in batch])
+        def size_of(item: Dict[str, str]) -> Optional[int]:
+            return self._fs_repo.get_file_size(os.path.join(project_dir, item["path"]))
 
-            code_json_str = llm_repo.execute_prompt(template, batch_context)
+        ready_sets = self._group_by_order(work_queue)
+        estimated_batches = [len(planner.plan(ready, size_of)) for ready in ready_sets]
+        total_batches = sum(estimated_batches)
+        completed_batches = 0
+        semaphore = asyncio.Semaphore(self._concurrent_batch_limit(model_provider))
 
-            cleaned_json_str = self._clean_json_string(code_json_str)
-            file_contents = FileContentList.model_validate_json(cleaned_json_str)
+        async def generate(batch: PlannedBatch) -> int:
+            async with semaphore:
+                return await self._generate_batch(
+                    template, context.copy(), batch.items, llm_repo, use_cache, project_dir, changes
+                )
 
-            for file_content in file_contents.root:
-                self._fs_repo.write_file(file_content.path, file_content.content)
+        def submit(batch: PlannedBatch) -> "asyncio.Task[int]":
+            return asyncio.create_task(generate(batch))
 
-            context["project_map"] = self._mapper_repo.map_project_to_string(
-                project_dir, [], []
-            )
-            progress_callback(progress)
+        pending: Dict["asyncio.Task[int]", PlannedBatch] = {}
+        try:
+            for ready, estimated in zip(ready_sets, estimated_batches):
+                batches = planner.plan(ready, size_of)
+                total_batches += len(batches) - estimated
+                progress.message = (
+                    f"Generating code for batch {completed_batches + 1}"
+                    f"-{completed_batches + len(batches)}/{total_batches}"
+                )
+                progress_callback(progress)
+
+                pending.update({submit(batch): batch for batch in batches})
+                while pending:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for finished in done:
+                        batch = pending.pop(finished)
+                        try:
+                            planner.record_success(batch, finished.result())
+                        except TruncatedOutputException as e:
+                            completed_paths = self._completed_item_paths(
+                                project_dir, batch.items, e.completed_paths
+                            )
+                            retry_batches = planner.replan_truncated(
+                                batch, e.output_chars, size_of, completed_paths
+                            )
+                            if retry_batches:
+                                total_batches += len(retry_batches) - 1
+                                pending.update({submit(retry): retry for retry in retry_batches})
+                                progress.message = (
+                                    f"Output truncated; retrying remaining "
+                                    f"{sum(len(retry.items) for retry in retry_batches)} files "
+                                    f"in {len(retry_batches)} batches"
+                                )
+                                progress_callback(progress)
+                                continue
+                            if len(completed_paths) < len(batch.items):
+                                raise ValueError(
+                                    f"Generated code for {batch.items[0]['path']} was truncated "
+                                    f"after {e.output_chars} characters."
+                                ) from e
+                        completed_batches += 1
+                        progress.message = f"Generated code for batch {completed_batches}/{total_batches}"
+                        progress_callback(progress)
+
+                context[_PROJECT_CHANGES_KEY] = changes.render()
+                if context_mode is ProjectContextMode.FULL_MAP:
+                    listed_paths = self._listed_paths(context)
+                    context["project_map"] = await asyncio.to_thread(
+                        self._map_project,
+                        project_dir,
+                        model_provider,
+                        context["conversation"],
+                        relevant_to=listed_paths,
+                        full_content_paths=listed_paths,
+                    )
+                else:
+                    context["project_map"] = await asyncio.to_thread(
+                        self._delta_project_map,
+                        context_mode,
+                        baseline_map,
+                        changes,
+                        project_dir,
+                        self._listed_paths(context),
+                    )
+                progress_callback(progress)
+        finally:
+            for unfinished in pending:
+                unfinished.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
 
-    def _initialize_context(self, task: AgentTask, project_dir: str) -> Dict[str, str]:
-        if not self._fs_repo.is_directory(project_dir):
-            project_map = "Project directory not selected or does not exist."
+    async def _generate_batch(
+        self,
+        template: str,
+        context: Dict[str, str],
+        batch: List[Dict[str, str]],
+        llm_repo: ILLMRepository,
+        use_cache: bool,
+        project_dir: str,
+        changes: ProjectChangeSet,
+    ) -> int:
+        context["file_list"] = "\n".join([f"- {item['path']}" for item in batch])
+        parser = FileContentStreamParser()
+        output_parts: List[str] = []
+        written_paths: List[str] = []
+        async with self._request_deadline():
+            async with aclosing(llm_repo.astream_prompt(template, context, use_cache)) as chunks:
+                async for chunk in chunks:
+                    output_parts.append(chunk)
+                    file_contents = parser.feed(chunk)
+                    if file_contents:
+                        await asyncio.to_thread(
+                            self._write_file_contents, file_contents, project_dir, changes
+                        )
+                        written_paths.extend(file_content.path for file_content in file_contents)
+        code_json_str = "".join(output_parts)
+        if parser.is_complete:
+            return len(code_json_str)
+
+        cleaned_json_str = self._clean_json_string(code_json_str)
+        try:
+            file_contents = FileContentList.model_validate_json(cleaned_json_str).root
+        except ValidationError as e:
+            if not self._is_truncated_json(cleaned_json_str):
+                raise
+            raise TruncatedOutputException(len(code_json_str), written_paths) from e
+        await asyncio.to_thread(
+            self._write_file_contents, file_contents[len(written_paths):], project_dir, changes
+        )
+        return len(code_json_str)
+
+    def _write_file_contents(
+        self, file_contents: List[FileContent], project_dir: str, changes: ProjectChangeSet
+    ) -> None:
+        files = []
+        for file_content in file_contents:
+            full_path = os.path.join(project_dir, file_content.path)
+            created = self._fs_repo.get_file_size(full_path) is None
+            changes.record(file_content.path, file_content.content, created)
+            files.append((full_path, file_content.content))
+        self._fs_repo.write_files(files)
+
+    def _delta_project_map(
+        self,
+        context_mode: ProjectContextMode,
+        baseline_map: str,
+        changes: ProjectChangeSet,
+        project_dir: str,
+        full_content_paths: Optional[List[str]] = None,
+    ) -> str:
+        if context_mode is ProjectContextMode.CHANGES_ONLY:
+            project_map = changes.render()
         else:
-            project_map = self._mapper_repo.map_project_to_string(project_dir, [], [])
+            project_map = f"{baseline_map}\n\n{changes.render()}"
+        if not full_content_paths:
+            return project_map
+
+        current_files = []
+        for path in full_content_paths:
+            content = self._fs_repo.read_file(os.path.join(project_dir, path))
+            if content is not None:
+                current_files.append((path, content))
+        current = changes.render_current(current_files)
+        return f"{project_map}\n\n{current}" if current else project_map
+
+    def _completed_item_paths(
+        self, project_dir: str, items: List[Dict[str, str]], written_paths: List[str]
+    ) -> List[str]:
+        written = {
+            os.path.normpath(os.path.join(project_dir, path)) for path in written_paths
+        }
+        return [
+            item["path"]
+            for item in items
+            if os.path.normpath(os.path.join(project_dir, item["path"])) in written
+        ]
+
+    def _batch_planner(self, model_provider: ModelProvider) -> CodeGenerationBatchPlanner:
+        planner = self._batch_planners.get(model_provider)
+        if planner is None:
+            planner = CodeGenerationBatchPlanner(model_provider.max_output_tokens)
+            self._batch_planners[model_provider] = planner
+        return planner
+
+    def _group_by_order(self, work_queue: List[Dict[str, str]]) -> List[List[Dict[str, str]]]:
+        groups: Dict[int, List[Dict[str, str]]] = {}
+        order = 0
+        for item in work_queue:
+            if not isinstance(item, dict):
+                continue
+            try:
+                order = int(item.get("order", order))
+            except (TypeError, ValueError):
+                pass
+            groups.setdefault(order, []).append(item)
+        return [groups[key] for key in sorted(groups)]
+
+    def _concurrent_batch_limit(self, model_provider: ModelProvider) -> int:
+        limit = self._max_concurrent_batches.get(
+            model_provider, model_provider.max_concurrent_requests
+        )
+        return max(limit, 1)
 
+    def _initialize_context(self, task: AgentTask, project_dir: str) -> Dict[str, str]:
         conversation_history = "\n".join(
             [f"{msg.author.value}: {msg.content}" for msg in task.conversation]
         )
 
+        if not self._fs_repo.is_directory(project_dir):
+            project_map = "Project directory not selected or does not exist."
+        else:
+            project_map = self._map_project(
+                project_dir, task.model_provider, conversation_history
+            )
+
         return {
             "project_map": project_map,
             "conversation": conversation_history,
             "commit_header": task.commit_header or "",
         }
 
+    def _map_project(
+        self,
+        project_dir: str,
+        model_provider: ModelProvider,
+        conversation: str,
+        relevant_to: Optional[List[str]] = None,
+        full_content_paths: Optional[List[str]] = None,
+    ) -> str:
+        self._fs_repo.flush()
+        focus_paths = None
+        if relevant_to is not None and self._relevance_repo is not None:
+            query = "\n".join([conversation, *relevant_to])
+            focus_paths = set(
+                self._relevance_repo.rank_files(project_dir, query, _RELEVANT_FILES_LIMIT)
+            )
+            focus_paths.update(relevant_to)
+
+        return self._mapper_repo.map_project_to_string(
+            project_dir,
+            [],
+            [],
+            token_budget=self._project_map_token_budget(model_provider, conversation),
+            priority_text=conversation,
+            focus_paths=focus_paths,
+            outline_mode=True,
+            full_content_paths=full_content_paths,
+        )
+
+    def _listed_paths(self, context: Dict[str, str]) -> List[str]:
+        return [
+            item["path"]
+            for item in self._parse_file_list(context.get(_FILE_LIST_RESULT_KEY, "[]"))
+            if isinstance(item, dict) and isinstance(item.get("path"), str)
+        ]
+
+    def _result_key(self, step_name: str) -> str:
+        return f"{step_name.lower().replace(' ', '_').replace('.', '').replace('(', '').replace(')', '')}_result"
+
+    def _project_map_token_budget(
+        self, model_provider: ModelProvider, conversation: str
+    ) -> int:
+        available = int(model_provider.context_window_tokens * _PROJECT_MAP_CONTEXT_SHARE)
+        return max(available - len(conversation) // _CHARS_PER_TOKEN, 0)
+
     def _parse_file_list(self, json_str: str) -> List[Dict[str, str]]:
         try:
             cleaned_json = self._clean_json_string(json_str)
@@ -217,4 +621,14 @@ MAPA DEL PROYECTO:
         match = re.search(r'```json\n(.*?)\n```', json_str, re.DOTALL)
         if match:
             return match.group(1).strip()
+        unclosed_match = re.search(r'```json\n(.*)', json_str, re.DOTALL)
+        if unclosed_match:
+            return unclosed_match.group(1).strip()
         return json_str.strip()
+
+    def _is_truncated_json(self, json_str: str) -> bool:
+        try:
+            json.loads(json_str)
+        except json.JSONDecodeError as e:
+            return e.msg.startswith("Unterminated string") or e.pos >= len(json_str) - 1
+        return False
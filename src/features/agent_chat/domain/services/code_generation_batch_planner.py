@@ -0,0 +1,111 @@
+from dataclasses import dataclass
+from typing import Callable, Collection, Dict, List, Optional
+
+_CHARS_PER_TOKEN = 4
+_JSON_ESCAPING_OVERHEAD = 1.15
+_FILE_OVERHEAD_TOKENS = 32
+_NEW_FILE_TOKENS = 1_500
+_OUTPUT_BUDGET_SHARE = 0.6
+_MIN_BUDGET_TOKENS = 1_024
+_MAX_FILES_PER_BATCH = 8
+_TRUNCATION_BACKOFF = 0.8
+_BUDGET_RECOVERY = 1.25
+_GROWTH_SMOOTHING = 0.3
+_MIN_GROWTH = 0.5
+_MAX_GROWTH = 4.0
+
+SizeLookup = Callable[[Dict[str, str]], Optional[int]]
+
+
+@dataclass
+class PlannedBatch:
+    items: List[Dict[str, str]]
+    estimated_tokens: int
+
+
+class CodeGenerationBatchPlanner:
+    def __init__(
+        self,
+        max_output_tokens: int,
+        max_files_per_batch: int = _MAX_FILES_PER_BATCH,
+    ):
+        self._max_budget_tokens = max(int(max_output_tokens * _OUTPUT_BUDGET_SHARE), _MIN_BUDGET_TOKENS)
+        self._budget_tokens = self._max_budget_tokens
+        self._max_files_per_batch = max(max_files_per_batch, 1)
+        self._growth = 1.0
+        self._truncations = 0
+
+    @property
+    def budget_tokens(self) -> int:
+        return self._budget_tokens
+
+    @property
+    def growth(self) -> float:
+        return self._growth
+
+    @property
+    def truncations(self) -> int:
+        return self._truncations
+
+    def estimate_tokens(self, size_bytes: Optional[int]) -> int:
+        if size_bytes:
+            base_tokens = size_bytes / _CHARS_PER_TOKEN * _JSON_ESCAPING_OVERHEAD
+        else:
+            base_tokens = _NEW_FILE_TOKENS
+        return int(base_tokens * self._growth) + _FILE_OVERHEAD_TOKENS
+
+    def plan(self, items: List[Dict[str, str]], size_of: SizeLookup) -> List[PlannedBatch]:
+        estimates = [(item, self.estimate_tokens(size_of(item))) for item in items]
+        estimates.sort(key=lambda estimate: estimate[1], reverse=True)
+        batches: List[PlannedBatch] = []
+        for item, tokens in estimates:
+            for batch in batches:
+                if (
+                    len(batch.items) < self._max_files_per_batch
+                    and batch.estimated_tokens + tokens <= self._budget_tokens
+                ):
+                    batch.items.append(item)
+                    batch.estimated_tokens += tokens
+                    break
+            else:
+                batches.append(PlannedBatch([item], tokens))
+        return batches
+
+    def record_success(self, batch: PlannedBatch, output_chars: int) -> None:
+        self._budget_tokens = min(
+            int(self._budget_tokens * _BUDGET_RECOVERY), self._max_budget_tokens
+        )
+        if batch.estimated_tokens <= 0:
+            return
+        ratio = (output_chars / _CHARS_PER_TOKEN) / batch.estimated_tokens
+        self._set_growth(self._growth * (1 - _GROWTH_SMOOTHING + _GROWTH_SMOOTHING * ratio))
+
+    def replan_truncated(
+        self,
+        batch: PlannedBatch,
+        output_chars: int,
+        size_of: SizeLookup,
+        completed_paths: Collection[str] = (),
+    ) -> List[PlannedBatch]:
+        self._truncations += 1
+        observed_tokens = output_chars // _CHARS_PER_TOKEN
+        if observed_tokens:
+            self._budget_tokens = max(
+                min(self._budget_tokens, int(observed_tokens * _TRUNCATION_BACKOFF)),
+                _MIN_BUDGET_TOKENS,
+            )
+            if observed_tokens > batch.estimated_tokens:
+                self._set_growth(self._growth * observed_tokens / batch.estimated_tokens)
+        remaining = [item for item in batch.items if item.get("path") not in completed_paths]
+        if len(remaining) < len(batch.items):
+            return self.plan(remaining, size_of)
+        if len(batch.items) == 1:
+            return []
+        batches = self.plan(batch.items, size_of)
+        if len(batches) < 2:
+            middle = len(batch.items) // 2
+            batches = self.plan(batch.items[:middle], size_of) + self.plan(batch.items[middle:], size_of)
+        return batches
+
+    def _set_growth(self, growth: float) -> None:
+        self._growth = min(max(growth, _MIN_GROWTH), _MAX_GROWTH)
@@ -0,0 +1,132 @@
+import json
+import re
+from typing import List, Optional
+
+from pydantic import ValidationError
+
+from ...data.dto.code_generation_dto import FileContent
+
+_STRUCTURE_CHARS = re.compile(r'["{}\[\]]')
+_STRING_SPECIAL_CHARS = re.compile(r'["\\]')
+_SEPARATOR_CHARS = ", \t\r\n"
+
+
+class FileContentStreamParser:
+    def __init__(self):
+        self._buffer = ""
+        self._scanned_parts: List[str] = []
+        self._position = 0
+        self._array_started = False
+        self._array_closed = False
+        self._failed = False
+        self._in_object = False
+        self._in_string = False
+        self._depth = 0
+
+    @property
+    def is_complete(self) -> bool:
+        return self._array_closed
+
+    @property
+    def failed(self) -> bool:
+        return self._failed
+
+    def feed(self, chunk: str) -> List[FileContent]:
+        if self._array_closed or self._failed:
+            return []
+        self._buffer += chunk
+        file_contents = []
+        while not (self._array_closed or self._failed):
+            if not self._array_started:
+                if not self._start_array():
+                    break
+            elif self._in_object:
+                if not self._scan_object():
+                    self._retain_scanned_text()
+                    break
+                file_content = self._decode_object()
+                if file_content is not None:
+                    file_contents.append(file_content)
+            elif not self._next_object():
+                break
+        return file_contents
+
+    def _start_array(self) -> bool:
+        start = self._buffer.find("[")
+        if start < 0:
+            self._buffer = ""
+            return False
+        self._buffer = self._buffer[start + 1:]
+        self._position = 0
+        self._array_started = True
+        return True
+
+    def _next_object(self) -> bool:
+        while self._position < len(self._buffer):
+            char = self._buffer[self._position]
+            if char in _SEPARATOR_CHARS:
+                self._position += 1
+            elif char == "{":
+                self._buffer = self._buffer[self._position:]
+                self._position = 1
+                self._in_object = True
+                self._depth = 1
+                return True
+            elif char == "]":
+                self._array_closed = True
+                return False
+            else:
+                self._failed = True
+                return False
+        return False
+
+    def _scan_object(self) -> bool:
+        while True:
+            if self._in_string:
+                match = _STRING_SPECIAL_CHARS.search(self._buffer, self._position)
+                if match is None:
+                    self._position = len(self._buffer)
+                    return False
+                if match.group() == "\\":
+                    if match.end() >= len(self._buffer):
+                        self._position = match.start()
+                        return False
+                    self._position = match.end() + 1
+                    continue
+                self._in_string = False
+                self._position = match.end()
+                continue
+
+            match = _STRUCTURE_CHARS.search(self._buffer, self._position)
+            if match is None:
+                self._position = len(self._buffer)
+                return False
+            self._position = match.end()
+            char = match.group()
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    return True
+
+    def _retain_scanned_text(self) -> None:
+        if self._position:
+            self._scanned_parts.append(self._buffer[:self._position])
+            self._buffer = self._buffer[self._position:]
+            self._position = 0
+
+    def _decode_object(self) -> Optional[FileContent]:
+        self._scanned_parts.append(self._buffer[:self._position])
+        object_text = "".join(self._scanned_parts)
+        self._scanned_parts = []
+        self._buffer = self._buffer[self._position:]
+        self._position = 0
+        self._in_object = False
+        try:
+            return FileContent.model_validate(json.loads(object_text))
+        except (ValueError, ValidationError):
+            self._failed = True
+            return None
@@ -0,0 +1,64 @@
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Tuple
+
+_NO_CHANGES_NOTE = "_[Sin cambios desde el mapa base]_\n"
+_CURRENT_FILES_TITLE = "# Contenido actual de los archivos a generar\n\n"
+
+
+class ProjectChangeSet:
+    def __init__(self, project_dir: str):
+        self._project_dir = os.path.abspath(project_dir)
+        self._changes: "OrderedDict[str, Tuple[bool, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def is_empty(self) -> bool:
+        with self._lock:
+            return not self._changes
+
+    def relative_path(self, file_path: str) -> str:
+        full_path = os.path.normpath(os.path.join(self._project_dir, file_path))
+        relative_path = os.path.relpath(full_path, self._project_dir)
+        if relative_path == os.pardir or relative_path.startswith(os.pardir + os.sep):
+            return Path(full_path).as_posix()
+        return Path(relative_path).as_posix()
+
+    def record(self, file_path: str, content: str, created: bool) -> None:
+        relative_path = self.relative_path(file_path)
+        with self._lock:
+            previous = self._changes.get(relative_path)
+            self._changes[relative_path] = (previous[0] if previous else created, content)
+
+    def render(self) -> str:
+        with self._lock:
+            changes = list(self._changes.items())
+        if not changes:
+            return _NO_CHANGES_NOTE
+
+        created_count = sum(1 for _, (created, _) in changes if created)
+        parts = [
+            "# Cambios desde el mapa base\n\n",
+            f"Archivos creados: `{created_count}`, "
+            f"modificados: `{len(changes) - created_count}`\n\n---\n\n",
+        ]
+        for relative_path, (created, content) in changes:
+            parts.append(f"## `{relative_path}` ({'creado' if created else 'modificado'})\n\n")
+            parts.append(f"```{Path(relative_path).suffix.lstrip('.')}\n{content}\n```\n\n")
+        return "".join(parts)
+
+    def render_current(self, files: List[Tuple[str, str]]) -> str:
+        with self._lock:
+            changed_paths = set(self._changes)
+        parts = []
+        for file_path, content in files:
+            relative_path = self.relative_path(file_path)
+            if relative_path in changed_paths:
+                continue
+            parts.append(f"## `{relative_path}`\n\n")
+            parts.append(f"```{Path(relative_path).suffix.lstrip('.')}\n{content}\n```\n\n")
+        if not parts:
+            return ""
+        return _CURRENT_FILES_TITLE + "".join(parts)
@@ -1,8 +1,10 @@
 import flet as ft
 import threading
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Callable, Optional
 
+from ....core.progress_publisher import ThrottledProgressPublisher
 from ..domain.models.agent_models import (
     AgentTask,
     Author,
@@ -26,10 +28,12 @@ class AgentChatController:
         self.state = state
         self.update_view = update_callback
         self.current_stop_event: Optional[threading.Event] = None
+        self._ui_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="agent-chat-ui")
 
     def select_project_directory(self, e: ft.FilePickerResultEvent):
         if e.path:
             self.state.project_directory = e.path
+            self.agent_service.watch_project(e.path)
             self.update_view()
 
     def handle_user_message(self, text: str):
@@ -47,24 +51,34 @@ class AgentChatController:
         self.update_view()
         
         self.current_stop_event = threading.Event()
-        thread = threading.Thread(
-            target=self._execute_agent_response,
-            args=(thinking_message, self.current_stop_event)
-        )
-        thread.start()
+        self._execute_agent_response(thinking_message, self.current_stop_event)
 
     def clear_chat_conversation(self):
         self.state.conversation.clear()
         self.update_view()
 
     def _execute_agent_response(self, placeholder_message: ChatMessage, stop_event: threading.Event):
-        try:
-            response_text = self.agent_service.generate_interim_response(
-                conversation=self.state.conversation,
-                model_provider=self.state.model_provider,
-                project_dir=self.state.project_directory,
-                stop_event=stop_event
+        def show_partial_response(text: str):
+            placeholder_message.content = text
+            self.update_view()
+
+        partial_response_publisher = ThrottledProgressPublisher(show_partial_response)
+        future = self.agent_service.submit_interim_response(
+            conversation=self.state.conversation,
+            model_provider=self.state.model_provider,
+            project_dir=self.state.project_directory,
+            stop_event=stop_event,
+            on_partial_response=partial_response_publisher.report,
+        )
+        future.add_done_callback(
+            lambda done: self._ui_executor.submit(
+                self._finish_agent_response, placeholder_message, done
             )
+        )
+
+    def _finish_agent_response(self, placeholder_message: ChatMessage, future: Future):
+        try:
+            response_text = future.result()
             if response_text is not None:
                 placeholder_message.content = response_text
             else:
@@ -80,6 +94,9 @@ class AgentChatController:
     def update_commit_header(self, header: str):
         self.state.commit_header = header
 
+    def update_use_response_cache(self, use_response_cache: bool):
+        self.state.use_response_cache = use_response_cache
+
     def update_model_provider(self, provider_name: str):
         self.state.model_provider = ModelProvider(provider_name)
 
@@ -113,15 +130,14 @@ class AgentChatController:
             conversation=self.state.conversation,
             prompt_steps=self.state.prompt_steps,
             commit_header=self.state.commit_header,
-            model_provider=self.state.model_provider
+            model_provider=self.state.model_provider,
+            use_response_cache=self.state.use_response_cache,
         )
         
         self.current_stop_event = threading.Event()
-        thread = threading.Thread(
-            target=self.agent_service.execute_task,
-            args=(task, self.state.project_directory, self._progress_callback, self.current_stop_event)
+        self.agent_service.submit_task(
+            task, self.state.project_directory, self._progress_callback, self.current_stop_event
         )
-        thread.start()
 
     def stop_current_task(self):
         if self.current_stop_event:
@@ -1,4 +1,5 @@
 import flet as ft
+from typing import Dict, List
 from .agent_chat_controller import AgentChatController
 from .agent_chat_state import AgentChatState
 from ..domain.models.agent_models import ModelProvider
@@ -15,6 +16,7 @@ class AgentChatPage(ft.Row):
         self.state = state
         
         self.chat_history_view = ft.ListView(expand=True, auto_scroll=True, spacing=10)
+        self._message_widgets: Dict[int, ChatMessageWidget] = {}
         self.progress_bar = ft.ProgressBar(value=0, bar_height=5)
         self.progress_text = ft.Text("Idle", size=12)
         
@@ -82,6 +84,11 @@ class AgentChatPage(ft.Row):
                     ]),
                     model_provider_dropdown,
                     CommitHeaderWidget(on_change=self.controller.update_commit_header),
+                    ft.Switch(
+                        label="Reutilizar respuestas en caché",
+                        value=self.state.use_response_cache,
+                        on_change=lambda e: self.controller.update_use_response_cache(e.control.value),
+                    ),
                     ft.Divider(height=20),
                     self.prompt_settings,
                     ft.Stack([self.start_button, self.stop_button])
@@ -106,9 +113,7 @@ class AgentChatPage(ft.Row):
         if not self.page or not self.page.client_storage:
             return
 
-        self.chat_history_view.controls = [
-            ChatMessageWidget(msg) for msg in self.state.conversation
-        ]
+        self.chat_history_view.controls = self._sync_message_widgets()
         
         is_running = self.state.progress.is_running
         self.progress_bar.value = (
@@ -127,3 +132,15 @@ class AgentChatPage(ft.Row):
         self.project_dir_text.value = self.state.project_directory or "No seleccionado"
 
         self.update()
+
+    def _sync_message_widgets(self) -> List[ChatMessageWidget]:
+        message_widgets = {}
+        for msg in self.state.conversation:
+            widget = self._message_widgets.get(id(msg))
+            if widget is None or widget.message is not msg:
+                widget = ChatMessageWidget(msg)
+            else:
+                widget.refresh_content()
+            message_widgets[id(msg)] = widget
+        self._message_widgets = message_widgets
+        return list(message_widgets.values())
@@ -15,5 +15,6 @@ class AgentChatState(BaseModel):
     prompt_steps: List[PromptStep] = Field(default_factory=list)
     progress: ExecutionProgress = Field(default_factory=ExecutionProgress)
     commit_header: Optional[str] = None
+    use_response_cache: bool = True
     project_directory: Optional[str] = None
     model_provider: ModelProvider = ModelProvider.GEMINI
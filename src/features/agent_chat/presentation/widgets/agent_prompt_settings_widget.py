@@ -2,9 +2,15 @@ import flet as ft
 from typing import Callable, List
 import uuid
 
-from ...domain.models.agent_models import PromptStep
+from ...domain.models.agent_models import ProjectContextMode, PromptStep
 from .....core import theme
 
+_CONTEXT_MODE_LABELS = {
+    ProjectContextMode.FULL_MAP: "Mapa completo actualizado",
+    ProjectContextMode.BASELINE_WITH_CHANGES: "Mapa base + cambios del agente",
+    ProjectContextMode.CHANGES_ONLY: "Solo cambios del agente",
+}
+
 class _PromptStepRow(ft.Container):
     def __init__(self, step: PromptStep, on_update: Callable, on_delete: Callable):
         super().__init__()
@@ -65,9 +71,19 @@ class _PromptStepRow(ft.Container):
             max_lines=25,
             expand=True,
         )
+        context_mode_dropdown = ft.Dropdown(
+            label="Contexto del proyecto",
+            value=self.step.context_mode.value,
+            options=[
+                ft.dropdown.Option(key=mode.value, text=label)
+                for mode, label in _CONTEXT_MODE_LABELS.items()
+            ],
+            dense=True,
+        )
 
         def save_changes(e):
             self.step.prompt_template = template_field.value
+            self.step.context_mode = ProjectContextMode(context_mode_dropdown.value)
             self.on_update_handler(self.step)
             self.page.dialog.open = False
             self.page.update()
@@ -75,7 +91,11 @@ class _PromptStepRow(ft.Container):
         dialog = ft.AlertDialog(
             modal=True,
             title=ft.Text(f"Editar Prompt: {self.step.name}"),
-            content=ft.Container(content=template_field, width=800, height=500),
+            content=ft.Container(
+                content=ft.Column([context_mode_dropdown, template_field], expand=True),
+                width=800,
+                height=500,
+            ),
             actions=[
                 ft.TextButton("Cancelar", on_click=lambda _: setattr(self.page.dialog, 'open', False) or self.page.update()),
                 ft.FilledButton("Guardar", on_click=save_changes),
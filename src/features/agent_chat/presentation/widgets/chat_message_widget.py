@@ -14,7 +14,7 @@ class ChatMessageWidget(ft.Row):
             size=24
         )
 
-        message_content = ft.Markdown(
+        self._message_content = ft.Markdown(
             self.message.content,
             selectable=True,
             extension_set=ft.MarkdownExtensionSet.GITHUB_WEB,
@@ -23,7 +23,7 @@ class ChatMessageWidget(ft.Row):
         )
         
         message_container = ft.Container(
-            content=message_content,
+            content=self._message_content,
             padding=ft.padding.all(12),
             border_radius=ft.border_radius.all(12),
             bgcolor=theme.primary_container if is_user else theme.secondary_container,
@@ -51,6 +51,10 @@ class ChatMessageWidget(ft.Row):
                 ft.Column([message_container], expand=True)
             ]
             
+    def refresh_content(self):
+        if self._message_content.value != self.message.content:
+            self._message_content.value = self.message.content
+
     def _copy_to_clipboard(self, e):
         if not self.page:
             return
@@ -1,18 +1,21 @@
+from typing import TYPE_CHECKING
+
+from src.core.import_profiler import ImportProfiler
+
+import_profiler = ImportProfiler.from_environment()
+
 import flet as ft
 
-from src.core.config import get_settings
 from src.core.theme import cortex_theme
-from src.features.agent_chat.data.repositories.gemini_repository import GeminiRepository
-from src.features.agent_chat.data.repositories.langchain_repository import LangchainRepository
-from src.features.agent_chat.data.repositories.local_fs_repository import LocalFsRepository
-from src.features.agent_chat.data.repositories.project_mapper_repository import ProjectMapperRepository
-from src.features.agent_chat.domain.models.agent_models import ModelProvider, PromptStep
-from src.features.agent_chat.domain.services.agent_service import AgentService
-from src.features.agent_chat.presentation.agent_chat_controller import AgentChatController
-from src.features.agent_chat.presentation.agent_chat_page import AgentChatPage
-from src.features.agent_chat.presentation.agent_chat_state import AgentChatState
-
-def get_default_prompts() -> list[PromptStep]:
+
+if TYPE_CHECKING:
+    from src.core.config import Settings
+    from src.features.agent_chat.domain.models.agent_models import PromptStep
+    from src.features.agent_chat.domain.repositories.i_llm_repository import ILLMRepository
+
+def get_default_prompts() -> "list[PromptStep]":
+    from src.features.agent_chat.domain.models.agent_models import ProjectContextMode, PromptStep
+
     return [
         PromptStep(
             order=1,
@@ -22,7 +25,7 @@ def get_default_prompts() -> list[PromptStep]:
         PromptStep(
             order=2,
             name="2. Listar Archivos Accionables (JSON)",
-            prompt_template='''Basado en el análisis y la conversación, lista TODOS los archivos que se deben crear, modificar o eliminar para completar la tarea. Devuelve la lista en formato JSON, ordenada por dependencia.\n\nFormato de salida OBLIGATORIO:\n```json\n[ { "path": "path/to/file1.ext", "order": 1 }, { "path": "path/to/file2.ext", "order": 2 } ]\n```\n\nCONVERSACIÓN:\n{conversation}\n\nMAPA DEL PROYECTO:\n{project_map}\n\nANÁLISIS PREVIO:\n{1._analizar_tarea_result}'''
+            prompt_template='''Basado en el análisis y la conversación, lista TODOS los archivos que se deben crear, modificar o eliminar para completar la tarea. Devuelve la lista en formato JSON, ordenada por dependencia. El campo "order" es el nivel de dependencia, no la posición en la lista: los archivos que no dependen entre sí comparten el mismo nivel y se generan en paralelo; un archivo solo lleva un nivel mayor cuando necesita archivos de un nivel anterior. Usa el menor número de niveles posible.\n\nFormato de salida OBLIGATORIO:\n```json\n[ { "path": "path/to/model.ext", "order": 1 }, { "path": "path/to/util.ext", "order": 1 }, { "path": "path/to/service.ext", "order": 2 } ]\n```\n\nCONVERSACIÓN:\n{conversation}\n\nMAPA DEL PROYECTO:\n{project_map}\n\nANÁLISIS PREVIO:\n{1._analizar_tarea_result}'''
         ),
         PromptStep(
             order=3,
@@ -32,41 +35,87 @@ def get_default_prompts() -> list[PromptStep]:
         PromptStep(
             order=4,
             name="4. Generar Mensaje de Commit",
-            prompt_template='''Basado en los cambios realizados (reflejados en el mapa del proyecto) y la conversación, genera un mensaje de commit en inglés. El formato debe ser: {commit_header}<título conciso en imperativo>\n\n<descripción opcional de los cambios>.\n\nMAPA DEL PROYECTO FINAL:\n{project_map}\n\nCONVERSACIÓN:\n{conversation}'''
+            context_mode=ProjectContextMode.CHANGES_ONLY,
+            prompt_template='''Basado en los cambios realizados (listados a continuación) y la conversación, genera un mensaje de commit en inglés. El formato debe ser: {commit_header}<título conciso en imperativo>\n\n<descripción opcional de los cambios>.\n\nCAMBIOS REALIZADOS:\n{project_map}\n\nCONVERSACIÓN:\n{conversation}'''
         ),
     ]
 
-def main(page: ft.Page):
-    page.title = "Cortex AI Agent"
-    page.theme = cortex_theme
-    page.window_width = 1400
-    page.window_height = 900
-    page.vertical_alignment = ft.MainAxisAlignment.CENTER
-    page.horizontal_alignment = ft.CrossAxisAlignment.CENTER
+def create_openai_repository(settings: "Settings") -> "ILLMRepository":
+    from src.features.agent_chat.data.repositories.langchain_repository import LangchainRepository
+
+    return LangchainRepository(settings)
+
+def create_gemini_repository(settings: "Settings") -> "ILLMRepository":
+    from src.features.agent_chat.data.repositories.gemini_repository import GeminiRepository
+
+    return GeminiRepository(settings)
+
+def build_agent_chat_view() -> ft.Control:
+    from src.core.config import get_settings
+    from src.features.agent_chat.data.datasources.llm_response_store import SqliteLlmResponseStore
+    from src.features.agent_chat.data.datasources.map_index_store import SqliteMapIndexStore
+    from src.features.agent_chat.data.repositories.bm25_relevance_index_repository import Bm25RelevanceIndexRepository
+    from src.features.agent_chat.data.repositories.caching_llm_repository import CachingLLMRepository
+    from src.features.agent_chat.data.repositories.lazy_llm_repository import LazyLLMRepository
+    from src.features.agent_chat.data.repositories.local_fs_repository import LocalFsRepository
+    from src.features.agent_chat.data.repositories.project_mapper_repository import ProjectMapperRepository
+    from src.features.agent_chat.data.repositories.project_watcher_repository import ProjectWatcherRepository
+    from src.features.agent_chat.data.repositories.rate_limited_llm_repository import (
+        RateLimitedLLMRepository,
+        provider_rate_limiter,
+    )
+    from src.features.agent_chat.domain.models.agent_models import ModelProvider
+    from src.features.agent_chat.domain.services.agent_service import AgentService
+    from src.features.agent_chat.presentation.agent_chat_controller import AgentChatController
+    from src.features.agent_chat.presentation.agent_chat_page import AgentChatPage
+    from src.features.agent_chat.presentation.agent_chat_state import AgentChatState
 
     try:
         settings = get_settings()
     except Exception as e:
-        page.add(ft.Text(f"Error al cargar configuración: {e}. Asegúrate de tener un archivo .env."))
-        return
+        return ft.Text(f"Error al cargar configuración: {e}. Asegúrate de tener un archivo .env.")
 
+    response_store = SqliteLlmResponseStore()
     llm_repositories = {}
     if settings.OPENAI_API_KEY:
-        llm_repositories[ModelProvider.OPENAI] = LangchainRepository(settings)
+        llm_repositories[ModelProvider.OPENAI] = CachingLLMRepository(
+            RateLimitedLLMRepository(
+                LazyLLMRepository(lambda: create_openai_repository(settings)),
+                provider_rate_limiter(ModelProvider.OPENAI),
+            ),
+            response_store,
+            namespace=ModelProvider.OPENAI.value,
+        )
     if settings.GOOGLE_API_KEY:
-        llm_repositories[ModelProvider.GEMINI] = GeminiRepository(settings)
+        llm_repositories[ModelProvider.GEMINI] = CachingLLMRepository(
+            RateLimitedLLMRepository(
+                LazyLLMRepository(lambda: create_gemini_repository(settings)),
+                provider_rate_limiter(ModelProvider.GEMINI),
+            ),
+            response_store,
+            namespace=ModelProvider.GEMINI.value,
+        )
 
     if not llm_repositories:
-        page.add(ft.Text("Error: No se encontró ninguna clave de API (OPENAI_API_KEY o GOOGLE_API_KEY) en el archivo .env."))
-        return
+        return ft.Text("Error: No se encontró ninguna clave de API (OPENAI_API_KEY o GOOGLE_API_KEY) en el archivo .env.")
 
-    fs_repo = LocalFsRepository()
-    mapper_repo = ProjectMapperRepository()
+    mapper_repo = ProjectMapperRepository(
+        max_workers=8, index_store=SqliteMapIndexStore()
+    )
+    relevance_repo = Bm25RelevanceIndexRepository()
+    watcher_repo = ProjectWatcherRepository(
+        mapper_repo, relevance_index_repository=relevance_repo
+    )
+    fs_repo = LocalFsRepository(
+        on_file_written=watcher_repo.notify_file_written, write_behind=True
+    )
 
     agent_service = AgentService(
         llm_repositories=llm_repositories,
         file_system_repository=fs_repo,
         project_mapper_repository=mapper_repo,
+        relevance_index_repository=relevance_repo,
+        project_watcher_repository=watcher_repo,
     )
 
     initial_state = AgentChatState(
@@ -88,9 +137,28 @@ def main(page: ft.Page):
         controller=agent_chat_controller,
         state=initial_state
     )
+    return agent_chat_page
+
+def main(page: ft.Page):
+    page.title = "Cortex AI Agent"
+    page.theme = cortex_theme
+    page.window_width = 1400
+    page.window_height = 900
+    page.vertical_alignment = ft.MainAxisAlignment.CENTER
+    page.horizontal_alignment = ft.CrossAxisAlignment.CENTER
+
+    page.add(ft.ProgressRing())
+    page.update()
+    if import_profiler:
+        import_profiler.mark("first window")
 
-    page.add(agent_chat_page)
+    view = build_agent_chat_view()
+    page.clean()
+    page.add(view)
     page.update()
+    if import_profiler:
+        import_profiler.mark("interactive")
+        import_profiler.publish()
 
 if __name__ == "__main__":
     ft.app(target=main)
@@ -0,0 +1,166 @@
+import asyncio
+import json
+import os
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from src.core.event_loop_thread import EventLoopThread
+from src.features.agent_chat.domain.models.agent_models import (
+    AgentTask,
+    Author,
+    ChatMessage,
+    ExecutionProgress,
+    ModelProvider,
+    ProjectContextMode,
+    PromptStep,
+)
+from src.features.agent_chat.domain.repositories.i_file_system_repository import IFileSystemRepository
+from src.features.agent_chat.domain.repositories.i_llm_repository import ILLMRepository
+from src.features.agent_chat.domain.repositories.i_project_mapper_repository import IProjectMapperRepository
+from src.features.agent_chat.domain.services.agent_service import AgentService
+
+_LIST_STEP_NAME = "2. Listar Archivos Accionables (JSON)"
+_GENERATE_STEP_NAME = "3. Generar Código por Lote"
+_PROJECT_DIR = "proyecto"
+
+
+class FakeLLMRepository(ILLMRepository):
+    def __init__(self, file_list: List[Dict[str, object]]):
+        self._file_list = file_list
+        self.generation_calls = 0
+        self.project_maps: List[str] = []
+        self.active = 0
+        self.max_active = 0
+
+    def execute_prompt(self, prompt_template, context, use_cache=True) -> str:
+        raise NotImplementedError
+
+    def stream_prompt(self, prompt_template, context, use_cache=True) -> Iterator[str]:
+        raise NotImplementedError
+
+    async def aexecute_prompt(self, prompt_template, context, use_cache=True) -> str:
+        return f"```json\n{json.dumps(self._file_list)}\n```"
+
+    async def astream_prompt(self, prompt_template, context, use_cache=True) -> AsyncIterator[str]:
+        self.generation_calls += 1
+        self.project_maps.append(context["project_map"])
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.05)
+            paths = [line[2:] for line in context["file_list"].splitlines()]
+            yield json.dumps([{"path": path, "content": "x"} for path in paths])
+        finally:
+            self.active -= 1
+
+
+class FakeFileSystemRepository(IFileSystemRepository):
+    def __init__(self, existing_files: Optional[Dict[str, str]] = None):
+        self.written: List[Tuple[str, str]] = []
+        self._existing_files = existing_files or {}
+
+    def write_file(self, file_path: str, content: str) -> None:
+        self.written.append((file_path, content))
+
+    def write_files(self, files: List[Tuple[str, str]]) -> None:
+        self.written.extend(files)
+
+    def flush(self) -> None:
+        pass
+
+    def is_directory(self, path: str) -> bool:
+        return False
+
+    def get_file_size(self, file_path: str) -> Optional[int]:
+        return 400
+
+    def read_file(self, file_path: str) -> Optional[str]:
+        return self._existing_files.get(file_path)
+
+
+class FakeProjectMapperRepository(IProjectMapperRepository):
+    def map_project_to_string(self, project_dir, extensions_to_include, extensions_to_exclude, **kwargs) -> str:
+        return ""
+
+    def iter_project_map(self, project_dir, extensions_to_include, extensions_to_exclude, **kwargs):
+        return iter(())
+
+    def warm_project(self, project_dir: str) -> None:
+        pass
+
+    def release_project(self, project_dir: str) -> None:
+        pass
+
+    def apply_file_changes(self, project_dir, relative_paths, structure_changed=False) -> bool:
+        return False
+
+    def update_file_content(self, project_dir: str, file_path: str, content: str) -> None:
+        pass
+
+
+def _run_generation(
+    file_list: List[Dict[str, object]],
+    context_mode: ProjectContextMode = ProjectContextMode.FULL_MAP,
+    existing_files: Optional[Dict[str, str]] = None,
+) -> Tuple[FakeLLMRepository, FakeFileSystemRepository, ExecutionProgress]:
+    llm_repo = FakeLLMRepository(file_list)
+    fs_repo = FakeFileSystemRepository(existing_files)
+    event_loop = EventLoopThread(name="agent-service-test")
+    service = AgentService(
+        llm_repositories={ModelProvider.OPENAI: llm_repo},
+        file_system_repository=fs_repo,
+        project_mapper_repository=FakeProjectMapperRepository(),
+        event_loop=event_loop,
+    )
+    task = AgentTask(
+        conversation=[ChatMessage(author=Author.USER, content="Crea los modelos")],
+        prompt_steps=[
+            PromptStep(order=1, name=_LIST_STEP_NAME, prompt_template="{conversation}"),
+            PromptStep(
+                order=2,
+                name=_GENERATE_STEP_NAME,
+                prompt_template="{file_list}",
+                context_mode=context_mode,
+            ),
+        ],
+        model_provider=ModelProvider.OPENAI,
+    )
+    updates: List[ExecutionProgress] = []
+    try:
+        service.execute_task(task, _PROJECT_DIR, lambda progress: updates.append(progress.model_copy()), None)
+    finally:
+        event_loop.stop()
+    return llm_repo, fs_repo, updates[-1]
+
+
+def test_independent_files_at_one_level_generate_concurrently():
+    file_list = [{"path": f"lib/models/model_{i}.dart", "order": 1} for i in range(30)]
+
+    llm_repo, fs_repo, progress = _run_generation(file_list)
+
+    assert progress.message == "Task completed successfully."
+    assert sorted(path for path, _ in fs_repo.written) == sorted(
+        os.path.join(_PROJECT_DIR, item["path"]) for item in file_list
+    )
+    assert llm_repo.generation_calls < len(file_list)
+    assert llm_repo.max_active > 1
+
+
+def test_dependent_levels_wait_for_earlier_levels():
+    file_list = [{"path": f"lib/models/model_{i}.dart", "order": 1} for i in range(12)]
+    file_list += [{"path": "lib/services/service.dart", "order": 2}]
+
+    llm_repo, fs_repo, _ = _run_generation(file_list)
+
+    assert fs_repo.written[-1][0] == os.path.join(_PROJECT_DIR, "lib/services/service.dart")
+    assert llm_repo.max_active > 1
+
+
+def test_delta_mode_code_generation_sees_full_content_of_listed_files():
+    file_list = [{"path": "lib/models/user.dart", "order": 1}]
+    existing_files = {os.path.join(_PROJECT_DIR, "lib/models/user.dart"): "class User { final String name; }"}
+
+    llm_repo, _, _ = _run_generation(
+        file_list, ProjectContextMode.BASELINE_WITH_CHANGES, existing_files
+    )
+
+    assert "class User { final String name; }" in llm_repo.project_maps[0]
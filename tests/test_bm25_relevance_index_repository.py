@@ -0,0 +1,44 @@
+from src.core.paths import get_project_cache_key
+from src.features.agent_chat.data.datasources.relevance_index_store import SqliteRelevanceIndexStore
+from src.features.agent_chat.data.repositories.bm25_relevance_index_repository import Bm25RelevanceIndexRepository
+
+
+def _make_project(root):
+    project = root / "project"
+    project.mkdir()
+    (project / "billing.py").write_text("def compute_invoice_total():\n    pass\n")
+    (project / "users.py").write_text("def load_user_profile():\n    pass\n")
+    for i in range(5):
+        (project / f"other_{i}.py").write_text(f"value_{i} = {i}\n")
+    return project
+
+
+def test_watched_project_refreshes_only_reported_paths(tmp_path):
+    project = _make_project(tmp_path)
+    repo = Bm25RelevanceIndexRepository(SqliteRelevanceIndexStore(tmp_path / "index.sqlite3"))
+    repo.watch_project(str(project))
+    assert repo.rank_files(str(project), "invoice", 1) == ["billing.py"]
+
+    (project / "shipping.py").write_text("def schedule_shipment():\n    pass\n")
+    (project / "unreported.py").write_text("def schedule_unreported():\n    pass\n")
+    repo.apply_file_changes(str(project), ["shipping.py"])
+
+    assert repo.rank_files(str(project), "shipment", 1) == ["shipping.py"]
+    assert repo.rank_files(str(project), "unreported", 1) == []
+
+
+def test_index_persists_across_instances(tmp_path):
+    project = _make_project(tmp_path)
+    store_path = tmp_path / "index.sqlite3"
+    Bm25RelevanceIndexRepository(SqliteRelevanceIndexStore(store_path)).rank_files(
+        str(project), "invoice", 1
+    )
+
+    (project / "users.py").unlink()
+    restarted = Bm25RelevanceIndexRepository(SqliteRelevanceIndexStore(store_path))
+
+    assert restarted.rank_files(str(project), "invoice", 1) == ["billing.py"]
+    assert restarted.rank_files(str(project), "profile", 1) == []
+    stored = SqliteRelevanceIndexStore(store_path).load_documents(get_project_cache_key(str(project)))
+    assert "users.py" not in stored
+    assert "billing.py" in stored
@@ -0,0 +1,33 @@
+from src.features.agent_chat.domain.services.code_generation_batch_planner import (
+    CodeGenerationBatchPlanner,
+    PlannedBatch,
+)
+
+
+def _items(count: int):
+    return [{"path": f"lib/file_{i}.py"} for i in range(count)]
+
+
+def test_plan_packs_ready_set_by_token_budget():
+    planner = CodeGenerationBatchPlanner(max_output_tokens=16_384, max_files_per_batch=8)
+
+    batches = planner.plan(_items(30), lambda item: 4_000)
+
+    assert len(batches) < 30
+    assert sum(len(batch.items) for batch in batches) == 30
+    assert all(batch.estimated_tokens <= planner.budget_tokens for batch in batches)
+
+
+def test_budget_recovers_after_successful_batches():
+    planner = CodeGenerationBatchPlanner(max_output_tokens=16_384)
+    initial_budget = planner.budget_tokens
+    truncated = PlannedBatch(_items(2), initial_budget)
+
+    planner.replan_truncated(truncated, output_chars=8_000, size_of=lambda item: 4_000)
+    reduced_budget = planner.budget_tokens
+    assert reduced_budget < initial_budget
+
+    for _ in range(20):
+        planner.record_success(PlannedBatch(_items(1), 1_000), output_chars=4_000)
+
+    assert reduced_budget < planner.budget_tokens == initial_budget
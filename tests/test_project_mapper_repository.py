@@ -0,0 +1,136 @@
+import sqlite3
+from pathlib import Path
+
+from src.features.agent_chat.data.datasources.map_index_store import SqliteMapIndexStore
+from src.features.agent_chat.data.repositories.project_mapper_repository import ProjectMapperRepository
+
+
+def _make_project(root: Path, python_files: int = 3, text_files: int = 6) -> Path:
+    root.mkdir(parents=True, exist_ok=True)
+    for i in range(python_files):
+        (root / f"module_{i}.py").write_text(f"def function_{i}():\n    return {i}\n")
+    for i in range(text_files):
+        (root / f"notes_{i}.txt").write_text(f"nota {i}\n")
+    return root
+
+
+def test_filtered_map_keeps_cached_entries_for_other_files(tmp_path):
+    project = _make_project(tmp_path)
+    mapper = ProjectMapperRepository()
+
+    mapper.map_project_to_string(str(project), [], [])
+    assert mapper.last_map_stats.files_read == 9
+
+    mapper.map_project_to_string(str(project), [".py"], [])
+    assert mapper.last_map_stats.cache_hits == 3
+
+    mapper.map_project_to_string(str(project), [], [])
+    assert mapper.last_map_stats.files_read == 0
+    assert mapper.last_map_stats.cache_hits == 9
+
+
+def test_deleted_files_are_evicted_from_cache(tmp_path):
+    project = _make_project(tmp_path)
+    mapper = ProjectMapperRepository()
+    mapper.map_project_to_string(str(project), [], [])
+
+    (project / "notes_0.txt").unlink()
+    project_map = mapper.map_project_to_string(str(project), [".py"], [])
+
+    assert "notes_0.txt" not in project_map
+    assert "notes_0.txt" not in mapper._cache[str(project.resolve())]
+
+
+def test_filtered_map_keeps_persisted_index_for_other_files(tmp_path):
+    project = _make_project(tmp_path / "project")
+    index_path = tmp_path / "map_index.sqlite3"
+    mapper = ProjectMapperRepository(index_store=SqliteMapIndexStore(index_path))
+    mapper.map_project_to_string(str(project), [], [])
+    mapper.map_project_to_string(str(project), [".py"], [])
+
+    restarted = ProjectMapperRepository(index_store=SqliteMapIndexStore(index_path))
+    restarted.map_project_to_string(str(project), [], [])
+
+    assert restarted.last_map_stats.files_read == 0
+    assert restarted.last_map_stats.cache_hits == 9
+
+
+def test_serial_map_reports_no_speedup(tmp_path):
+    project = _make_project(tmp_path)
+    mapper = ProjectMapperRepository(max_workers=1)
+
+    mapper.map_project_to_string(str(project), [], [])
+
+    assert mapper.last_map_stats.speedup == 1.0
+    assert mapper.last_map_stats.estimated_serial_seconds == mapper.last_map_stats.elapsed_seconds
+
+
+def _make_duplicated_project(root: Path) -> Path:
+    project = _make_project(root, python_files=0, text_files=0)
+    for name in ("a.txt", "b.txt", "c.txt"):
+        (project / name).write_text("contenido compartido\n")
+    return project
+
+
+def test_budgeted_map_reports_duplicates_in_header(tmp_path):
+    mapper = ProjectMapperRepository()
+
+    project_map = mapper.map_project_to_string(
+        str(_make_duplicated_project(tmp_path)), [], [], token_budget=10_000
+    )
+
+    header = project_map.split("\n---\n", 1)[0]
+    assert "Archivos duplicados: `2`" in header
+    assert mapper.last_map_stats.files_deduplicated == 2
+
+
+def test_unbudgeted_map_streams_before_reading_every_file(tmp_path):
+    project = _make_duplicated_project(tmp_path)
+    mapper = ProjectMapperRepository(enable_cache=False)
+
+    chunks = mapper.iter_project_map(str(project), [], [])
+    header = next(chunks)
+    (project / "c.txt").write_text("leído después del encabezado\n")
+    rest = "".join(chunks)
+
+    assert "Archivos duplicados" not in header
+    assert "leído después del encabezado" in rest
+    assert "Archivos duplicados: `1`" in rest
+    assert mapper.last_map_stats.files_deduplicated == 1
+
+
+def test_outlines_are_cached_per_extension(tmp_path):
+    project = tmp_path / "project"
+    project.mkdir()
+    body = "".join(f"        line_{i} = {i}\n" for i in range(20))
+    source = f"class Invoice:\n    def total(self):\n{body}        return 1\n"
+    (project / "invoice.py").write_text(source)
+    (project / "invoice.txt").write_text(source)
+    index_path = tmp_path / "map_index.sqlite3"
+    ProjectMapperRepository(index_store=SqliteMapIndexStore(index_path)).map_project_to_string(
+        str(project), [], [], outline_mode=True
+    )
+
+    restarted = ProjectMapperRepository(index_store=SqliteMapIndexStore(index_path))
+    project_map = restarted.map_project_to_string(str(project), [], [], outline_mode=True)
+
+    assert "return 1" in project_map
+    assert restarted.last_map_stats.files_outlined == 1
+
+
+def test_removed_files_release_their_segments(tmp_path):
+    project = tmp_path / "project"
+    project.mkdir()
+    body = "".join(f"    value_{i} = {i}\n" for i in range(20))
+    (project / "module_0.py").write_text(f"def function_0():\n{body}    return 0\n")
+    (project / "notes.txt").write_text("nota\n")
+    index_path = tmp_path / "map_index.sqlite3"
+    mapper = ProjectMapperRepository(index_store=SqliteMapIndexStore(index_path))
+    mapper.map_project_to_string(str(project), [], [], outline_mode=True)
+
+    (project / "module_0.py").unlink()
+    mapper.map_project_to_string(str(project), [], [], outline_mode=True)
+
+    with sqlite3.connect(index_path) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM files").fetchone()[0] == 1
+        assert connection.execute("SELECT COUNT(*) FROM outlines").fetchone()[0] == 0
@@ -0,0 +1,19 @@
+import os
+
+from src.features.agent_chat.data.datasources.project_walker import walk_project_directories
+
+
+def test_new_directory_walk_inherits_parent_ignore_rules(tmp_path):
+    (tmp_path / "app" / "generated" / "deep").mkdir(parents=True)
+    (tmp_path / "app" / "src" / "models").mkdir(parents=True)
+    (tmp_path / "app" / ".gitignore").write_text("generated/\n*.tmp/\n")
+    (tmp_path / "app" / "src" / "cache.tmp").mkdir()
+
+    ignored = list(walk_project_directories(tmp_path, start_relative_dir=os.path.join("app", "generated")))
+    kept = [
+        relative_dir
+        for _, relative_dir in walk_project_directories(tmp_path, start_relative_dir=os.path.join("app", "src"))
+    ]
+
+    assert ignored == []
+    assert kept == [os.path.join("app", "src"), os.path.join("app", "src", "models")]
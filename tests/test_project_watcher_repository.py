@@ -0,0 +1,48 @@
+import threading
+import time
+
+from src.features.agent_chat.data.repositories.project_watcher_repository import ProjectWatcherRepository
+from src.features.agent_chat.domain.repositories.i_project_mapper_repository import IProjectMapperRepository
+
+
+class FailingProjectMapperRepository(IProjectMapperRepository):
+    def __init__(self):
+        self.warm_attempted = threading.Event()
+
+    def map_project_to_string(self, project_dir, extensions_to_include, extensions_to_exclude, **kwargs) -> str:
+        return ""
+
+    def iter_project_map(self, project_dir, extensions_to_include, extensions_to_exclude, **kwargs):
+        return iter(())
+
+    def warm_project(self, project_dir: str) -> None:
+        self.warm_attempted.set()
+        raise ValueError("índice corrupto")
+
+    def release_project(self, project_dir: str) -> None:
+        pass
+
+    def apply_file_changes(self, project_dir, relative_paths, structure_changed=False) -> bool:
+        return False
+
+    def update_file_content(self, project_dir: str, file_path: str, content: str) -> None:
+        pass
+
+
+def test_warm_failures_are_recorded_instead_of_killing_the_session(tmp_path):
+    mapper = FailingProjectMapperRepository()
+    watcher = ProjectWatcherRepository(mapper, poll_interval_seconds=0.05)
+    try:
+        watcher.watch(str(tmp_path))
+        assert mapper.warm_attempted.wait(5)
+        for _ in range(50):
+            errors = watcher.take_errors()
+            if errors:
+                break
+            time.sleep(0.05)
+    finally:
+        watcher.stop()
+
+    assert len(errors) == 1
+    assert "índice corrupto" in errors[0]
+    assert watcher.take_errors() == []
@@ -0,0 +1,63 @@
+import asyncio
+from typing import AsyncIterator, Iterator, List
+
+import pytest
+
+from src.core.rate_limiter import RateLimiter
+from src.features.agent_chat.data.repositories import rate_limited_llm_repository
+from src.features.agent_chat.data.repositories.rate_limited_llm_repository import RateLimitedLLMRepository
+from src.features.agent_chat.domain.repositories.i_llm_repository import ILLMRepository
+
+
+class InternalServerError(Exception):
+    status_code = 503
+
+
+class FlakyStreamingRepository(ILLMRepository):
+    def __init__(self, chunks_before_failure: List[str], failures: int = 1):
+        self._chunks_before_failure = chunks_before_failure
+        self._failures = failures
+        self.calls = 0
+
+    def execute_prompt(self, prompt_template, context, use_cache=True) -> str:
+        raise NotImplementedError
+
+    def stream_prompt(self, prompt_template, context, use_cache=True) -> Iterator[str]:
+        raise NotImplementedError
+
+    async def aexecute_prompt(self, prompt_template, context, use_cache=True) -> str:
+        raise NotImplementedError
+
+    async def astream_prompt(self, prompt_template, context, use_cache=True) -> AsyncIterator[str]:
+        self.calls += 1
+        if self.calls <= self._failures:
+            for chunk in self._chunks_before_failure:
+                yield chunk
+            raise InternalServerError("upstream unavailable")
+        yield "respuesta"
+
+
+async def _collect(repository: ILLMRepository) -> str:
+    return "".join([chunk async for chunk in repository.astream_prompt("{x}", {"x": "y"})])
+
+
+@pytest.fixture(autouse=True)
+def _no_backoff(monkeypatch):
+    monkeypatch.setattr(rate_limited_llm_repository, "_TRANSIENT_BACKOFF_SECONDS", 0.0)
+
+
+def test_stream_retries_server_error_before_first_chunk():
+    flaky = FlakyStreamingRepository(chunks_before_failure=[])
+    repository = RateLimitedLLMRepository(flaky, RateLimiter())
+
+    assert asyncio.run(_collect(repository)) == "respuesta"
+    assert flaky.calls == 2
+
+
+def test_stream_does_not_retry_after_first_chunk():
+    flaky = FlakyStreamingRepository(chunks_before_failure=["parcial"])
+    repository = RateLimitedLLMRepository(flaky, RateLimiter())
+
+    with pytest.raises(InternalServerError):
+        asyncio.run(_collect(repository))
+    assert flaky.calls == 1